@@ -4,14 +4,8 @@ Executa todos os mapas de teste e gera relatório
 """
 
 import os
-import sys
-from pathlib import Path
 
-# Adiciona src ao path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from main import executar_missao, executar_todos_mapas
-from tests.test_robo_salvamento import executar_todos_testes
+from main import executar_missao
 
 
 def demonstrar_sistema():
@@ -25,6 +19,8 @@ def demonstrar_sistema():
     # 1. Executa testes
     print("🧪 ETAPA 1: EXECUTANDO TESTES DE VALIDAÇÃO")
     print("-" * 40)
+    # Os testes só são carregados aqui: executar missões não depende deles
+    from tests.test_robo_salvamento import executar_todos_testes
     sucesso_testes = executar_todos_testes()
     
     if not sucesso_testes:
@@ -5,20 +5,73 @@ Executa missões completas de busca e salvamento
 
 import sys
 import os
-from pathlib import Path
+import argparse
+import time
+from typing import Optional, Tuple, TYPE_CHECKING
 
-# Adiciona o diretório src ao path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from src.labirinto import Labirinto
+# Só o necessário para uma missão; recursos opcionais (robôs cooperativos, checkpoints,
+# corpus, processos) são importados quando usados, reduzindo o tempo de partida
+from src.labirinto import EXTENSOES_MAPA, nome_base_mapa
 from src.robo import Robo
 from src.logger import LoggerRobo
 from src.algoritmo_busca import AlgoritmoBusca
+from src.labirinto_blocos import LabirintoEmBlocos, abrir_labirinto
+from src.trajetoria import Trajetoria, LIMITE_PADRAO as LIMITE_TRAJETORIA
+from src.cache_resultados import CacheResultados, chave_resultado, DIRETORIO_PADRAO
+from src.metricas import EscritorMetricas, coletar_metricas
 from src.estruturas import RoboException
 
+if TYPE_CHECKING:
+    from src.checkpoint import GerenciadorCheckpoint
+    from src.ruido import ModeloRuido
+    from src.telemetria import EmissorTelemetria
+
+
+# Configuração que entra na chave do cache de resultados
+CONFIGURACAO_BUSCA = {'estrategia': 'AlgoritmoBusca', 'robos': 1}
+
+
+def arquivo_checkpoint_padrao(arquivo_mapa: str, diretorio_logs: str = "logs") -> str:
+    """Caminho padrão do checkpoint de um mapa (ao lado dos logs)"""
+    nome_base = nome_base_mapa(arquivo_mapa)
+    return os.path.join(diretorio_logs, f"{nome_base}.checkpoint")
+
+
+def _exibir_resultado(sucesso: bool, stats: dict, sequencia_compacta: str, arquivo_log: str) -> None:
+    """Exibe estatísticas, sequência de comandos e situação final da missão"""
+    print(f"\n📈 ESTATÍSTICAS DA MISSÃO:")
+    print(f"   • Posições visitadas: {stats['posicoes_visitadas']}")
+    print(f"   • Posições conhecidas: {stats['posicoes_conhecidas']}")
+    print(f"   • Movimentos realizados: {stats['caminho_percorrido']}")
+    print(f"   • Humano encontrado: {'✅' if stats['humano_encontrado'] else '❌'}")
+    print(f"   • Humano coletado: {'✅' if stats['humano_coletado'] else '❌'}")
+    if stats.get('humanos_total', 1) > 1:
+        print(f"   • Humanos resgatados: {stats['humanos_resgatados']}/{stats['humanos_total']}")
+    print(f"   • Missão concluída: {'✅' if stats['missao_concluida'] else '❌'}")
+    
+    if sequencia_compacta:
+        print(f"\n📜 Sequência de comandos (compacta):")
+        largura_linha = 60
+        for inicio in range(0, len(sequencia_compacta), largura_linha):
+            trecho = sequencia_compacta[inicio:inicio + largura_linha]
+            print(f"   {trecho}")
+
+    if sucesso:
+        print(f"\n🎉 MISSÃO CONCLUÍDA COM SUCESSO!")
+        print(f"📄 Log salvo em: {arquivo_log}")
+    else:
+        print(f"\n💥 MISSÃO FALHOU!")
 
-def executar_missao(arquivo_mapa: str, diretorio_logs: str = "logs") -> bool:
-    """Executa uma missão completa de busca e salvamento"""
+
+def executar_missao(arquivo_mapa: str, diretorio_logs: str = "logs",
+                    checkpoint: Optional['GerenciadorCheckpoint'] = None,
+                    retomar: bool = False,
+                    cache: Optional[CacheResultados] = None,
+                    trajetoria: Optional[Trajetoria] = None,
+                    metricas: Optional[EscritorMetricas] = None,
+                    ruido: Optional['ModeloRuido'] = None,
+                    telemetria: Optional['EmissorTelemetria'] = None) -> bool:
+    """Executa uma missão completa de busca e salvamento (com cache, reaproveita resultados)"""
     try:
         print(f"\n{'='*60}")
         print(f"🚀 INICIANDO MISSÃO: {os.path.basename(arquivo_mapa)}")
@@ -26,45 +79,116 @@ def executar_missao(arquivo_mapa: str, diretorio_logs: str = "logs") -> bool:
         
         # Inicializa componentes
         print("⚙️  Inicializando componentes...")
-        labirinto = Labirinto(arquivo_mapa)
+        labirinto = abrir_labirinto(arquivo_mapa)
         logger = LoggerRobo(arquivo_mapa, diretorio_logs)
-        robo = Robo(labirinto, logger)
-        algoritmo = AlgoritmoBusca(robo)
+        
+        # Missões retomadas de checkpoint e mapas em blocos (a chave leria o mapa inteiro) não usam o cache
+        em_blocos = isinstance(labirinto, LabirintoEmBlocos)
+        chave = None
+        if cache is not None and checkpoint is None and not em_blocos:
+            # Forma canônica: mapas só girados, deslocados ou com regiões inalcançáveis compartilham a entrada
+            chave = chave_resultado(labirinto.forma_canonica(), CONFIGURACAO_BUSCA)
+            guardado = cache.obter(chave)
+            if guardado is not None:
+                print("♻️  Resultado reaproveitado do cache (mapa e código inalterados)")
+                logger.entradas = guardado['log']
+                logger.salvar_log()
+                _exibir_resultado(guardado['sucesso'], guardado['estatisticas'],
+                                  guardado['sequencia'], logger.get_nome_arquivo())
+                if metricas is not None and guardado.get('metricas') is not None:
+                    metricas.registrar(dict(guardado['metricas'], cache=True, mapa=arquivo_mapa,
+                                            largura=labirinto.largura, altura=labirinto.altura))
+                return guardado['sucesso']
+        
+        robo = Robo(labirinto, logger, ruido, telemetria)
+        algoritmo = AlgoritmoBusca(robo, checkpoint, trajetoria=trajetoria)
+        
+        if retomar:
+            checkpoint.retomar(algoritmo)
+            print(f"♻️  Missão retomada do checkpoint após {robo.comandos_executados} comandos")
+        if ruido is not None:
+            print(f"📡 Sensores com ruído: {ruido.taxa_troca:.0%} de trocas, {ruido.taxa_perda:.0%} de perdas "
+                  f"(confiança após {ruido.confianca} leituras concordantes)")
         
         print(f"📍 Entrada encontrada em: ({labirinto.entrada.x}, {labirinto.entrada.y})")
-        print(f"👤 Humano localizado em: ({labirinto.posicao_humano.x}, {labirinto.posicao_humano.y})")
+        for saida in labirinto.entradas[1:]:
+            print(f"🚪 Outra saída em: ({saida.x}, {saida.y})")
+        for humano in labirinto.posicoes_humanos:
+            print(f"👤 Humano localizado em: ({humano.x}, {humano.y})")
         print(f"📊 Dimensões do labirinto: {labirinto.largura}x{labirinto.altura}")
         
         # Executa missão
+        inicio = time.perf_counter()
         sucesso = algoritmo.executar_missao()
+        duracao = time.perf_counter() - inicio
+        if em_blocos:
+            blocos = labirinto.get_estatisticas_blocos()
+            print(f"🧱 Blocos de {blocos['lado']}x{blocos['lado']}: {blocos['falhas']} lidos do disco, "
+                  f"{blocos['acertos']} acessos em cache, {blocos['carregados']} em memória")
         
-        # Salva log
+        # Salva log (a missão terminou: o checkpoint não é mais necessário)
         logger.salvar_log()
+        if checkpoint is not None:
+            checkpoint.remover()
         
-        # Exibe estatísticas
         stats = algoritmo.get_estatisticas()
-        print(f"\n📈 ESTATÍSTICAS DA MISSÃO:")
-        print(f"   • Posições visitadas: {stats['posicoes_visitadas']}")
-        print(f"   • Posições conhecidas: {stats['posicoes_conhecidas']}")
-        print(f"   • Movimentos realizados: {stats['caminho_percorrido']}")
-        print(f"   • Humano encontrado: {'✅' if stats['humano_encontrado'] else '❌'}")
-        print(f"   • Humano coletado: {'✅' if stats['humano_coletado'] else '❌'}")
-        print(f"   • Missão concluída: {'✅' if stats['missao_concluida'] else '❌'}")
-        
         sequencia_compacta = logger.get_sequencia_compacta()
-        if sequencia_compacta:
-            print(f"\n📜 Sequência de comandos (compacta):")
-            largura_linha = 60
-            for inicio in range(0, len(sequencia_compacta), largura_linha):
-                trecho = sequencia_compacta[inicio:inicio + largura_linha]
-                print(f"   {trecho}")
+        dados_metricas = coletar_metricas(arquivo_mapa, labirinto, robo, algoritmo,
+                                          logger.entradas, duracao)
+        if metricas is not None:
+            metricas.registrar(dict(dados_metricas, cache=False))
+        if chave is not None:
+            cache.guardar(chave, {
+                'sucesso': sucesso,
+                'estatisticas': stats,
+                'sequencia': sequencia_compacta,
+                'comandos': robo.comandos_executados,
+                'metricas': dados_metricas,
+            }, logger.entradas)
+        
+        if ruido is not None:
+            print(f"📡 {algoritmo.releituras} releituras de sensores ({ruido.trocas} trocas, "
+                  f"{ruido.perdas} perdas); evidências em {algoritmo.evidencias.bytes_usados()} bytes")
+        
+        # Exibe estatísticas
+        _exibir_resultado(sucesso, stats, sequencia_compacta, logger.get_nome_arquivo())
+        
+        return sucesso
+        
+    except RoboException as e:
+        print(f"\n⚠️  ERRO DO ROBÔ: {e}")
+        return False
+    except Exception as e:
+        print(f"\n💥 ERRO GERAL: {e}")
+        return False
 
-        if sucesso:
-            print(f"\n🎉 MISSÃO CONCLUÍDA COM SUCESSO!")
-            print(f"📄 Log salvo em: {logger.get_nome_arquivo()}")
-        else:
-            print(f"\n💥 MISSÃO FALHOU!")
+
+def executar_missao_cooperativa(arquivo_mapa: str, num_robos: int,
+                                diretorio_logs: str = "logs") -> bool:
+    """Executa uma missão com vários robôs compartilhando o mapa conhecido"""
+    try:
+        print(f"\n{'='*60}")
+        print(f"🚀 INICIANDO MISSÃO COOPERATIVA: {os.path.basename(arquivo_mapa)} ({num_robos} robôs)")
+        print(f"{'='*60}")
+        
+        from src.labirinto import Labirinto
+        from src.busca_cooperativa import BuscaCooperativa
         
+        labirinto = Labirinto(arquivo_mapa)
+        busca = BuscaCooperativa(labirinto, num_robos, diretorio_logs)
+        sucesso = busca.executar_missao()
+        busca.salvar_logs()
+        
+        stats = busca.get_estatisticas()
+        print(f"\n📈 ESTATÍSTICAS DA MISSÃO:")
+        print(f"   • Robôs utilizados: {stats['robos_utilizados']}/{stats['robos']}")
+        print(f"   • Ciclos até encontrar o humano: {stats['ciclo_humano_encontrado']}")
+        print(f"   • Ciclos até o resgate: {stats['ciclo_resgate']}")
+        print(f"   • Posições visitadas: {stats['posicoes_visitadas']}")
+        for robo_id, comandos in stats['comandos_por_robo'].items():
+            print(f"   • Comandos do robô {robo_id}: {comandos}")
+        
+        print(f"\n{'🎉 MISSÃO CONCLUÍDA COM SUCESSO!' if sucesso else '💥 MISSÃO FALHOU!'}")
         return sucesso
         
     except RoboException as e:
@@ -82,40 +206,132 @@ def main():
     print("**Aluno:** [Enzo Luiz Berlesi Salles - RA:2023102306]")
     print("**Aluno:** [Joao Pedro Calixto Godoy - RA:2023100923]")
     print("**Aluno:** [Henrique Bicudo - RA:2023103607]")
-        
-    # Verifica argumentos da linha de comando
-    if len(sys.argv) < 2:
-        print(f"\n❌ Uso: {sys.argv[0]} <arquivo_mapa> [diretorio_logs]")
-        print(f"Exemplo: {sys.argv[0]} mapas/exemplo.txt logs")
-        return
     
-    arquivo_mapa = sys.argv[1]
-    diretorio_logs = sys.argv[2] if len(sys.argv) > 2 else "logs"
+    parser = argparse.ArgumentParser(description="Simulador do robô de salvamento")
+    parser.add_argument("arquivo_mapa",
+                        help="arquivo do mapa (ex.: mapas/exemplo.txt, .txt.gz, .txt.bz2, .txt.xz) ou diretório com vários mapas")
+    parser.add_argument("diretorio_logs", nargs="?", default="logs", help="diretório dos logs CSV")
+    parser.add_argument("--robos", type=int, default=1, help="número de robôs cooperando (padrão: 1)")
+    parser.add_argument("--checkpoint", nargs="?", const="", default=None, metavar="ARQUIVO",
+                        help="salva checkpoints periódicos (padrão: <logs>/<mapa>.checkpoint)")
+    parser.add_argument("--checkpoint-comandos", type=int, default=1000,
+                        help="intervalo de checkpoint em comandos (padrão: 1000)")
+    parser.add_argument("--checkpoint-segundos", type=float, default=30.0,
+                        help="intervalo de checkpoint em segundos (padrão: 30)")
+    parser.add_argument("--resume", action="store_true",
+                        help="retoma a missão a partir do checkpoint salvo")
+    parser.add_argument("--shard", default=None, metavar="I/N",
+                        help="executa só a parte I (de 0 a N-1) de um corpus de mapas")
+    parser.add_argument("--trabalhadores", type=int, default=1,
+                        help="processos para executar um corpus de mapas (padrão: 1)")
+    parser.add_argument("--trajetoria-limite", type=int, default=LIMITE_TRAJETORIA,
+                        help=f"movimentos mantidos em memória; 0 guarda todos (padrão: {LIMITE_TRAJETORIA})")
+    parser.add_argument("--trajetoria-arquivo", default=None, metavar="ARQUIVO",
+                        help="grava o histórico completo de movimentos neste arquivo")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="sempre simula, ignorando o cache de resultados")
+    parser.add_argument("--cache-dir", default=DIRETORIO_PADRAO,
+                        help=f"diretório do cache de resultados (padrão: {DIRETORIO_PADRAO})")
+    parser.add_argument("--cache-limite-mb", type=float, default=256,
+                        help="tamanho máximo do cache em MB (padrão: 256)")
+    parser.add_argument("--metricas", default=None, metavar="ARQUIVO",
+                        help="grava as métricas de cada missão em JSON Lines (ex.: metricas.jsonl)")
+    parser.add_argument("--prometheus", default=None, metavar="ARQUIVO",
+                        help="grava os agregados no formato texto do Prometheus (ex.: robo.prom)")
+    parser.add_argument("--ruido-troca", type=float, default=0.0, metavar="TAXA",
+                        help="missão única: fração das leituras com parede e vazio trocados (padrão: 0)")
+    parser.add_argument("--ruido-perda", type=float, default=0.0, metavar="TAXA",
+                        help="missão única: fração das leituras perdidas (padrão: 0)")
+    parser.add_argument("--ruido-semente", type=int, default=None,
+                        help="semente do ruído dos sensores (reprodutível)")
+    parser.add_argument("--telemetria", default=None, metavar="NOME",
+                        help="missão única: publica as operações ao vivo no canal compartilhado NOME "
+                             "(visor: python -m src.telemetria NOME)")
+    args = parser.parse_args()
     
     # Verifica se arquivo existe
-    if not os.path.exists(arquivo_mapa):
-        print(f"❌ Arquivo não encontrado: {arquivo_mapa}")
+    if not os.path.exists(args.arquivo_mapa):
+        print(f"❌ Arquivo não encontrado: {args.arquivo_mapa}")
         return
     
+    cache = None
+    if not args.no_cache:
+        cache = CacheResultados(args.cache_dir, int(args.cache_limite_mb * 1024 * 1024))
+    metricas = None
+    if args.metricas or args.prometheus:
+        metricas = EscritorMetricas(args.metricas, args.prometheus)
+    
     # Executa missão
-    sucesso = executar_missao(arquivo_mapa, diretorio_logs)
+    from src.corpus import e_corpus
+    if os.path.isdir(args.arquivo_mapa):
+        sucesso = executar_todos_mapas(args.arquivo_mapa, args.diretorio_logs, cache, metricas)
+    elif e_corpus(args.arquivo_mapa):
+        shard = None
+        if args.shard:
+            indice, barra, total = args.shard.partition('/')
+            if not (barra and indice.isdecimal() and total.isdecimal()
+                    and 0 <= int(indice) < int(total)):
+                parser.error(f"--shard deve ter a forma I/N com 0 <= I < N (recebido: {args.shard})")
+            shard = (int(indice), int(total))
+        sucesso = executar_corpus(args.arquivo_mapa, args.diretorio_logs, shard, args.trabalhadores,
+                                  metricas)
+    elif args.robos > 1:
+        sucesso = executar_missao_cooperativa(args.arquivo_mapa, args.robos, args.diretorio_logs)
+    else:
+        checkpoint = None
+        if args.checkpoint is not None or args.resume:
+            arquivo = args.checkpoint or arquivo_checkpoint_padrao(args.arquivo_mapa, args.diretorio_logs)
+            from src.checkpoint import GerenciadorCheckpoint
+            checkpoint = GerenciadorCheckpoint(arquivo, args.checkpoint_comandos,
+                                               args.checkpoint_segundos)
+        ruido = None
+        if args.ruido_troca or args.ruido_perda:
+            from src.ruido import ModeloRuido
+            try:
+                ruido = ModeloRuido(args.ruido_troca, args.ruido_perda, args.ruido_semente)
+            except RoboException as e:
+                parser.error(str(e))
+        canal = None
+        if args.telemetria:
+            from src.telemetria import CanalTelemetria
+            try:
+                canal = CanalTelemetria(nome=args.telemetria)
+            except RoboException as e:
+                parser.error(str(e))
+            print(f"📺 Telemetria ao vivo no canal '{args.telemetria}' "
+                  f"(python -m src.telemetria {args.telemetria})")
+        trajetoria = Trajetoria(args.trajetoria_limite or None, args.trajetoria_arquivo)
+        usar_cache = (checkpoint is None and not args.trajetoria_arquivo and ruido is None and
+                      canal is None)
+        try:
+            sucesso = executar_missao(args.arquivo_mapa, args.diretorio_logs, checkpoint, args.resume,
+                                      cache if usar_cache else None, trajetoria, metricas, ruido,
+                                      canal.emissor() if canal is not None else None)
+        finally:
+            if canal is not None:
+                canal.fechar()
+    
+    if metricas is not None:
+        metricas.escrever_prometheus()
     
     # Código de saída
     sys.exit(0 if sucesso else 1)
 
 
-def executar_todos_mapas(diretorio_mapas: str = "mapas"):
-    """Executa missões para todos os mapas em um diretório"""
+def executar_todos_mapas(diretorio_mapas: str = "mapas", diretorio_logs: str = "logs",
+                         cache: Optional[CacheResultados] = None,
+                         metricas: Optional[EscritorMetricas] = None) -> bool:
+    """Executa missões para todos os mapas em um diretório (com cache, só os alterados são simulados)"""
     if not os.path.exists(diretorio_mapas):
         print(f"❌ Diretório não encontrado: {diretorio_mapas}")
-        return
+        return False
     
     arquivos_mapa = [f for f in os.listdir(diretorio_mapas) 
-                     if f.endswith('.txt')]
+                     if f.endswith(EXTENSOES_MAPA)]
     
     if not arquivos_mapa:
-        print(f"❌ Nenhum arquivo .txt encontrado em {diretorio_mapas}")
-        return
+        print(f"❌ Nenhum arquivo de mapa ({', '.join(EXTENSOES_MAPA)}) encontrado em {diretorio_mapas}")
+        return False
     
     sucessos = 0
     total = len(arquivos_mapa)
@@ -124,12 +340,70 @@ def executar_todos_mapas(diretorio_mapas: str = "mapas"):
     
     for arquivo in sorted(arquivos_mapa):
         caminho_completo = os.path.join(diretorio_mapas, arquivo)
-        sucesso = executar_missao(caminho_completo)
+        sucesso = executar_missao(caminho_completo, diretorio_logs, cache=cache, metricas=metricas)
         if sucesso:
             sucessos += 1
     
     print(f"\n📊 RESULTADO FINAL: {sucessos}/{total} missões bem-sucedidas")
     print(f"Taxa de sucesso: {(sucessos/total)*100:.1f}%")
+    if cache is not None:
+        print(f"♻️  Cache: {cache.acertos} reaproveitadas, {cache.falhas} simuladas")
+    
+    return sucessos == total
+
+
+def executar_corpus(arquivo_corpus: str, diretorio_logs: str = "logs",
+                    shard: Optional[Tuple[int, int]] = None, trabalhadores: int = 1,
+                    metricas: Optional[EscritorMetricas] = None) -> bool:
+    """Executa as missões de um corpus (ou de um shard dele), dividindo a faixa entre processos"""
+    from concurrent.futures import ProcessPoolExecutor
+    from src.corpus import LeitorCorpus, faixa_shard
+    from src.missao import executar_faixa_corpus
+    
+    try:
+        with LeitorCorpus(arquivo_corpus) as leitor:
+            total_corpus = len(leitor)
+        inicio, fim = faixa_shard(total_corpus, *shard) if shard else (0, total_corpus)
+    except RoboException as e:
+        print(f"\n⚠️  ERRO DO ROBÔ: {e}")
+        return False
+    
+    total = fim - inicio
+    if total == 0:
+        print(f"❌ Nenhum mapa na faixa selecionada de {arquivo_corpus}")
+        return False
+    
+    print(f"\n🔄 Executando {total} missões do corpus (entradas {inicio} a {fim - 1})...")
+    
+    # Cada processo abre o corpus e lê só a sua faixa contígua
+    partes = max(1, min(trabalhadores, total))
+    faixas = [(inicio + a, inicio + b)
+              for a, b in (faixa_shard(total, i, partes) for i in range(partes))]
+    if partes == 1:
+        lotes = [executar_faixa_corpus(arquivo_corpus, inicio, fim, diretorio_logs)]
+    else:
+        with ProcessPoolExecutor(max_workers=partes) as pool:
+            lotes = list(pool.map(executar_faixa_corpus, [arquivo_corpus] * partes,
+                                  *zip(*faixas), [diretorio_logs] * partes))
+    
+    sucessos = 0
+    duplicatas = 0
+    for resultado in (r for lote in lotes for r in lote):
+        if 'duplicata_de' in resultado.get('metricas', {}):
+            duplicatas += 1
+        if metricas is not None and 'metricas' in resultado:
+            metricas.registrar(dict(resultado['metricas'], mapa=resultado['nome'], indice=resultado['indice']))
+        if resultado['sucesso']:
+            sucessos += 1
+        else:
+            print(f"   ❌ [{resultado['indice']}] {resultado['nome']}: {resultado['erro']}")
+    
+    if duplicatas:
+        print(f"\n♻️  {duplicatas} mapas equivalentes a outros já simulados (resultado reaproveitado)")
+    print(f"\n📊 RESULTADO FINAL: {sucessos}/{total} missões bem-sucedidas")
+    print(f"Taxa de sucesso: {(sucessos/total)*100:.1f}%")
+    
+    return sucessos == total
 
 
 if __name__ == "__main__":
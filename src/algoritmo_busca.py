@@ -3,35 +3,107 @@ Algoritmo inteligente de busca e salvamento
 Implementa busca autônoma baseada apenas em sensores
 """
 
-from typing import Dict, Set, List, Optional, Tuple
-from collections import deque
+import time
+from contextlib import contextmanager
+from typing import Dict, Generator, Iterator, Set, List, Optional, Tuple
 from .estruturas import (
     Posicao, Direcao, ComandoRobo, TipoSensor,
     RoboException
 )
 from .robo import Robo
+from .grafo_juncoes import GrafoJuncoes
+from .campo_distancias import CampoDistancias, nucleo_sem_becos
+from .trajetoria import Trajetoria
+
+
+# Fases da missão (permitem retomar a execução a partir de um checkpoint)
+FASE_EXPLORACAO = 0
+FASE_COLETA = 1
+FASE_RETORNO = 2
+FASE_EJECAO = 3
+FASE_CONCLUIDA = 4
+
+# Cada passo da missão informa o comando recém-executado e quantas vezes (avanço múltiplo)
+Passo = Tuple[ComandoRobo, int]
+Passos = Generator[Passo, None, None]
+
+
+def _esgotar(passos: Generator):
+    """Executa um gerador de passos até o fim e devolve o seu valor de retorno"""
+    while True:
+        try:
+            next(passos)
+        except StopIteration as fim:
+            return fim.value
 
 
 class AlgoritmoBusca:
     """Algoritmo inteligente para busca e salvamento autônomo"""
     
-    def __init__(self, robo: Robo):
-        """Inicializa o algoritmo com o robô"""
+    def __init__(self, robo: Robo, checkpoint=None, verboso: bool = True,
+                 trajetoria: Optional[Trajetoria] = None):
+        """Inicializa o algoritmo com o robô (checkpoint: GerenciadorCheckpoint opcional;
+        trajetoria: registro dos movimentos, por padrão só os últimos em memória)"""
         self.robo = robo
+        self.checkpoint = checkpoint
+        self.verboso = verboso
         
         # Mapa interno construído pelos sensores
         self.mapa_conhecido: Dict[Posicao, TipoSensor] = {}
         self.visitadas: Set[Posicao] = set()
-        self.caminho_percorrido: List[Tuple[Posicao, Direcao]] = []
+        
+        # Com sensores ruidosos, mapa_conhecido guarda a estimativa de cada célula e as
+        # evidências (saldo de leituras) decidem quando ela é confiável
+        self.ruido = robo.ruido
+        self.evidencias = None
+        if self.ruido is not None:
+            from .ruido import EvidenciasCelulas
+            self.evidencias = EvidenciasCelulas()
+        self.releituras = 0
+        self.trajetoria = trajetoria if trajetoria is not None else Trajetoria()
         
         # Estados da missão
         self.humano_encontrado = False
         self.humano_coletado = False
         self.missao_concluida = False
+        self.erro: Optional[str] = None
+        self.tipo_erro: Optional[str] = None  # Classe da exceção (ex.: ColisaoException)
+        self.tempos_fases: Dict[str, float] = {}  # Segundos gastos em cada fase
+        self.fase = FASE_EXPLORACAO
+        self.iteracao = 0
+        self.caminho_volta: Optional[List[Posicao]] = None
+        self.nucleo_retorno: Optional[Set[Posicao]] = None  # Mapa conhecido sem ramos sem saída
+        self.indice_volta = 0
+        self.caminho_exploracao: List[Posicao] = []
         
-        # Registra posição inicial
-        self._atualizar_mapa()
+        # Vítimas informadas na missão: uma viagem por humano, reaproveitando o mapa conhecido
+        self.total_humanos = len(self.robo.labirinto.posicoes_humanos)
+        self.resgatados = 0
+        self.humanos_avistados: Set[Posicao] = set()  # Ainda no lugar, segundo os sensores
+        self.alvo_humano: Optional[Posicao] = None  # Vítima já avistada buscada nesta viagem
+        self.posicao_coletada: Optional[Posicao] = None  # Onde estava o humano desta viagem
+        
+        # Registra posição inicial e as saídas do prédio (informadas na missão, como as vítimas)
         self.posicao_entrada = self.robo.posicao
+        self.entradas: Set[Posicao] = set(self.robo.labirinto.entradas)
+        
+        # Referencial da missão: eixos e ordem das direções relativos à direção inicial, para que
+        # os desempates (e portanto os comandos) não mudem se o mapa for girado
+        inicial = self.robo.labirinto.get_direcao_inicial()
+        self._eixo_frente = inicial.get_delta()
+        self._eixo_direita = inicial.girar_direita().get_delta()
+        giros = (inicial.value - Direcao.SUL.value) % 4
+        self._ordem_direcoes = [Direcao((direcao.value + giros) % 4) for direcao in Direcao]
+        
+        # Distância até a entrada mais próxima, mantida durante a exploração (retorno sem pausa
+        # de planejamento)
+        self.distancias = CampoDistancias(*self.robo.labirinto.entradas)
+        
+        # Corredores comprimidos para planejamento (nós: junções, becos, fronteiras, entrada);
+        # empates entre fronteiras favorecem a mais próxima da entrada
+        self.grafo = GrafoJuncoes(self._chave_planejamento)
+        
+        self._atualizar_mapa()
     
     def _atualizar_mapa(self) -> None:
         """Atualiza o mapa interno com leituras dos sensores"""
@@ -45,26 +117,111 @@ class AlgoritmoBusca:
         # Marca posição atual como visitada
         self.visitadas.add(posicao_atual)
         self.mapa_conhecido[posicao_atual] = TipoSensor.VAZIO
+        if self.evidencias is not None:
+            self.evidencias.fixar_livre(posicao_atual)
+        self._atualizar_planejadores(posicao_atual)
     
     def _registrar_sensor_esquerdo(self) -> None:
         """Registra leitura do sensor esquerdo no mapa"""
-        direcao_esquerda = Direcao((self.robo.direcao.value - 1) % 4)
-        posicao_esquerda = self.robo.posicao + direcao_esquerda.get_delta()
-        leitura = self.robo._ler_sensor_esquerdo()
-        self.mapa_conhecido[posicao_esquerda] = leitura
+        self._registrar_sensor(self.robo.direcao.girar_esquerda())
     
     def _registrar_sensor_direito(self) -> None:
         """Registra leitura do sensor direito no mapa"""
-        direcao_direita = self.robo.direcao.girar_direita()
-        posicao_direita = self.robo.posicao + direcao_direita.get_delta()
-        leitura = self.robo._ler_sensor_direito()
-        self.mapa_conhecido[posicao_direita] = leitura
+        self._registrar_sensor(self.robo.direcao.girar_direita())
     
     def _registrar_sensor_frente(self) -> None:
         """Registra leitura do sensor da frente no mapa"""
-        posicao_frente = self.robo.posicao + self.robo.direcao.get_delta()
-        leitura = self.robo._ler_sensor_frente()
-        self.mapa_conhecido[posicao_frente] = leitura
+        self._registrar_sensor(self.robo.direcao)
+    
+    def _registrar_sensor(self, direcao_sensor: Direcao) -> None:
+        """Registra no mapa a leitura do sensor apontado para a direção"""
+        posicao = self.robo.posicao + direcao_sensor.get_delta()
+        if self.evidencias is not None:
+            self._registrar_com_evidencias(posicao, direcao_sensor)
+            return
+        self.mapa_conhecido[posicao] = self.robo.observar(direcao_sensor)
+        self._atualizar_planejadores(posicao)
+    
+    def _registrar_com_evidencias(self, posicao: Posicao, direcao_sensor: Direcao) -> None:
+        """Acumula leituras ruidosas da célula, relendo o sensor enquanto o saldo não é
+        confiável; o mapa e os planejadores só mudam se a estimativa final mudar"""
+        estimativa = self.mapa_conhecido.get(posicao)
+        for tentativa in range(self.ruido.maximo_leituras):
+            if tentativa:
+                self.releituras += 1
+            leitura = self.robo.observar(direcao_sensor)
+            if leitura is None:
+                continue  # Leitura perdida
+            if leitura == TipoSensor.HUMANO:
+                estimativa = leitura  # Nunca inventada pelo ruído
+                break
+            contagem = self.evidencias.somar(posicao, 1 if leitura == TipoSensor.VAZIO else -1)
+            estimativa = (TipoSensor.VAZIO if contagem > 0 else
+                          TipoSensor.PAREDE if contagem < 0 else None)
+            if abs(contagem) >= self.ruido.confianca:
+                break
+        
+        if estimativa != self.mapa_conhecido.get(posicao):
+            if estimativa is None:
+                del self.mapa_conhecido[posicao]
+            else:
+                self.mapa_conhecido[posicao] = estimativa
+            self._atualizar_planejadores(posicao)
+    
+    def _humano_a_frente(self) -> bool:
+        """Humano imediatamente à frente (com ruído, segundo o mapa estimado)"""
+        if self.evidencias is None:
+            return self.robo._ler_sensor_frente() == TipoSensor.HUMANO
+        return self.mapa_conhecido.get(self.robo.posicao + self.robo.direcao.get_delta()) == TipoSensor.HUMANO
+    
+    def _atualizar_planejadores(self, posicao: Posicao) -> None:
+        """Reflete no grafo de junções e no campo de distâncias o que se sabe sobre a célula"""
+        leitura = self.mapa_conhecido.get(posicao)
+        livre = leitura == TipoSensor.VAZIO and self.robo.labirinto.posicao_valida(posicao)
+        self.distancias.definir_livre(posicao, livre)
+        self.grafo.definir_livre(posicao, livre)
+        self.grafo.definir_forcado(posicao, livre and (self._e_fronteira(posicao) or
+                                                        posicao in self.entradas))
+        if leitura == TipoSensor.HUMANO:
+            self.humanos_avistados.add(posicao)
+            # Vizinhas do humano viram destinos de exploração
+            for direcao in Direcao:
+                vizinha = posicao + direcao.get_delta()
+                if self.mapa_conhecido.get(vizinha, TipoSensor.HUMANO) != TipoSensor.HUMANO:
+                    self._atualizar_planejadores(vizinha)
+        else:
+            self.humanos_avistados.discard(posicao)
+    
+    def _e_fronteira(self, posicao: Posicao) -> bool:
+        """Célula ainda não visitada ou vizinha de um humano já avistado"""
+        if posicao not in self.visitadas:
+            return True
+        return any(self.mapa_conhecido.get(posicao + direcao.get_delta()) == TipoSensor.HUMANO
+                   for direcao in Direcao)
+    
+    def reconstruir_planejadores(self) -> None:
+        """Recria grafo e campo de distâncias a partir do mapa conhecido (ex.: após um checkpoint)"""
+        self.distancias = CampoDistancias(*self.robo.labirinto.entradas)
+        self.grafo = GrafoJuncoes(self._chave_planejamento)
+        self.humanos_avistados = set()
+        for posicao in self.mapa_conhecido:
+            self._atualizar_planejadores(posicao)
+    
+    def _chave_planejamento(self, posicao: Posicao) -> Tuple:
+        """Ordem de desempate do planejamento: mais perto de uma entrada, depois coordenadas no
+        referencial da missão (com entrada no topo, equivale a linha e coluna)"""
+        distancia = self.distancias.distancia(posicao)
+        (fx, fy), (dx, dy) = self._eixo_frente, self._eixo_direita
+        return (distancia if distancia is not None else float('inf'),
+                posicao.x * fx + posicao.y * fy, -(posicao.x * dx + posicao.y * dy))
+    
+    @staticmethod
+    def _direcao_entre(origem: Posicao, destino: Posicao) -> Optional[Direcao]:
+        """Direção do passo entre duas células vizinhas"""
+        for direcao in Direcao:
+            if origem + direcao.get_delta() == destino:
+                return direcao
+        return None
     
     def _pode_mover_para(self, posicao: Posicao) -> bool:
         """Verifica se pode mover para uma posição baseado no mapa conhecido"""
@@ -82,14 +239,16 @@ class AlgoritmoBusca:
     def _escolher_proxima_direcao(self) -> Optional[Direcao]:
         """Escolhe a próxima direção usando estratégia de exploração"""
         posicao_atual = self.robo.posicao
+        if self.alvo_humano is not None:
+            return self._direcao_para_alvo()
         
         # Lista todas as direções possíveis em ordem de prioridade
         # (primeiro tenta manter direção atual, depois esquerda, direita, trás)
         direcoes = [
             self.robo.direcao,  # Frente
-            Direcao((self.robo.direcao.value - 1) % 4),  # Esquerda
+            self.robo.direcao.girar_esquerda(),  # Esquerda
             self.robo.direcao.girar_direita(),  # Direita
-            Direcao((self.robo.direcao.value + 2) % 4)   # Trás
+            self.robo.direcao.oposta()   # Trás
         ]
         
         for direcao in direcoes:
@@ -98,36 +257,100 @@ class AlgoritmoBusca:
             # Prioriza posições não visitadas
             if (self._pode_mover_para(nova_posicao) and 
                 nova_posicao not in self.visitadas):
+                self.caminho_exploracao = []
                 return direcao
         
-        # Se não há posições não visitadas, pode revisitar
-        for direcao in direcoes:
-            nova_posicao = posicao_atual + direcao.get_delta()
-            
-            if self._pode_mover_para(nova_posicao):
-                return direcao
+        # Sem vizinhos novos: segue (ou planeja no grafo) até a fronteira mais próxima
+        while self.caminho_exploracao and self.caminho_exploracao[0] == posicao_atual:
+            self.caminho_exploracao.pop(0)
+        if not self.caminho_exploracao:
+            caminho = self.grafo.caminho_mais_curto(posicao_atual, self._e_fronteira)
+            if not caminho:
+                return None  # Nenhuma fronteira alcançável
+            self.caminho_exploracao = caminho
+        
+        return self._direcao_entre(posicao_atual, self.caminho_exploracao[0])
+    
+    def _direcao_para_alvo(self) -> Optional[Direcao]:
+        """Segue pelo grafo, sem desvios de exploração, até uma vizinha da vítima escolhida"""
+        posicao_atual = self.robo.posicao
+        alvo = self.alvo_humano
+        direcao = self._direcao_entre(posicao_atual, alvo)
+        if direcao is not None:
+            return direcao  # Ao lado da vítima: vira para ela
         
-        return None  # Nenhuma direção válida
+        while self.caminho_exploracao and self.caminho_exploracao[0] == posicao_atual:
+            self.caminho_exploracao.pop(0)
+        if not self.caminho_exploracao:
+            caminho = self.grafo.caminho_mais_curto(
+                posicao_atual, lambda posicao: self._direcao_entre(posicao, alvo) is not None)
+            if not caminho:
+                # Sem acesso conhecido: volta a explorar normalmente
+                self.alvo_humano = None
+                return self._escolher_proxima_direcao()
+            self.caminho_exploracao = caminho
+        return self._direcao_entre(posicao_atual, self.caminho_exploracao[0])
     
-    def _virar_para_direcao(self, direcao_alvo: Direcao) -> None:
+    def _escolher_vitima(self) -> Optional[Posicao]:
+        """Próxima vítima entre as já avistadas: a mais próxima de uma entrada pelo mapa conhecido
+        (viagens curtas primeiro reduzem o tempo médio até o resgate)"""
+        candidatas = []
+        for humano in self.humanos_avistados:
+            distancias = [self.distancias.distancia(humano + direcao.get_delta()) for direcao in Direcao]
+            conhecidas = [distancia for distancia in distancias if distancia is not None]
+            if conhecidas:
+                candidatas.append((min(conhecidas) + 1, self._chave_planejamento(humano)[1:], humano))
+        return min(candidatas, key=lambda candidata: candidata[:2])[2] if candidatas else None
+    
+    def _iniciar_viagem(self) -> None:
+        """Prepara a busca pela próxima vítima mantendo o mapa conhecido e os planejadores"""
+        if self.posicao_coletada is not None:
+            # O lugar do humano resgatado ficou livre (o retorno não voltou a lê-lo)
+            self.mapa_conhecido[self.posicao_coletada] = TipoSensor.VAZIO
+            for posicao in [self.posicao_coletada] + [self.posicao_coletada + direcao.get_delta()
+                                                      for direcao in Direcao]:
+                if posicao in self.mapa_conhecido:
+                    self._atualizar_planejadores(posicao)
+            self.posicao_coletada = None
+        self.humano_encontrado = False
+        self.humano_coletado = False
+        self.caminho_volta = None
+        self.indice_volta = 0
+        self.nucleo_retorno = None
+        self.caminho_exploracao = []
+        self.iteracao = 0
+        self.alvo_humano = self._escolher_vitima()
+        self.fase = FASE_EXPLORACAO
+    
+    def _passos_virar(self, direcao_alvo: Direcao) -> Passos:
         """Vira o robô para a direção especificada"""
         while self.robo.direcao != direcao_alvo:
             self.robo.girar()
+            yield ComandoRobo.GIRAR, 1
             self._atualizar_mapa()
     
+    def _salvar_checkpoint_se_necessario(self) -> None:
+        """Ponto seguro de checkpoint (entre comandos, com estado consistente)"""
+        if self.checkpoint is not None:
+            self.checkpoint.talvez_salvar(self)
+    
     def _explorar_ate_encontrar_humano(self) -> None:
+        """Versão direta de _passos_exploracao"""
+        _esgotar(self._passos_exploracao())
+    
+    def _passos_exploracao(self) -> Passos:
         """Explora o labirinto até encontrar o humano"""
         max_iteracoes = 10000  # Proteção contra loops infinitos
-        iteracao = 0
         
-        while not self.humano_encontrado and iteracao < max_iteracoes:
-            iteracao += 1
+        while not self.humano_encontrado and self.iteracao < max_iteracoes:
+            self._salvar_checkpoint_se_necessario()
+            self.iteracao += 1
             
             # Atualiza mapa com sensores atuais
             self._atualizar_mapa()
             
             # Verifica se humano está à frente
-            if self.robo._ler_sensor_frente() == TipoSensor.HUMANO:
+            if self._humano_a_frente():
                 self.humano_encontrado = True
                 return
             
@@ -135,147 +358,175 @@ class AlgoritmoBusca:
             proxima_direcao = self._escolher_proxima_direcao()
             
             if proxima_direcao is None:
-                raise RoboException("Robô ficou preso - nenhuma direção válida!")
+                raise RoboException("Labirinto explorado sem encontrar humano acessível!")
             
             # Vira para a direção escolhida se necessário
-            self._virar_para_direcao(proxima_direcao)
+            yield from self._passos_virar(proxima_direcao)
 
             # Após reorientar, verifica novamente se humano está à frente
-            if self.robo._ler_sensor_frente() == TipoSensor.HUMANO:
+            if self._humano_a_frente():
                 self.humano_encontrado = True
                 return
             
             # Move para frente
             self.robo.avancar()
+            yield ComandoRobo.AVANCAR, 1
             
             # Registra movimento no caminho
-            self.caminho_percorrido.append((self.robo.posicao, self.robo.direcao))
+            self.trajetoria.registrar(self.robo.posicao, self.robo.direcao)
         
         if not self.humano_encontrado:
             raise RoboException("Limite de iterações atingido sem encontrar humano!")
     
+    def _preencher_becos(self) -> None:
+        """Núcleo do mapa conhecido para o retorno: ramos sem saída preenchidos,
+        preservando a posição atual e as entradas"""
+        self.nucleo_retorno = nucleo_sem_becos(self.distancias.livres,
+                                               (self.robo.posicao, *self.entradas))
+    
     def _calcular_caminho_volta(self) -> List[Posicao]:
-        """Calcula caminho eficiente de volta à entrada EVITANDO becos sem saída"""
-        # BFS para encontrar caminho mais curto conhecido QUE EVITA BECOS
-        fila = deque([(self.robo.posicao, [])])
-        visitados_bfs = {self.robo.posicao}
+        """Caminho de volta à entrada EVITANDO becos sem saída, lido do campo de distâncias"""
+        # O retorno só considera o núcleo sem ramos sem saída (calculado antes da coleta;
+        # missões retomadas de checkpoint o recalculam aqui)
+        if self.nucleo_retorno is None:
+            self._preencher_becos()
+        if len(self.entradas) > 1:
+            # Várias saídas: a mais próxima em comandos (avanços e giros), não só em avanços
+            caminho = self.distancias.caminho_menos_comandos(self.robo.posicao, self.robo.direcao,
+                                                             self.nucleo_retorno)
+        else:
+            caminho = self.distancias.caminho_ate_origem(self.robo.posicao, self.nucleo_retorno,
+                                                         self._ordem_direcoes)
         
-        while fila:
-            posicao_atual, caminho = fila.popleft()
-            
-            # Se chegou à entrada, retorna caminho
-            if posicao_atual == self.posicao_entrada:
-                return caminho + [posicao_atual]
-            
-            # Explora vizinhos conhecidos
-            for direcao in Direcao:
-                nova_posicao = posicao_atual + direcao.get_delta()
-                
-                if (nova_posicao not in visitados_bfs and
-                    nova_posicao in self.mapa_conhecido and
-                    self.mapa_conhecido[nova_posicao] == TipoSensor.VAZIO):
-                    
-                    # VALIDAÇÃO CRÍTICA: Evita becos sem saída com humano
-                    if self._e_beco_sem_saida(nova_posicao):
-                        continue  # Pula posições que são becos sem saída
-                    
-                    visitados_bfs.add(nova_posicao)
-                    novo_caminho = caminho + [posicao_atual]
-                    fila.append((nova_posicao, novo_caminho))
+        if caminho is None:
+            raise RoboException("Não foi possível encontrar caminho de volta!")
         
-        raise RoboException("Não foi possível encontrar caminho de volta!")
+        return [self.robo.posicao] + caminho
+    
+    def _voltar_para_entrada(self) -> None:
+        """Versão direta de _passos_retorno"""
+        _esgotar(self._passos_retorno())
     
-    def _e_beco_sem_saida(self, posicao: Posicao) -> bool:
-        """Verifica se uma posição é um beco sem saída"""
-        if posicao == self.posicao_entrada:
-            return False  # Entrada nunca é beco sem saída
+    def _passos_retorno(self) -> Passos:
+        """Retorna à entrada pelo caminho mais eficiente"""
+        # Ao retomar de um checkpoint, segue o caminho já calculado para manter o log idêntico
+        if self.caminho_volta is None:
+            self.caminho_volta = self._calcular_caminho_volta()
+            self.indice_volta = 0
         
-        # Conta quantas saídas a posição tem
-        saidas = 0
-        for direcao in Direcao:
-            posicao_vizinha = posicao + direcao.get_delta()
+        while self.indice_volta < len(self.caminho_volta):
+            self._salvar_checkpoint_se_necessario()
+            posicao_alvo = self.caminho_volta[self.indice_volta]
+            if self.robo.posicao == posicao_alvo:
+                self.indice_volta += 1
+                continue
             
-            # Se conhece a posição e não é parede, conta como saída
-            if (posicao_vizinha in self.mapa_conhecido and 
-                self.mapa_conhecido[posicao_vizinha] != TipoSensor.PAREDE):
-                saidas += 1
-        
-        # Se tem apenas 1 saída ou menos, é beco sem saída
-        return saidas <= 1
+            # Trechos retos do caminho são percorridos com um único avanço múltiplo
+            direcao = self._direcao_entre(self.robo.posicao, posicao_alvo)
+            yield from self._passos_virar(direcao)
+            reta = 1
+            while (self.indice_volta + reta < len(self.caminho_volta) and
+                   self.caminho_volta[self.indice_volta + reta] ==
+                   self.caminho_volta[self.indice_volta + reta - 1] + direcao.get_delta()):
+                reta += 1
+            avancos = self.robo.avancar_n(reta)
+            self.indice_volta += avancos
+            yield ComandoRobo.AVANCAR, avancos
+            self._atualizar_mapa()
     
-    def _mover_para_posicao(self, posicao_alvo: Posicao) -> None:
-        """Move o robô para uma posição específica"""
-        posicao_atual = self.robo.posicao
-        
-        # Calcula direção necessária
-        dx = posicao_alvo.x - posicao_atual.x
-        dy = posicao_alvo.y - posicao_atual.y
-        
-        # Determina direção baseada no delta
-        if dx > 0:
-            direcao_alvo = Direcao.LESTE
-        elif dx < 0:
-            direcao_alvo = Direcao.OESTE
-        elif dy > 0:
-            direcao_alvo = Direcao.SUL
-        elif dy < 0:
-            direcao_alvo = Direcao.NORTE
-        else:
-            return  # Já está na posição
-        
-        # Vira para a direção e move
-        self._virar_para_direcao(direcao_alvo)
-        self.robo.avancar()
-        self._atualizar_mapa()
+    def _informar(self, mensagem: str) -> None:
+        """Mensagem de progresso da missão (omitida em execuções silenciosas)"""
+        if self.verboso:
+            print(mensagem)
     
-    def _voltar_para_entrada(self) -> None:
-        """Retorna à entrada pelo caminho mais eficiente"""
-        caminho_volta = self._calcular_caminho_volta()
-        
-        for posicao_alvo in caminho_volta:
-            if self.robo.posicao != posicao_alvo:
-                self._mover_para_posicao(posicao_alvo)
+    @contextmanager
+    def _cronometrar(self, fase: str) -> Iterator[None]:
+        """Acumula o tempo gasto na fase (inclusive se ela terminar em falha)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos_fases[fase] = self.tempos_fases.get(fase, 0.0) + time.perf_counter() - inicio
     
     def executar_missao(self) -> bool:
         """Executa a missão completa de busca e salvamento"""
+        return _esgotar(self.passos_missao())
+    
+    def passos_missao(self) -> Generator[Passo, None, bool]:
+        """Missão completa passo a passo: pausa após cada comando e, no fim, devolve o sucesso
+        (permite intercalar muitas missões, ex.: src/escalonador.py)"""
         try:
-            print("🤖 Iniciando missão de busca e salvamento...")
-            
-            # Fase 1: Explorar até encontrar humano
-            print("📍 Fase 1: Explorando labirinto...")
-            self._explorar_ate_encontrar_humano()
-            print("✅ Humano encontrado!")
-            
-            # Fase 2: Coletar humano
-            print("🔄 Fase 2: Coletando humano...")
-            self.robo.pegar_humano()
-            self.humano_coletado = True
-            print("✅ Humano coletado!")
+            self._informar("🤖 Iniciando missão de busca e salvamento...")
             
-            # Fase 3: Retornar à entrada
-            print("🏠 Fase 3: Retornando à entrada...")
-            self._voltar_para_entrada()
-            print("✅ Chegou à entrada!")
-            
-            # Fase 4: Ejetar humano
-            print("🚀 Fase 4: Ejetando humano...")
-            self.robo.ejetar_humano()
-            self.missao_concluida = True
-            print("✅ Missão concluída com sucesso!")
+            while self.fase != FASE_CONCLUIDA:
+                # Fase 1: Explorar até encontrar humano
+                if self.fase == FASE_EXPLORACAO:
+                    with self._cronometrar('exploracao'):
+                        self._informar("📍 Fase 1: Explorando labirinto...")
+                        yield from self._passos_exploracao()
+                        self._informar("✅ Humano encontrado!")
+                        self.fase = FASE_COLETA
+                
+                # Fase 2: Coletar humano
+                if self.fase == FASE_COLETA:
+                    with self._cronometrar('coleta'):
+                        self._informar("🔄 Fase 2: Coletando humano...")
+                        self._preencher_becos()
+                        self.robo.pegar_humano()
+                        self.posicao_coletada = self.robo.posicao + self.robo.direcao.get_delta()
+                        yield ComandoRobo.PEGAR, 1
+                        self.humano_coletado = True
+                        self._informar("✅ Humano coletado!")
+                        self.fase = FASE_RETORNO
+                
+                # Fase 3: Retornar à entrada
+                if self.fase == FASE_RETORNO:
+                    with self._cronometrar('retorno'):
+                        self._informar("🏠 Fase 3: Retornando à entrada...")
+                        yield from self._passos_retorno()
+                        self._informar("✅ Chegou à entrada!")
+                        self.fase = FASE_EJECAO
+                
+                # Fase 4: Ejetar humano
+                if self.fase == FASE_EJECAO:
+                    with self._cronometrar('ejecao'):
+                        self._salvar_checkpoint_se_necessario()
+                        self._informar("🚀 Fase 4: Ejetando humano...")
+                        comandos_antes = self.robo.comandos_executados
+                        self.robo.ejetar_humano()
+                        # O robô se vira para a saída antes de ejetar
+                        giros = self.robo.comandos_executados - comandos_antes - 1
+                        if giros:
+                            yield ComandoRobo.GIRAR, giros
+                        yield ComandoRobo.EJETAR, 1
+                        self.resgatados += 1
+                    if self.resgatados < self.total_humanos:
+                        self._informar(f"✅ Humano resgatado ({self.resgatados}/{self.total_humanos})")
+                        self._iniciar_viagem()
+                    else:
+                        self.missao_concluida = True
+                        self.fase = FASE_CONCLUIDA
+                        self._informar("✅ Missão concluída com sucesso!")
             
             return True
             
         except Exception as e:
-            print(f"❌ Falha na missão: {e}")
+            self.erro = str(e)
+            self.tipo_erro = type(e).__name__
+            self._informar(f"❌ Falha na missão: {e}")
             return False
+        finally:
+            self.trajetoria.descarregar()
     
     def get_estatisticas(self) -> Dict:
         """Retorna estatísticas da exploração"""
         return {
             'posicoes_visitadas': len(self.visitadas),
             'posicoes_conhecidas': len(self.mapa_conhecido),
-            'caminho_percorrido': len(self.caminho_percorrido),
+            'caminho_percorrido': len(self.trajetoria),
             'humano_encontrado': self.humano_encontrado,
             'humano_coletado': self.humano_coletado,
-            'missao_concluida': self.missao_concluida
+            'missao_concluida': self.missao_concluida,
+            'humanos_resgatados': self.resgatados,
+            'humanos_total': self.total_humanos
         }
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Ambiente de controle no estilo reset/step sobre o Robo
+Permite que controladores externos dirijam o robô sem lidar com exceções
+"""
+
+from typing import Optional, Tuple, Union
+from .estruturas import (
+    ComandoRobo, TipoSensor, StatusCarga, TipoAlarme,
+    ColisaoException, AtropelamentoException, BecoSemSaidaException,
+    OperacaoInvalidaException, RoboException
+)
+from .labirinto import Labirinto
+from .logger import LoggerRobo
+from .robo import Robo
+
+
+Observacao = Tuple[TipoSensor, TipoSensor, TipoSensor, StatusCarga]
+
+_ALARME_POR_EXCECAO = {
+    ColisaoException: TipoAlarme.COLISAO,
+    AtropelamentoException: TipoAlarme.ATROPELAMENTO,
+    BecoSemSaidaException: TipoAlarme.BECO_SEM_SAIDA,
+    OperacaoInvalidaException: TipoAlarme.OPERACAO_INVALIDA,
+}
+
+
+class AmbienteRobo:
+    """Envolve Labirinto + Robo em uma API reset/step com códigos de alarme"""
+
+    def __init__(self, registrar_log: bool = False, diretorio_logs: str = "logs"):
+        """Configura o ambiente (log CSV desligado por padrão para reduzir custo por passo)"""
+        self.registrar_log = registrar_log
+        self.diretorio_logs = diretorio_logs
+        self.labirinto: Optional[Labirinto] = None
+        self.robo: Optional[Robo] = None
+        self.logger: Optional[LoggerRobo] = None
+        self.terminal = True
+        self.passos = 0
+        self._acoes = {}
+
+    def reset(self, labirinto: Optional[Union[Labirinto, str]] = None) -> Observacao:
+        """Inicia um episódio; reutiliza o Labirinto já carregado quando possível"""
+        if isinstance(labirinto, str):
+            labirinto = Labirinto(labirinto)
+        elif labirinto is None:
+            labirinto = self.labirinto
+        if labirinto is None:
+            raise RoboException("Nenhum labirinto informado para o ambiente")
+
+        labirinto.reiniciar()
+        self.labirinto = labirinto
+        self.logger = (LoggerRobo(labirinto.arquivo_mapa, self.diretorio_logs)
+                       if self.registrar_log else None)
+        self.robo = Robo(labirinto, self.logger)
+        self.terminal = False
+        self.passos = 0
+
+        robo = self.robo
+        self._acoes = {
+            ComandoRobo.AVANCAR: robo.avancar,
+            ComandoRobo.GIRAR: robo.girar,
+            ComandoRobo.PEGAR: robo.pegar_humano,
+            ComandoRobo.EJETAR: robo.ejetar_humano,
+        }
+        # Aceita também as letras da sequência compacta ('A', 'G', 'P', 'E')
+        for comando in list(self._acoes):
+            self._acoes[comando.value] = self._acoes[comando]
+
+        return self._observar()
+
+    def _observar(self) -> Observacao:
+        """Leitura atual: (esquerdo, direito, frente, carga)"""
+        robo = self.robo
+        return (
+            robo._ler_sensor_esquerdo(),
+            robo._ler_sensor_direito(),
+            robo._ler_sensor_frente(),
+            StatusCarga.COM_HUMANO if robo.tem_humano else StatusCarga.SEM_CARGA,
+        )
+
+    def step(self, comando: Union[ComandoRobo, str]) -> Tuple[Observacao, bool, TipoAlarme]:
+        """Executa um comando e retorna (observação, terminal, alarme) sem lançar alarmes"""
+        if self.terminal:
+            raise RoboException("Episódio encerrado: chame reset() antes de step()")
+
+        acao = self._acoes.get(comando)
+        if acao is None:
+            raise RoboException(f"Comando inválido: {comando}")
+
+        self.passos += 1
+        alarme = TipoAlarme.NENHUM
+        try:
+            acao()
+        except RoboException as e:
+            alarme = _ALARME_POR_EXCECAO.get(type(e))
+            if alarme is None:
+                raise
+            self.terminal = True
+        else:
+            # A ejeção do último humano encerra a missão
+            if (acao == self.robo.ejetar_humano and
+                    self.labirinto.resgatados == len(self.labirinto.posicoes_humanos)):
+                self.terminal = True
+
+        return self._observar(), self.terminal, alarme
+
+    def salvar_log(self) -> None:
+        """Salva o log CSV do episódio atual (se o registro estiver ativo)"""
+        if self.logger is not None:
+            self.logger.salvar_log()
@@ -0,0 +1,446 @@
+"""
+Busca cooperativa com múltiplos robôs compartilhando um único mapa conhecido
+Os robôs entram pela entrada e são escalonados em passo único (um comando por ciclo)
+"""
+
+import csv
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+from .estruturas import Posicao, Direcao, TipoSensor, RoboException
+from .labirinto import Labirinto, nome_base_mapa
+from .logger import LoggerRobo
+from .robo import Robo
+
+
+# Ciclos bloqueado antes de ceder passagem em um confronto frente a frente
+PACIENCIA = 3
+
+
+@dataclass
+class AgenteRobo:
+    """Estado de escalonamento de um robô da equipe"""
+    id: int
+    logger: LoggerRobo
+    robo: Optional[Robo] = None
+    alvo: Optional[Posicao] = None
+    caminho: List[Posicao] = field(default_factory=list)
+    recuo: Optional[Posicao] = None
+    espera: int = 0
+    concluido: bool = False
+    entradas_registradas: int = 0
+
+    @property
+    def dentro(self) -> bool:
+        """Robô está ligado e ainda dentro do labirinto"""
+        return self.robo is not None and not self.concluido
+
+
+class BuscaCooperativa:
+    """Coordena K robôs com mapa compartilhado e atribuição de fronteiras"""
+
+    def __init__(self, labirinto: Labirinto, num_robos: int, diretorio_logs: str = "logs"):
+        """Prepara os robôs (ligados sob demanda quando a entrada estiver livre)"""
+        if num_robos < 1:
+            raise RoboException("A equipe precisa de pelo menos um robô")
+        if len(labirinto.posicoes_humanos) > 1:
+            raise RoboException("A busca cooperativa aceita um único humano por mapa")
+
+        self.labirinto = labirinto
+        self.posicao_entrada = labirinto.entrada
+        self.agentes = [
+            AgenteRobo(i + 1, LoggerRobo(labirinto.arquivo_mapa, diretorio_logs, f"_robo{i + 1}"))
+            for i in range(num_robos)
+        ]
+
+        # Conhecimento compartilhado
+        self.mapa_conhecido: Dict[Posicao, TipoSensor] = {}
+        self.visitadas: Set[Posicao] = set()
+
+        # Linha do tempo mesclada: ciclo, robô e a linha do log individual
+        nome_base = nome_base_mapa(labirinto.arquivo_mapa)
+        self.arquivo_linha_do_tempo = os.path.join(diretorio_logs, f"{nome_base}_linha_do_tempo.csv")
+        self.linha_do_tempo: List[List[str]] = []
+
+        # Estados da missão
+        self.ciclo = 0
+        self.ciclo_humano_encontrado: Optional[int] = None
+        self.ciclo_resgate: Optional[int] = None
+        self.posicao_humano: Optional[Posicao] = None
+        self.resgatador: Optional[AgenteRobo] = None
+        self.humano_coletado = False
+        self.missao_concluida = False
+        self.max_ciclos = 20 * labirinto.largura * labirinto.altura + 100
+
+    # ------------------------------------------------------------------
+    # Mapa compartilhado
+    # ------------------------------------------------------------------
+
+    def _atualizar_mapa(self, agente: AgenteRobo) -> None:
+        """Registra as leituras dos sensores do robô no mapa compartilhado"""
+        robo = agente.robo
+        direcao = robo.direcao
+        leituras = [
+            (direcao.girar_esquerda(), robo._ler_sensor_esquerdo()),
+            (direcao.girar_direita(), robo._ler_sensor_direito()),
+            (direcao, robo._ler_sensor_frente()),
+        ]
+        for direcao_sensor, leitura in leituras:
+            posicao = robo.posicao + direcao_sensor.get_delta()
+            self.mapa_conhecido[posicao] = leitura
+            if leitura == TipoSensor.HUMANO and self.posicao_humano is None:
+                self.posicao_humano = posicao
+                self.ciclo_humano_encontrado = self.ciclo
+
+        self.visitadas.add(robo.posicao)
+        self.mapa_conhecido[robo.posicao] = TipoSensor.VAZIO
+
+    def _livre(self, posicao: Posicao) -> bool:
+        """Célula conhecida e transitável"""
+        return (self.mapa_conhecido.get(posicao) == TipoSensor.VAZIO and
+                self.labirinto.posicao_valida(posicao))
+
+    def _e_beco_sem_saida(self, posicao: Posicao) -> bool:
+        """Mesma regra de AlgoritmoBusca: até uma saída conhecida é beco"""
+        if posicao == self.posicao_entrada:
+            return False
+        saidas = 0
+        for direcao in Direcao:
+            tipo = self.mapa_conhecido.get(posicao + direcao.get_delta())
+            if tipo is not None and tipo != TipoSensor.PAREDE:
+                saidas += 1
+        return saidas <= 1
+
+    def _ocupadas(self, exceto: Optional[AgenteRobo] = None) -> Dict[Posicao, AgenteRobo]:
+        """Células ocupadas pelos demais robôs dentro do labirinto"""
+        return {a.robo.posicao: a for a in self.agentes if a.dentro and a is not exceto}
+
+    def _bfs(self, origem: Posicao, objetivo: Callable[[Posicao], bool],
+             bloqueadas: Set[Posicao] = frozenset()) -> Optional[List[Posicao]]:
+        """Caminho mais curto (sem a origem) até a célula mais próxima que satisfaz o objetivo"""
+        anteriores: Dict[Posicao, Optional[Posicao]] = {origem: None}
+        fila = deque([origem])
+        while fila:
+            atual = fila.popleft()
+            if atual != origem and objetivo(atual):
+                caminho = []
+                while atual != origem:
+                    caminho.append(atual)
+                    atual = anteriores[atual]
+                caminho.reverse()
+                return caminho
+            for direcao in Direcao:
+                vizinha = atual + direcao.get_delta()
+                if (vizinha not in anteriores and vizinha not in bloqueadas and
+                        self._livre(vizinha)):
+                    anteriores[vizinha] = atual
+                    fila.append(vizinha)
+        return None
+
+    def _campo_distancias(self, permitida: Callable[[Posicao], bool]) -> Dict[Posicao, int]:
+        """Distância até a entrada sobre as células conhecidas permitidas"""
+        distancias = {self.posicao_entrada: 0}
+        fila = deque([self.posicao_entrada])
+        while fila:
+            atual = fila.popleft()
+            for direcao in Direcao:
+                vizinha = atual + direcao.get_delta()
+                if (vizinha not in distancias and self._livre(vizinha) and
+                        permitida(vizinha)):
+                    distancias[vizinha] = distancias[atual] + 1
+                    fila.append(vizinha)
+        return distancias
+
+    # ------------------------------------------------------------------
+    # Execução de comandos
+    # ------------------------------------------------------------------
+
+    def _registrar_linha_do_tempo(self, agente: AgenteRobo) -> None:
+        """Copia as novas linhas do log individual para a linha do tempo mesclada"""
+        entradas = agente.logger.entradas
+        for entrada in entradas[agente.entradas_registradas:]:
+            self.linha_do_tempo.append([str(self.ciclo), f"robo{agente.id}"] + entrada)
+        agente.entradas_registradas = len(entradas)
+
+    def _ligar(self, agente: AgenteRobo) -> None:
+        """Liga o robô na entrada (a entrada deve estar livre)"""
+        agente.robo = Robo(self.labirinto, agente.logger)
+        self._atualizar_mapa(agente)
+
+    def _mover_para(self, agente: AgenteRobo, destino: Posicao) -> bool:
+        """Executa um único comando rumo à célula vizinha; retorna True se avançou"""
+        robo = agente.robo
+        delta = (destino.x - robo.posicao.x, destino.y - robo.posicao.y)
+        if robo.direcao.get_delta() != delta:
+            robo.girar()
+            self._atualizar_mapa(agente)
+            return False
+
+        if destino in self._ocupadas(agente):
+            raise RoboException(f"Robô {agente.id} colidiria com outro robô em {destino}")
+
+        robo.avancar()
+        self._atualizar_mapa(agente)
+        return True
+
+    # ------------------------------------------------------------------
+    # Decisões por fase
+    # ------------------------------------------------------------------
+
+    def _explorar(self, agente: AgenteRobo) -> None:
+        """Segue até a fronteira atribuída (célula livre conhecida e não visitada)"""
+        ocupadas = self._ocupadas(agente)
+        if agente.recuo is not None:
+            if agente.recuo in ocupadas:
+                agente.espera += 1
+                if agente.espera > 2 * PACIENCIA:
+                    agente.recuo = None
+            elif self._mover_para(agente, agente.recuo):
+                agente.recuo = None
+                agente.espera = 0
+            return
+
+        reservadas = {a.alvo for a in self.agentes if a is not agente and a.alvo is not None}
+
+        def fronteira(posicao: Posicao) -> bool:
+            return posicao not in self.visitadas and posicao not in reservadas
+
+        if agente.alvo is None or agente.alvo in self.visitadas or not agente.caminho:
+            agente.caminho = self._bfs(agente.robo.posicao, fronteira) or []
+            if not agente.caminho:
+                agente.caminho = self._tomar_fronteira(agente)
+            agente.alvo = agente.caminho[-1] if agente.caminho else None
+            if agente.alvo is None:
+                return
+
+        proxima = agente.caminho[0]
+        if proxima in ocupadas:
+            agente.espera += 1
+            desvio = self._bfs(agente.robo.posicao, fronteira, set(ocupadas))
+            if desvio:
+                agente.caminho, agente.alvo = desvio, desvio[-1]
+                agente.espera = 0
+            elif agente.espera > PACIENCIA:
+                bloqueador = ocupadas[proxima]
+                ocioso = bloqueador.alvo is None and bloqueador.recuo is None
+                if ocioso or agente.id < bloqueador.id:
+                    self._ceder_passagem(bloqueador, agente)
+                elif bloqueador.espera > 0:
+                    self._ceder_passagem(agente, bloqueador)
+            return
+
+        agente.espera = 0
+        if self._mover_para(agente, proxima):
+            agente.caminho.pop(0)
+
+    def _tomar_fronteira(self, agente: AgenteRobo) -> List[Posicao]:
+        """Assume uma fronteira reservada se este robô estiver mais perto que o dono"""
+        caminho = self._bfs(agente.robo.posicao, lambda p: p not in self.visitadas)
+        if not caminho:
+            return []
+        for dono in self.agentes:
+            if dono is not agente and dono.alvo == caminho[-1]:
+                if len(caminho) >= len(dono.caminho):
+                    return []
+                dono.alvo = None
+                dono.caminho = []
+        return caminho
+
+    def _ceder_passagem(self, agente: AgenteRobo, prioritario: AgenteRobo,
+                        cadeia: Optional[Set[int]] = None) -> bool:
+        """Tira o robô do caminho do prioritário, empurrando em cadeia quem estiver atrás"""
+        cadeia = cadeia if cadeia is not None else {prioritario.id}
+        cadeia.add(agente.id)
+        ocupadas = self._ocupadas(agente)
+        proibidas = {a.robo.posicao for a in self.agentes if a.dentro and a.id in cadeia}
+        caminho_prioritario = set(prioritario.caminho)
+
+        opcoes = [agente.robo.posicao + d.get_delta() for d in Direcao]
+        opcoes = [p for p in opcoes if self._livre(p) and p not in proibidas]
+        # Prefere células livres e fora do caminho do prioritário; se não houver, recua ao longo dele
+        opcoes.sort(key=lambda p: (p in ocupadas, p in caminho_prioritario))
+
+        for opcao in opcoes:
+            outro = ocupadas.get(opcao)
+            if outro is not None and not self._ceder_passagem(outro, agente, cadeia):
+                continue
+            agente.alvo = None
+            agente.caminho = []
+            agente.recuo = opcao
+            agente.espera = 0
+            return True
+        return False
+
+    def _escolher_resgatador(self) -> None:
+        """Atribui o humano ao robô com o menor caminho conhecido até ele"""
+        def vizinha_humano(posicao: Posicao) -> bool:
+            return any(posicao + d.get_delta() == self.posicao_humano for d in Direcao)
+
+        melhor = None
+        for agente in self.agentes:
+            if not agente.dentro:
+                continue
+            if vizinha_humano(agente.robo.posicao):
+                caminho = []
+            else:
+                caminho = self._bfs(agente.robo.posicao, vizinha_humano)
+                if caminho is None:
+                    continue
+            if melhor is None or len(caminho) < len(melhor[1]):
+                melhor = (agente, caminho)
+
+        if melhor is not None:
+            self.resgatador = melhor[0]
+            self.resgatador.caminho = melhor[1]
+            self.resgatador.alvo = None
+
+    def _resgatar(self, agente: AgenteRobo) -> None:
+        """Leva o resgatador até o humano e o coleta"""
+        robo = agente.robo
+        if robo._ler_sensor_frente() == TipoSensor.HUMANO:
+            robo.pegar_humano()
+            self._atualizar_mapa(agente)
+            self.humano_coletado = True
+            self.mapa_conhecido[self.posicao_humano] = TipoSensor.VAZIO
+            return
+
+        if agente.caminho:
+            if self._mover_para(agente, agente.caminho[0]):
+                agente.caminho.pop(0)
+            return
+
+        # Na célula vizinha ao humano: gira até ficar de frente para ele
+        robo.girar()
+        self._atualizar_mapa(agente)
+
+    def _retornar(self, agente: AgenteRobo, seguro: Dict[Posicao, int],
+                  livre: Dict[Posicao, int]) -> None:
+        """Desce o campo de distâncias até a entrada, ejetando ou saindo do labirinto"""
+        robo = agente.robo
+        if robo.posicao == self.posicao_entrada:
+            if robo.tem_humano:
+                robo.ejetar_humano()
+                self.missao_concluida = True
+                self.ciclo_resgate = self.ciclo
+            agente.concluido = True
+            return
+
+        vizinhas = [robo.posicao + d.get_delta() for d in Direcao]
+        candidatas = [p for p in vizinhas if p in seguro]
+        campo = seguro
+        if not candidatas and not robo.tem_humano:
+            candidatas = [p for p in vizinhas if p in livre]
+            campo = livre
+        if not candidatas:
+            raise RoboException(f"Robô {agente.id} sem caminho de volta à entrada!")
+
+        proxima = min(candidatas, key=lambda p: campo[p])
+        if proxima in self._ocupadas(agente):
+            agente.espera += 1
+            return
+        agente.espera = 0
+        self._mover_para(agente, proxima)
+
+    # ------------------------------------------------------------------
+    # Escalonamento
+    # ------------------------------------------------------------------
+
+    def _executar_ciclo(self) -> bool:
+        """Executa um ciclo (até um comando por robô); retorna True se algo aconteceu"""
+        self.ciclo += 1
+        houve_acao = False
+
+        if self.humano_coletado:
+            seguro = self._campo_distancias(lambda p: not self._e_beco_sem_saida(p))
+            livre = self._campo_distancias(lambda p: True)
+
+        for agente in self.agentes:
+            if agente.concluido:
+                continue
+
+            comandos_antes = len(agente.logger.entradas)
+            concluido_antes = agente.concluido
+
+            if agente.robo is None:
+                entrada_livre = self.posicao_entrada not in self._ocupadas()
+                ligados = all(a.robo is not None for a in self.agentes if a.id < agente.id)
+                if self.posicao_humano is None and entrada_livre and ligados:
+                    self._ligar(agente)
+            elif self.humano_coletado:
+                self._retornar(agente, seguro, livre)
+            elif self.posicao_humano is not None:
+                if self.resgatador is None:
+                    self._escolher_resgatador()
+                if agente is self.resgatador:
+                    self._resgatar(agente)
+                    if self.humano_coletado:
+                        seguro = self._campo_distancias(lambda p: not self._e_beco_sem_saida(p))
+                        livre = self._campo_distancias(lambda p: True)
+            else:
+                self._explorar(agente)
+
+            if len(agente.logger.entradas) != comandos_antes or agente.concluido != concluido_antes:
+                houve_acao = True
+            self._registrar_linha_do_tempo(agente)
+
+        return houve_acao
+
+    def executar_missao(self) -> bool:
+        """Executa a missão cooperativa até todos os robôs saírem do labirinto"""
+        try:
+            print(f"🤖 Iniciando missão cooperativa com {len(self.agentes)} robôs...")
+            ciclos_ociosos = 0
+
+            while not all(a.concluido or a.robo is None and self.humano_coletado
+                          for a in self.agentes):
+                if self.ciclo >= self.max_ciclos:
+                    raise RoboException("Limite de ciclos atingido na missão cooperativa!")
+
+                if self._executar_ciclo():
+                    ciclos_ociosos = 0
+                else:
+                    ciclos_ociosos += 1
+                    if ciclos_ociosos > PACIENCIA * len(self.agentes) + 1:
+                        raise RoboException("Equipe parada - nenhuma fronteira ou humano alcançável!")
+
+            print(f"✅ Humano encontrado no ciclo {self.ciclo_humano_encontrado}, "
+                  f"resgatado no ciclo {self.ciclo_resgate}")
+            return self.missao_concluida
+
+        except Exception as e:
+            print(f"❌ Falha na missão cooperativa: {e}")
+            return False
+
+    def salvar_logs(self) -> None:
+        """Salva os CSVs individuais de cada robô e a linha do tempo mesclada"""
+        for agente in self.agentes:
+            if agente.robo is not None:
+                agente.logger.salvar_log()
+
+        try:
+            with open(self.arquivo_linha_do_tempo, 'w', newline='', encoding='utf-8') as arquivo:
+                writer = csv.writer(arquivo)
+                for entrada in self.linha_do_tempo:
+                    writer.writerow(entrada)
+            print(f"Linha do tempo salva em: {self.arquivo_linha_do_tempo}")
+        except Exception as e:
+            print(f"Erro ao salvar linha do tempo: {e}")
+
+    def get_estatisticas(self) -> Dict:
+        """Retorna estatísticas da missão cooperativa"""
+        return {
+            'robos': len(self.agentes),
+            'robos_utilizados': sum(1 for a in self.agentes if a.robo is not None),
+            'ciclos': self.ciclo,
+            'ciclo_humano_encontrado': self.ciclo_humano_encontrado,
+            'ciclo_resgate': self.ciclo_resgate,
+            'posicoes_visitadas': len(self.visitadas),
+            'posicoes_conhecidas': len(self.mapa_conhecido),
+            'comandos_por_robo': {
+                a.id: max(len(a.logger.entradas) - 1, 0) for a in self.agentes
+            },
+            'humano_coletado': self.humano_coletado,
+            'missao_concluida': self.missao_concluida
+        }
@@ -0,0 +1,120 @@
+"""
+Cache de resultados de missões endereçado por conteúdo
+Chave: hash do mapa + configuração da estratégia + impressão digital do código;
+entradas em disco (JSON + gzip) com despejo LRU limitado por tamanho
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+VERSAO_CACHE = 1
+DIRETORIO_PADRAO = os.path.join(".cache", "resultados")
+LIMITE_PADRAO_BYTES = 256 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def impressao_codigo() -> str:
+    """Hash dos fontes do pacote: qualquer mudança no algoritmo invalida o cache"""
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    resumo = hashlib.sha256()
+    for nome in sorted(os.listdir(diretorio)):
+        if nome.endswith('.py'):
+            resumo.update(nome.encode('utf-8'))
+            with open(os.path.join(diretorio, nome), 'rb') as fonte:
+                resumo.update(fonte.read())
+    return resumo.hexdigest()
+
+
+def chave_resultado(texto_mapa: str, configuracao: Dict) -> str:
+    """Chave de conteúdo de uma missão"""
+    dados = {
+        'versao': VERSAO_CACHE,
+        'mapa': hashlib.sha256(texto_mapa.encode('utf-8')).hexdigest(),
+        'configuracao': configuracao,
+        'codigo': impressao_codigo(),
+    }
+    return hashlib.sha256(json.dumps(dados, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class CacheResultados:
+    """Resultados de missões em disco, com despejo das entradas menos usadas"""
+
+    def __init__(self, diretorio: str = DIRETORIO_PADRAO, limite_bytes: int = LIMITE_PADRAO_BYTES):
+        """Abre (ou cria) o cache no diretório informado"""
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self.acertos = 0
+        self.falhas = 0
+        self._tamanho: Optional[int] = None
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _arquivo(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave[:2], f"{chave}.json.gz")
+
+    def _entradas(self) -> List[Tuple[float, int, str]]:
+        """(último uso, tamanho, caminho) de todas as entradas"""
+        entradas = []
+        for raiz, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                if nome.endswith('.json.gz'):
+                    caminho = os.path.join(raiz, nome)
+                    info = os.stat(caminho)
+                    entradas.append((info.st_mtime, info.st_size, caminho))
+        return entradas
+
+    @property
+    def tamanho(self) -> int:
+        """Bytes ocupados pelas entradas (calculado uma vez e mantido depois)"""
+        if self._tamanho is None:
+            self._tamanho = sum(tamanho for _, tamanho, _ in self._entradas())
+        return self._tamanho
+
+    def obter(self, chave: str) -> Optional[Dict]:
+        """Resultado guardado (com 'log') ou None; um acerto renova a entrada no LRU"""
+        arquivo = self._arquivo(chave)
+        try:
+            with gzip.open(arquivo, 'rt', encoding='utf-8') as entrada:
+                dados = json.load(entrada)
+            os.utime(arquivo)
+        except (OSError, ValueError):
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        return dados
+
+    def guardar(self, chave: str, resultado: Dict, log: List[List[str]]) -> None:
+        """Grava o resultado e o log da missão e despeja entradas antigas se preciso"""
+        arquivo = self._arquivo(chave)
+        os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+        anterior = os.path.getsize(arquivo) if os.path.exists(arquivo) else 0
+
+        temporario = f"{arquivo}.tmp"
+        with gzip.open(temporario, 'wt', encoding='utf-8') as saida:
+            json.dump(dict(resultado, log=log), saida, separators=(',', ':'))
+        os.replace(temporario, arquivo)
+
+        self._tamanho = self.tamanho - anterior + os.path.getsize(arquivo)
+        if self._tamanho > self.limite_bytes:
+            self._despejar()
+
+    def _despejar(self) -> None:
+        """Remove as entradas usadas há mais tempo até caber no limite"""
+        for _, tamanho, caminho in sorted(self._entradas()):
+            if self._tamanho <= self.limite_bytes:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            self._tamanho -= tamanho
+
+    def limpar(self) -> None:
+        """Remove todas as entradas"""
+        for _, _, caminho in self._entradas():
+            os.remove(caminho)
+        self._tamanho = 0
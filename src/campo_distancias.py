@@ -0,0 +1,166 @@
+"""
+Campo de distâncias até as entradas mantido durante a exploração
+Cada célula livre conhecida guarda o número de avanços até a origem mais próxima; a
+descoberta de novas células só diminui distâncias, propagadas apenas onde mudam.
+Também preenche becos sem saída do mapa conhecido (núcleo usado no retorno)
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .estruturas import Posicao, Direcao
+
+
+def nucleo_sem_becos(livres: Iterable[Posicao], preservar: Iterable[Posicao]) -> Set[Posicao]:
+    """Preenche iterativamente as células com no máximo uma vizinha livre (ramos sem saída).
+
+    Sobram os ciclos e os corredores entre as células preservadas; um caminho mínimo
+    entre duas células preservadas nunca passa por uma célula preenchida.
+    """
+    nucleo = set(livres)
+    preservadas = set(preservar)
+
+    def preencher(posicao: Posicao) -> bool:
+        if posicao not in nucleo or posicao in preservadas:
+            return False
+        return sum(1 for direcao in Direcao if posicao + direcao.get_delta() in nucleo) <= 1
+
+    fila = deque(posicao for posicao in nucleo if preencher(posicao))
+    while fila:
+        posicao = fila.popleft()
+        if not preencher(posicao):
+            continue  # Já preenchida por outro ramo
+        nucleo.discard(posicao)
+        fila.extend(vizinha for vizinha in (posicao + direcao.get_delta() for direcao in Direcao)
+                    if preencher(vizinha))
+    return nucleo
+
+
+class CampoDistancias:
+    """Distância em avanços de cada célula livre conhecida até a origem mais próxima"""
+
+    def __init__(self, *origens: Posicao):
+        """Campo vazio; cada origem passa a valer 0 quando for marcada como livre"""
+        self.origens: Set[Posicao] = set(origens)
+        self.livres: Set[Posicao] = set()
+        self.distancias: Dict[Posicao, int] = {}
+        self.relaxamentos = 0
+
+    def definir_livre(self, posicao: Posicao, livre: bool) -> None:
+        """Inclui (ou retira) uma célula do campo, ajustando só as distâncias afetadas"""
+        if livre == (posicao in self.livres):
+            return
+
+        if not livre:
+            # Remoções não ocorrem com sensores confiáveis; recalcula por segurança
+            self.livres.discard(posicao)
+            self.reconstruir(self.livres)
+            return
+
+        self.livres.add(posicao)
+        if posicao in self.origens:
+            self.distancias[posicao] = 0
+        else:
+            vizinhas = [self.distancias[v] for v in self._vizinhas(posicao) if v in self.distancias]
+            if not vizinhas:
+                return  # Ainda desconectada das origens
+            self.distancias[posicao] = min(vizinhas) + 1
+        self._propagar(posicao)
+
+    def _vizinhas(self, posicao: Posicao) -> List[Posicao]:
+        return [posicao + direcao.get_delta() for direcao in Direcao]
+
+    def _propagar(self, *inicios: Posicao) -> None:
+        """Relaxa vizinhas em largura a partir das células que mudaram (pesos unitários)"""
+        fila = deque(inicios)
+        while fila:
+            posicao = fila.popleft()
+            distancia = self.distancias[posicao] + 1
+            for vizinha in self._vizinhas(posicao):
+                if vizinha in self.livres and self.distancias.get(vizinha, distancia + 1) > distancia:
+                    self.distancias[vizinha] = distancia
+                    self.relaxamentos += 1
+                    fila.append(vizinha)
+
+    def reconstruir(self, livres: Iterable[Posicao]) -> None:
+        """Recalcula o campo inteiro a partir de um conjunto de células livres"""
+        self.livres = set(livres)
+        self.distancias = {}
+        origens = self.origens & self.livres
+        for origem in origens:
+            self.distancias[origem] = 0
+        self._propagar(*origens)
+
+    def distancia(self, posicao: Posicao) -> Optional[int]:
+        """Avanços até a origem mais próxima (None se a célula não está conectada)"""
+        return self.distancias.get(posicao)
+
+    def caminho_ate_origem(self, posicao: Posicao, permitidas: Optional[Set[Posicao]] = None,
+                           ordem: Optional[Sequence[Direcao]] = None) -> Optional[List[Posicao]]:
+        """Desce o gradiente até a origem mais próxima, preferindo manter a direção (menos giros);
+        permitidas restringe as células consideradas (ex.: núcleo sem becos) e
+        ordem desempata as direções (padrão: a ordem de Direcao)"""
+        if posicao not in self.distancias:
+            return None
+
+        caminho: List[Posicao] = []
+        atual = posicao
+        direcao_anterior: Optional[Direcao] = None
+        while atual not in self.origens:
+            alvo = self.distancias[atual] - 1
+            opcoes = [direcao for direcao in (ordem or Direcao)
+                      if self.distancias.get(atual + direcao.get_delta()) == alvo and
+                      (permitidas is None or atual + direcao.get_delta() in permitidas)]
+            if not opcoes:
+                return None  # Origem fora das células permitidas
+            direcao = direcao_anterior if direcao_anterior in opcoes else opcoes[0]
+            atual = atual + direcao.get_delta()
+            caminho.append(atual)
+            direcao_anterior = direcao
+        return caminho
+
+    def caminho_menos_comandos(self, posicao: Posicao, direcao: Direcao,
+                               permitidas: Optional[Set[Posicao]] = None) -> Optional[List[Posicao]]:
+        """Caminho até a origem que custa menos comandos (avanços e giros, só à direita),
+        saindo da posição com a direção dada; permitidas restringe as células consideradas.
+
+        Busca A* nos estados (célula, direção), guiada pela distância do campo (o número de
+        avanços até a origem mais próxima nunca supera o de comandos). Movimentos relativos
+        ao robô e desempate por ordem de inserção: o resultado não muda se o mapa for girado.
+        """
+        if posicao not in self.distancias:
+            return None
+
+        inicio = (posicao, direcao)
+        custos: Dict[Tuple[Posicao, Direcao], int] = {inicio: 0}
+        anteriores: Dict[Tuple[Posicao, Direcao], Tuple[Posicao, Direcao]] = {}
+        fila = [(self.distancias[posicao], 0, 0, inicio)]
+        inseridos = 1
+        while fila:
+            _, custo, _, estado = heapq.heappop(fila)
+            if custo > custos[estado]:
+                continue  # Entrada desatualizada
+            atual, sentido = estado
+            if atual in self.origens:
+                caminho: List[Posicao] = []
+                while estado != inicio:
+                    if not caminho or caminho[-1] != estado[0]:
+                        caminho.append(estado[0])
+                    estado = anteriores[estado]
+                caminho.reverse()
+                return caminho if caminho and caminho[0] != posicao else caminho[1:]
+
+            frente = atual + sentido.get_delta()
+            sucessores = [(sentido.girar_direita(), atual)]
+            if frente in self.distancias and (permitidas is None or frente in permitidas):
+                sucessores.insert(0, (sentido, frente))
+            for novo_sentido, nova_posicao in sucessores:
+                novo = (nova_posicao, novo_sentido)
+                if custos.get(novo, custo + 2) > custo + 1:
+                    custos[novo] = custo + 1
+                    anteriores[novo] = estado
+                    heapq.heappush(fila, (custo + 1 + self.distancias[nova_posicao], custo + 1,
+                                          inseridos, novo))
+                    inseridos += 1
+        return None
@@ -0,0 +1,262 @@
+"""
+Checkpoints periódicos de missões longas
+Salva o estado completo da missão em um arquivo compacto (JSON + gzip) e permite retomá-la;
+o log CSV vai sendo acrescentado a um arquivo ao lado e o checkpoint guarda só a posição nele
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from .estruturas import Posicao, Direcao, TipoSensor, RoboException
+from .labirinto import Labirinto
+
+if TYPE_CHECKING:
+    from .algoritmo_busca import AlgoritmoBusca
+
+
+VERSAO_CHECKPOINT = 7
+
+_SENSORES = list(TipoSensor)
+_CODIGO_SENSOR = {sensor: i for i, sensor in enumerate(_SENSORES)}
+_DIRECOES = list(Direcao)
+
+
+def hash_labirinto(labirinto: Labirinto) -> str:
+    """Identifica o conteúdo do mapa (evita retomar um checkpoint no mapa errado)"""
+    return hashlib.sha256(str(labirinto).encode('utf-8')).hexdigest()
+
+
+def _achatar_posicoes(posicoes) -> List[int]:
+    """Converte posições em uma lista plana [x0, y0, x1, y1, ...]"""
+    plana = []
+    for posicao in posicoes:
+        plana.extend((posicao.x, posicao.y))
+    return plana
+
+
+def _posicoes(plana: List[int]) -> List[Posicao]:
+    """Inverso de _achatar_posicoes"""
+    return [Posicao(plana[i], plana[i + 1]) for i in range(0, len(plana), 2)]
+
+
+def capturar_estado(algoritmo: 'AlgoritmoBusca') -> Dict:
+    """Captura o estado completo da missão em estruturas serializáveis"""
+    robo = algoritmo.robo
+
+    mapa = []
+    for posicao, leitura in algoritmo.mapa_conhecido.items():
+        mapa.extend((posicao.x, posicao.y, _CODIGO_SENSOR[leitura]))
+
+    return {
+        'versao': VERSAO_CHECKPOINT,
+        'mapa_hash': hash_labirinto(robo.labirinto),
+        'robo': {
+            'x': robo.posicao.x,
+            'y': robo.posicao.y,
+            'direcao': robo.direcao.value,
+            'tem_humano': robo.tem_humano,
+            'comandos_executados': robo.comandos_executados,
+            'leituras_sensores': robo.leituras_sensores,
+        },
+        'labirinto': {'humanos': robo.labirinto.capturar_humanos()},
+        'algoritmo': {
+            'mapa_conhecido': mapa,
+            'visitadas': _achatar_posicoes(algoritmo.visitadas),
+            'trajetoria': algoritmo.trajetoria.capturar(),
+            'humano_encontrado': algoritmo.humano_encontrado,
+            'humano_coletado': algoritmo.humano_coletado,
+            'missao_concluida': algoritmo.missao_concluida,
+            'fase': algoritmo.fase,
+            'iteracao': algoritmo.iteracao,
+            'caminho_volta': (None if algoritmo.caminho_volta is None
+                              else _achatar_posicoes(algoritmo.caminho_volta)),
+            'indice_volta': algoritmo.indice_volta,
+            'caminho_exploracao': _achatar_posicoes(algoritmo.caminho_exploracao),
+            'resgatados': algoritmo.resgatados,
+            'alvo_humano': _achatar_posicoes([algoritmo.alvo_humano] if algoritmo.alvo_humano else []),
+            'posicao_coletada': _achatar_posicoes([algoritmo.posicao_coletada]
+                                                  if algoritmo.posicao_coletada else []),
+            # Contadores de trabalho dos planejadores (recriados do zero na retomada)
+            'expansoes_grafo': algoritmo.grafo.expansoes,
+            'relaxamentos_distancias': algoritmo.distancias.relaxamentos,
+        },
+        'ruido': None if algoritmo.ruido is None else {
+            'modelo': algoritmo.ruido.capturar(),
+            'evidencias': algoritmo.evidencias.capturar(),
+            'releituras': algoritmo.releituras,
+        },
+        'log_entradas': len(robo.logger.entradas) if robo.logger is not None else 0,
+    }
+
+
+def restaurar_estado(algoritmo: 'AlgoritmoBusca', estado: Dict) -> None:
+    """Restaura no algoritmo (e em seu robô, labirinto e logger) um estado capturado
+    (o logger já deve conter o log até a posição do checkpoint; o que passar dela é descartado)"""
+    robo = algoritmo.robo
+
+    if estado.get('versao') != VERSAO_CHECKPOINT:
+        raise RoboException(f"Versão de checkpoint não suportada: {estado.get('versao')}")
+    if estado['mapa_hash'] != hash_labirinto(robo.labirinto):
+        raise RoboException("Checkpoint pertence a outro mapa")
+    if (estado['ruido'] is None) != (algoritmo.ruido is None):
+        raise RoboException("Checkpoint salvo " + ("sem" if estado['ruido'] is None else "com") +
+                            " ruído nos sensores: retome com as mesmas opções de ruído")
+
+    dados_robo = estado['robo']
+    robo.posicao = Posicao(dados_robo['x'], dados_robo['y'])
+    robo.direcao = _DIRECOES[dados_robo['direcao']]
+    robo.tem_humano = dados_robo['tem_humano']
+    robo.comandos_executados = dados_robo['comandos_executados']
+    robo.leituras_sensores = dados_robo['leituras_sensores']
+    robo.labirinto.restaurar_humanos(estado['labirinto']['humanos'])
+
+    dados = estado['algoritmo']
+    mapa = dados['mapa_conhecido']
+    algoritmo.mapa_conhecido = {
+        Posicao(mapa[i], mapa[i + 1]): _SENSORES[mapa[i + 2]] for i in range(0, len(mapa), 3)
+    }
+    algoritmo.visitadas = set(_posicoes(dados['visitadas']))
+    algoritmo.trajetoria.restaurar(dados['trajetoria'])
+    algoritmo.humano_encontrado = dados['humano_encontrado']
+    algoritmo.humano_coletado = dados['humano_coletado']
+    algoritmo.missao_concluida = dados['missao_concluida']
+    algoritmo.fase = dados['fase']
+    algoritmo.iteracao = dados['iteracao']
+    algoritmo.caminho_volta = (None if dados['caminho_volta'] is None
+                               else _posicoes(dados['caminho_volta']))
+    algoritmo.indice_volta = dados['indice_volta']
+    algoritmo.caminho_exploracao = _posicoes(dados['caminho_exploracao'])
+    algoritmo.resgatados = dados['resgatados']
+    algoritmo.alvo_humano = next(iter(_posicoes(dados['alvo_humano'])), None)
+    algoritmo.posicao_coletada = next(iter(_posicoes(dados['posicao_coletada'])), None)
+    if estado['ruido'] is not None:
+        # Gerador na mesma posição: as leituras seguintes saem iguais às da missão sem interrupção
+        algoritmo.ruido.restaurar(estado['ruido']['modelo'])
+        algoritmo.evidencias.restaurar(estado['ruido']['evidencias'])
+        algoritmo.releituras = estado['ruido']['releituras']
+    algoritmo.reconstruir_planejadores()
+    # Métricas da missão retomada contam também o trabalho anterior ao checkpoint
+    algoritmo.grafo.expansoes = dados['expansoes_grafo']
+    algoritmo.distancias.relaxamentos = dados['relaxamentos_distancias']
+
+    if robo.logger is not None:
+        if len(robo.logger.entradas) < estado['log_entradas']:
+            raise RoboException(f"Log com {len(robo.logger.entradas)} entradas; o checkpoint "
+                                f"precisa de {estado['log_entradas']}")
+        del robo.logger.entradas[estado['log_entradas']:]
+
+
+def salvar_checkpoint(arquivo: str, estado: Dict) -> None:
+    """Grava o estado de forma atômica (arquivo temporário + rename)"""
+    diretorio = os.path.dirname(arquivo)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+
+    temporario = f"{arquivo}.tmp"
+    with gzip.open(temporario, 'wt', encoding='utf-8') as saida:
+        json.dump(estado, saida, separators=(',', ':'))
+    os.replace(temporario, arquivo)
+
+
+def carregar_checkpoint(arquivo: str) -> Dict:
+    """Lê um checkpoint salvo por salvar_checkpoint"""
+    try:
+        with gzip.open(arquivo, 'rt', encoding='utf-8') as entrada:
+            return json.load(entrada)
+    except FileNotFoundError:
+        raise RoboException(f"Checkpoint não encontrado: {arquivo}")
+    except (OSError, ValueError) as e:
+        raise RoboException(f"Checkpoint inválido: {e}")
+
+
+class GerenciadorCheckpoint:
+    """Decide quando salvar: a cada N comandos ou T segundos (o que ocorrer primeiro)"""
+
+    def __init__(self, arquivo: str, a_cada_comandos: Optional[int] = 1000,
+                 a_cada_segundos: Optional[float] = 30.0):
+        """Configura o arquivo e os intervalos (None desativa o critério)"""
+        self.arquivo = arquivo
+        self.arquivo_log = f"{arquivo}.csv"
+        self.a_cada_comandos = a_cada_comandos
+        self.a_cada_segundos = a_cada_segundos
+        self.salvamentos = 0
+        self._ultimo_comando = 0
+        self._ultimo_instante = time.monotonic()
+        # Entradas do log e bytes já gravados no arquivo de log do checkpoint
+        self._log_gravadas = 0
+        self._log_bytes = 0
+
+    def talvez_salvar(self, algoritmo: 'AlgoritmoBusca') -> bool:
+        """Salva se algum intervalo foi atingido; retorna True se salvou"""
+        comandos = algoritmo.robo.comandos_executados
+        por_comandos = (self.a_cada_comandos is not None and
+                        comandos - self._ultimo_comando >= self.a_cada_comandos)
+        por_tempo = (self.a_cada_segundos is not None and
+                     time.monotonic() - self._ultimo_instante >= self.a_cada_segundos)
+
+        if not (por_comandos or por_tempo):
+            return False
+
+        self.salvar(algoritmo)
+        return True
+
+    def salvar(self, algoritmo: 'AlgoritmoBusca') -> None:
+        """Salva imediatamente o estado da missão"""
+        estado = capturar_estado(algoritmo)
+        if algoritmo.robo.logger is not None:
+            self._gravar_log(algoritmo.robo.logger.entradas)
+        estado['log_bytes'] = self._log_bytes
+        salvar_checkpoint(self.arquivo, estado)
+        self.salvamentos += 1
+        self._ultimo_comando = algoritmo.robo.comandos_executados
+        self._ultimo_instante = time.monotonic()
+
+    def retomar(self, algoritmo: 'AlgoritmoBusca') -> None:
+        """Carrega o checkpoint no algoritmo recém-criado"""
+        estado = carregar_checkpoint(self.arquivo)
+        logger = algoritmo.robo.logger
+        if logger is not None:
+            logger.entradas = self._ler_log(estado.get('log_bytes', 0))
+        restaurar_estado(algoritmo, estado)
+        # O que passou da posição salva é sobrescrito no próximo checkpoint
+        self._log_gravadas = estado['log_entradas']
+        self._log_bytes = estado['log_bytes']
+        self._ultimo_comando = algoritmo.robo.comandos_executados
+        self._ultimo_instante = time.monotonic()
+
+    def _gravar_log(self, entradas: List[List[str]]) -> None:
+        """Acrescenta ao log do checkpoint só as entradas registradas desde o último salvamento"""
+        os.makedirs(os.path.dirname(self.arquivo_log) or '.', exist_ok=True)
+        modo = 'r+' if os.path.exists(self.arquivo_log) else 'w'
+        with open(self.arquivo_log, modo, newline='', encoding='utf-8') as arquivo:
+            # Descarta o que uma execução interrompida gravou depois do último checkpoint
+            arquivo.seek(self._log_bytes)
+            arquivo.truncate()
+            csv.writer(arquivo).writerows(entradas[self._log_gravadas:])
+            self._log_bytes = arquivo.tell()
+        self._log_gravadas = len(entradas)
+
+    def _ler_log(self, tamanho: int) -> List[List[str]]:
+        """Lê o log do checkpoint até a posição salva (o restante é ignorado)"""
+        if tamanho == 0:
+            return []
+        try:
+            with open(self.arquivo_log, 'rb') as arquivo:
+                dados = arquivo.read(tamanho)
+        except FileNotFoundError:
+            raise RoboException(f"Log do checkpoint não encontrado: {self.arquivo_log}")
+        if len(dados) < tamanho:
+            raise RoboException(f"Log do checkpoint truncado: {self.arquivo_log}")
+        return list(csv.reader(io.StringIO(dados.decode('utf-8'), newline='')))
+
+    def remover(self) -> None:
+        """Remove o checkpoint e seu log (missão terminou)"""
+        for arquivo in (self.arquivo, self.arquivo_log):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
@@ -0,0 +1,214 @@
+"""
+Corpus de mapas: muitos labirintos em um único arquivo
+Formato: cabeçalho, conteúdo das entradas (cada uma opcionalmente comprimida),
+índice de deslocamentos e rodapé apontando para o índice
+"""
+
+import argparse
+import gzip
+import os
+import struct
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+from .estruturas import RoboException
+from .labirinto import Labirinto, EXTENSOES_MAPA, abrir_mapa, nome_base_mapa
+
+
+MAGICO = b"RSCORPUS"
+VERSAO_CORPUS = 1
+EXTENSAO_CORPUS = ".corpus"
+
+# Códigos de compressão gravados no índice
+COMPRESSOES = {'nenhuma': 0, 'gzip': 1, 'lzma': 2}
+_NOMES_COMPRESSAO = {codigo: nome for nome, codigo in COMPRESSOES.items()}
+
+_CABECALHO = struct.Struct('<8sI')       # mágico, versão
+_ENTRADA_INDICE = struct.Struct('<QIBH')  # deslocamento, tamanho, compressão, bytes do nome
+_RODAPE = struct.Struct('<QI8s')          # deslocamento do índice, entradas, mágico
+
+# (nome, deslocamento, tamanho, compressão)
+EntradaCorpus = Tuple[str, int, int, int]
+
+
+def _comprimir(dados: bytes, compressao: int) -> bytes:
+    if compressao == COMPRESSOES['gzip']:
+        return gzip.compress(dados, mtime=0)
+    if compressao == COMPRESSOES['lzma']:
+        import lzma  # Importação lenta: só corpora em lzma pagam por ela
+        return lzma.compress(dados)
+    return dados
+
+
+def _descomprimir(dados: bytes, compressao: int) -> bytes:
+    if compressao == COMPRESSOES['gzip']:
+        return gzip.decompress(dados)
+    if compressao == COMPRESSOES['lzma']:
+        import lzma
+        return lzma.decompress(dados)
+    if compressao == COMPRESSOES['nenhuma']:
+        return dados
+    raise RoboException(f"Compressão desconhecida no corpus: {compressao}")
+
+
+def e_corpus(caminho: str) -> bool:
+    """Verifica pelo cabeçalho se o arquivo é um corpus de mapas"""
+    try:
+        with open(caminho, 'rb') as arquivo:
+            return arquivo.read(len(MAGICO)) == MAGICO
+    except OSError:
+        return False
+
+
+def faixa_shard(total: int, indice: int, shards: int) -> Tuple[int, int]:
+    """Faixa [inicio, fim) de entradas do shard `indice` entre `shards` partes contíguas"""
+    if shards < 1 or not 0 <= indice < shards:
+        raise RoboException(f"Shard inválido: {indice}/{shards}")
+    return total * indice // shards, total * (indice + 1) // shards
+
+
+class EscritorCorpus:
+    """Grava mapas em sequência e fecha o corpus escrevendo o índice"""
+
+    def __init__(self, caminho: str, compressao: str = 'gzip'):
+        """Cria (ou sobrescreve) o corpus com a compressão padrão das entradas"""
+        if compressao not in COMPRESSOES:
+            raise RoboException(f"Compressão desconhecida: {compressao}")
+        self.caminho = caminho
+        self.compressao = compressao
+        self.entradas: List[EntradaCorpus] = []
+        self._arquivo: Optional[BinaryIO] = open(caminho, 'wb')
+        self._arquivo.write(_CABECALHO.pack(MAGICO, VERSAO_CORPUS))
+
+    def adicionar(self, nome: str, texto: str, compressao: Optional[str] = None) -> None:
+        """Acrescenta um mapa (o nome identifica os logs da missão)"""
+        codigo = COMPRESSOES[compressao or self.compressao]
+        dados = _comprimir(texto.encode('utf-8'), codigo)
+        self.entradas.append((nome, self._arquivo.tell(), len(dados), codigo))
+        self._arquivo.write(dados)
+
+    def fechar(self) -> None:
+        """Escreve o índice e o rodapé"""
+        if self._arquivo is None:
+            return
+        inicio_indice = self._arquivo.tell()
+        for nome, deslocamento, tamanho, codigo in self.entradas:
+            nome_bytes = nome.encode('utf-8')
+            self._arquivo.write(_ENTRADA_INDICE.pack(deslocamento, tamanho, codigo, len(nome_bytes)))
+            self._arquivo.write(nome_bytes)
+        self._arquivo.write(_RODAPE.pack(inicio_indice, len(self.entradas), MAGICO))
+        self._arquivo.close()
+        self._arquivo = None
+
+    def __enter__(self) -> 'EscritorCorpus':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
+
+
+class LeitorCorpus:
+    """Acesso aleatório às entradas de um corpus; só o índice fica em memória"""
+
+    def __init__(self, caminho: str):
+        """Abre o corpus e lê o índice a partir do rodapé"""
+        self.caminho = caminho
+        try:
+            self._arquivo: Optional[BinaryIO] = open(caminho, 'rb')
+        except FileNotFoundError:
+            raise RoboException(f"Arquivo não encontrado: {caminho}")
+
+        magico, versao = _CABECALHO.unpack(self._arquivo.read(_CABECALHO.size))
+        if magico != MAGICO:
+            raise RoboException(f"Arquivo não é um corpus de mapas: {caminho}")
+        if versao != VERSAO_CORPUS:
+            raise RoboException(f"Versão de corpus incompatível: {versao}")
+
+        self._arquivo.seek(-_RODAPE.size, os.SEEK_END)
+        inicio_indice, total, magico = _RODAPE.unpack(self._arquivo.read(_RODAPE.size))
+        if magico != MAGICO:
+            raise RoboException(f"Corpus incompleto (sem índice): {caminho}")
+
+        self._arquivo.seek(inicio_indice)
+        self.entradas: List[EntradaCorpus] = []
+        for _ in range(total):
+            deslocamento, tamanho, codigo, tamanho_nome = _ENTRADA_INDICE.unpack(
+                self._arquivo.read(_ENTRADA_INDICE.size))
+            nome = self._arquivo.read(tamanho_nome).decode('utf-8')
+            self.entradas.append((nome, deslocamento, tamanho, codigo))
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def nome(self, indice: int) -> str:
+        """Nome da entrada"""
+        return self.entradas[indice][0]
+
+    def ler_texto(self, indice: int) -> str:
+        """Texto do mapa da entrada (lê e descomprime só esse trecho do arquivo)"""
+        _, deslocamento, tamanho, codigo = self.entradas[indice]
+        self._arquivo.seek(deslocamento)
+        return _descomprimir(self._arquivo.read(tamanho), codigo).decode('utf-8')
+
+    def ler(self, indice: int) -> Labirinto:
+        """Labirinto da entrada"""
+        return Labirinto.de_texto(self.ler_texto(indice), self.nome(indice))
+
+    def iterar(self, inicio: int = 0, fim: Optional[int] = None) -> Iterator[Tuple[int, Labirinto]]:
+        """Produz (índice, labirinto) sob demanda para a faixa [inicio, fim)"""
+        fim = len(self) if fim is None else min(fim, len(self))
+        for indice in range(inicio, fim):
+            yield indice, self.ler(indice)
+
+    def fechar(self) -> None:
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self) -> 'LeitorCorpus':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
+
+
+def criar_corpus(caminho: str, arquivos_mapa: Iterable[str], compressao: str = 'gzip') -> int:
+    """Empacota arquivos de mapa em um corpus e retorna quantos foram incluídos"""
+    with EscritorCorpus(caminho, compressao) as escritor:
+        for arquivo_mapa in arquivos_mapa:
+            with abrir_mapa(arquivo_mapa) as arquivo:
+                escritor.adicionar(f"{nome_base_mapa(arquivo_mapa)}.txt", arquivo.read())
+        return len(escritor.entradas)
+
+
+def main():
+    """Cria ou lista corpora de mapas"""
+    parser = argparse.ArgumentParser(description="Corpus de mapas em um único arquivo")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    criar = subcomandos.add_parser("criar", help="empacota mapas (arquivos ou diretórios)")
+    criar.add_argument("saida")
+    criar.add_argument("mapas", nargs="+")
+    criar.add_argument("--compressao", choices=sorted(COMPRESSOES), default="gzip")
+
+    listar = subcomandos.add_parser("listar", help="mostra as entradas do corpus")
+    listar.add_argument("corpus")
+    args = parser.parse_args()
+
+    if args.comando == "criar":
+        arquivos = []
+        for caminho in args.mapas:
+            if os.path.isdir(caminho):
+                arquivos.extend(os.path.join(caminho, nome) for nome in sorted(os.listdir(caminho))
+                                if nome.endswith(EXTENSOES_MAPA))
+            else:
+                arquivos.append(caminho)
+        total = criar_corpus(args.saida, arquivos, args.compressao)
+        print(f"📦 {total} mapas gravados em {args.saida}")
+    else:
+        with LeitorCorpus(args.corpus) as leitor:
+            for indice, (nome, _, tamanho, codigo) in enumerate(leitor.entradas):
+                print(f"{indice:6d}  {nome}  {tamanho} bytes ({_NOMES_COMPRESSAO.get(codigo, '?')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Escalonador assíncrono de missões com latência simulada dos atuadores
+Milhares de missões intercaladas em um único event loop: após cada comando a missão
+aguarda o tempo de atuação do robô, e o controlador atende as demais nesse intervalo.
+Mede o tempo simulado das missões e a utilização de CPU do controlador (planejamento de frota)
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Sequence, TYPE_CHECKING
+
+from .algoritmo_busca import AlgoritmoBusca
+from .estruturas import ComandoRobo, RoboException
+from .labirinto import Labirinto, EXTENSOES_MAPA, abrir_mapa
+from .robo import Robo
+
+if TYPE_CHECKING:
+    from .telemetria import CanalTelemetria, EmissorTelemetria
+
+
+# Segundos de atuação por comando (avanço por célula)
+LATENCIAS_PADRAO = {
+    ComandoRobo.AVANCAR: 0.5,
+    ComandoRobo.GIRAR: 0.3,
+    ComandoRobo.PEGAR: 2.0,
+    ComandoRobo.EJETAR: 2.0,
+}
+
+
+def _percentil(valores: Sequence[float], fracao: float) -> float:
+    """Percentil por posição na lista ordenada (0.0 se vazia)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+
+async def executar_missao_assincrona(labirinto: Labirinto,
+                                     latencias: Optional[Dict[ComandoRobo, float]] = None,
+                                     escala_tempo: float = 1.0,
+                                     telemetria: Optional['EmissorTelemetria'] = None) -> Dict:
+    """Executa a missão aguardando a latência de cada comando.
+
+    escala_tempo converte segundos simulados em segundos reais (0 só cede a vez ao loop).
+    """
+    latencias = latencias or LATENCIAS_PADRAO
+    loop = asyncio.get_running_loop()
+    labirinto.reiniciar()
+    algoritmo = AlgoritmoBusca(Robo(labirinto, telemetria=telemetria), verboso=False)
+    passos = algoritmo.passos_missao()
+
+    tempo_simulado = 0.0
+    cpu = 0.0
+    atrasos: List[float] = []
+    while True:
+        inicio = time.process_time()
+        try:
+            comando, quantidade = next(passos)
+        except StopIteration as fim:
+            sucesso = fim.value
+            cpu += time.process_time() - inicio
+            break
+        cpu += time.process_time() - inicio
+
+        espera = latencias[comando] * quantidade
+        tempo_simulado += espera
+        despertar = loop.time() + espera * escala_tempo
+        await asyncio.sleep(espera * escala_tempo)
+        # Atraso além do previsto: o controlador estava ocupado com outras missões
+        atrasos.append(max(0.0, loop.time() - despertar))
+
+    return {
+        'sucesso': sucesso,
+        'erro': algoritmo.erro,
+        'comandos': algoritmo.robo.comandos_executados,
+        'tempo_simulado_s': tempo_simulado,
+        'cpu_s': cpu,
+        'atrasos_s': atrasos,
+    }
+
+
+async def executar_frota(textos_mapas: Sequence[str], missoes: int,
+                         latencias: Optional[Dict[ComandoRobo, float]] = None,
+                         escala_tempo: float = 1.0,
+                         telemetria: Optional['CanalTelemetria'] = None) -> Dict:
+    """Executa `missoes` missões simultâneas (mapas usados em rodízio) e resume a capacidade
+    (telemetria: canal em que todas publicam, identificadas pelo índice da missão)"""
+    if not textos_mapas:
+        raise RoboException("Nenhum mapa informado para o escalonador")
+    if missoes < 1:
+        raise RoboException(f"Número de missões inválido: {missoes}")
+
+    # Um labirinto por missão: o estado (humano coletado) é de cada robô
+    labirintos = [Labirinto.de_texto(textos_mapas[i % len(textos_mapas)], f"missao_{i}.txt")
+                  for i in range(missoes)]
+
+    cpu_inicio = time.process_time()
+    parede_inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(
+        executar_missao_assincrona(labirinto, latencias, escala_tempo,
+                                   telemetria.emissor(i) if telemetria is not None else None)
+        for i, labirinto in enumerate(labirintos)))
+    parede = time.perf_counter() - parede_inicio
+    cpu = time.process_time() - cpu_inicio
+
+    tempos = [r['tempo_simulado_s'] for r in resultados]
+    atrasos = [atraso for r in resultados for atraso in r['atrasos_s']]
+    comandos = sum(r['comandos'] for r in resultados)
+    return {
+        'missoes': missoes,
+        'sucessos': sum(1 for r in resultados if r['sucesso']),
+        'comandos': comandos,
+        'tempo_parede_s': parede,
+        'cpu_s': cpu,
+        'utilizacao_cpu': cpu / parede if parede > 0 else 0.0,
+        'cpu_por_comando_s': sum(r['cpu_s'] for r in resultados) / comandos if comandos else 0.0,
+        'tempo_simulado_medio_s': sum(tempos) / len(tempos),
+        'tempo_simulado_max_s': max(tempos),
+        'atraso_medio_s': sum(atrasos) / len(atrasos) if atrasos else 0.0,
+        'atraso_p99_s': _percentil(atrasos, 0.99),
+    }
+
+
+def _ler_mapas(caminho: str) -> List[str]:
+    """Textos dos mapas de um arquivo ou de um diretório"""
+    if os.path.isdir(caminho):
+        arquivos = [os.path.join(caminho, nome) for nome in sorted(os.listdir(caminho))
+                    if nome.endswith(EXTENSOES_MAPA)]
+    else:
+        arquivos = [caminho]
+    textos = []
+    for arquivo in arquivos:
+        with abrir_mapa(arquivo) as fluxo:
+            textos.append(fluxo.read())
+    return textos
+
+
+def main():
+    """Mede quantas missões simultâneas um controlador consegue conduzir"""
+    parser = argparse.ArgumentParser(description="Escalonador assíncrono com latência dos atuadores")
+    parser.add_argument("mapas", help="arquivo de mapa ou diretório (mapas usados em rodízio)")
+    parser.add_argument("--missoes", type=int, default=1000, help="missões simultâneas (padrão: 1000)")
+    parser.add_argument("--escala-tempo", type=float, default=0.01,
+                        help="segundos reais por segundo simulado (padrão: 0.01)")
+    for comando, nome in ((ComandoRobo.AVANCAR, "avanco"), (ComandoRobo.GIRAR, "giro"),
+                          (ComandoRobo.PEGAR, "pegar"), (ComandoRobo.EJETAR, "ejetar")):
+        parser.add_argument(f"--latencia-{nome}", type=float, default=LATENCIAS_PADRAO[comando],
+                            help=f"segundos por comando {comando.value} (padrão: {LATENCIAS_PADRAO[comando]})")
+    parser.add_argument("--telemetria", default=None, metavar="NOME",
+                        help="publica as operações de todas as missões no canal compartilhado NOME")
+    args = parser.parse_args()
+
+    latencias = {
+        ComandoRobo.AVANCAR: args.latencia_avanco,
+        ComandoRobo.GIRAR: args.latencia_giro,
+        ComandoRobo.PEGAR: args.latencia_pegar,
+        ComandoRobo.EJETAR: args.latencia_ejetar,
+    }
+    canal = None
+    if args.telemetria:
+        from .telemetria import CanalTelemetria
+        try:
+            canal = CanalTelemetria(nome=args.telemetria)
+        except RoboException as e:
+            parser.error(str(e))
+    try:
+        resumo = asyncio.run(executar_frota(_ler_mapas(args.mapas), args.missoes, latencias,
+                                            args.escala_tempo, canal))
+    finally:
+        if canal is not None:
+            canal.fechar()
+
+    print(f"🤖 {resumo['sucessos']}/{resumo['missoes']} missões, {resumo['comandos']} comandos")
+    print(f"⏱️  Tempo simulado por missão: médio {resumo['tempo_simulado_medio_s']:.1f}s, "
+          f"máximo {resumo['tempo_simulado_max_s']:.1f}s")
+    print(f"🖥️  CPU do controlador: {resumo['cpu_s']:.2f}s em {resumo['tempo_parede_s']:.2f}s "
+          f"({resumo['utilizacao_cpu']:.0%}), {resumo['cpu_por_comando_s'] * 1e6:.0f}µs por comando")
+    print(f"📉 Atraso sobre a latência (em tempo real): médio {resumo['atraso_medio_s'] * 1000:.2f}ms, "
+          f"p99 {resumo['atraso_p99_s'] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Teste de estresse com propriedades de segurança
+Gera milhares de labirintos aleatórios, executa missões e sequências de comandos
+aleatórias em um pool de processos, verifica invariantes em cada execução e
+minimiza automaticamente os casos que falham
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .estruturas import (
+    Posicao, Direcao, ComandoRobo, TipoCelula, RoboException,
+    ColisaoException, AtropelamentoException, BecoSemSaidaException,
+    OperacaoInvalidaException
+)
+from .labirinto import Labirinto
+from .robo import Robo
+from .logger import LoggerRobo
+from .algoritmo_busca import AlgoritmoBusca
+from .trajetoria import Trajetoria
+from .replay import ReproducaoMissao
+
+
+# Comandos por célula livre acima dos quais a missão é considerada sem término
+FATOR_LIMITE_COMANDOS = 16
+TAMANHO_MAXIMO_PADRAO = 41
+
+_ALARMES = {classe.__name__ for classe in (ColisaoException, AtropelamentoException,
+                                           BecoSemSaidaException, OperacaoInvalidaException)}
+_ERROS_ROBO = _ALARMES | {RoboException.__name__}
+_DIRETORIO_TEMPORARIO = tempfile.gettempdir()  # O logger exige um diretório; nada é gravado
+
+Falha = Dict
+
+
+# ----------------------------------------------------------------------
+# Geração de casos
+# ----------------------------------------------------------------------
+
+def gerar_labirinto(gerador: random.Random, largura: int, altura: int,
+                    aberturas: float = 0.3) -> str:
+    """Labirinto conexo (árvore de corredores + aberturas extras) com entrada em uma borda sorteada"""
+    largura, altura = max(largura, 5), max(altura, 5)
+    grade = [[TipoCelula.PAREDE.value] * largura for _ in range(altura)]
+    vazio = TipoCelula.VAZIO.value
+
+    # Corredores por busca em profundidade sobre as células de coordenadas ímpares
+    celulas = [(x, y) for y in range(1, altura - 1, 2) for x in range(1, largura - 1, 2)]
+    inicio = gerador.choice(celulas)
+    pilha, vistas = [inicio], {inicio}
+    grade[inicio[1]][inicio[0]] = vazio
+    while pilha:
+        x, y = pilha[-1]
+        vizinhas = [(x + dx, y + dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                    if 0 < x + dx < largura - 1 and 0 < y + dy < altura - 1
+                    and (x + dx, y + dy) not in vistas]
+        if not vizinhas:
+            pilha.pop()
+            continue
+        nx, ny = gerador.choice(vizinhas)
+        vistas.add((nx, ny))
+        grade[ny][nx] = vazio
+        grade[(y + ny) // 2][(x + nx) // 2] = vazio
+        pilha.append((nx, ny))
+
+    # Aberturas extras criam ciclos e salas
+    for _ in range(int(largura * altura * aberturas * 0.2)):
+        grade[gerador.randrange(1, altura - 1)][gerador.randrange(1, largura - 1)] = vazio
+
+    # Humano e entrada só na região conectada aos corredores (aberturas podem ficar isoladas)
+    conectadas, fila = {inicio}, [inicio]
+    while fila:
+        x, y = fila.pop()
+        for vizinha in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if vizinha not in conectadas and grade[vizinha[1]][vizinha[0]] == vazio:
+                conectadas.add(vizinha)
+                fila.append(vizinha)
+    livres = sorted(conectadas, key=lambda celula: (celula[1], celula[0]))
+    hx, hy = gerador.choice(livres)
+    grade[hy][hx] = TipoCelula.HUMANO.value
+
+    # Entrada: célula de borda (fora dos cantos) vizinha de uma célula livre do interior
+    bordas = ([(x, 0, x, 1) for x in range(1, largura - 1)] +
+              [(x, altura - 1, x, altura - 2) for x in range(1, largura - 1)] +
+              [(0, y, 1, y) for y in range(1, altura - 1)] +
+              [(largura - 1, y, largura - 2, y) for y in range(1, altura - 1)])
+    candidatas = [(x, y) for x, y, ix, iy in bordas if (ix, iy) in conectadas]
+    ex, ey = gerador.choice(candidatas)
+    grade[ey][ex] = TipoCelula.ENTRADA.value
+
+    return '\n'.join(''.join(linha) for linha in grade)
+
+
+def gerar_comandos(gerador: random.Random, tamanho: int, base: str = "") -> str:
+    """Sequência aleatória; com base (sequência planejada), aplica poucas mutações a ela"""
+    if not base:
+        return ''.join(gerador.choices("AGPE", weights=(6, 3, 1, 1), k=tamanho))
+    comandos = list(base)
+    for _ in range(gerador.randint(1, 5)):
+        posicao = gerador.randrange(len(comandos) + 1)
+        operacao = gerador.random()
+        if operacao < 0.4 or not comandos:
+            comandos.insert(posicao, gerador.choice("AGPE"))
+        elif operacao < 0.7:
+            del comandos[min(posicao, len(comandos) - 1)]
+        else:
+            comandos[min(posicao, len(comandos) - 1)] = gerador.choice("AGPE")
+    return ''.join(comandos)
+
+
+# ----------------------------------------------------------------------
+# Invariantes
+# ----------------------------------------------------------------------
+
+def _saidas(labirinto: Labirinto, posicao: Posicao) -> int:
+    """Vizinhas da posição que não são parede (no mapa real)"""
+    return sum(labirinto.get_tipo_celula(posicao + direcao.get_delta()) != TipoCelula.PAREDE
+               for direcao in Direcao)
+
+
+def _violacao_de_estado(robo: Robo) -> Optional[Tuple[str, str]]:
+    """Invariantes que valem após qualquer comando (aceito ou recusado com alarme)"""
+    labirinto = robo.labirinto
+    if not labirinto.pode_mover_para(robo.posicao):
+        return 'posicao_invalida', f"Robô em célula bloqueada {robo.posicao}"
+    if robo.tem_humano != labirinto.humano_coletado:
+        return 'carga_inconsistente', "Carga do robô difere do estado do labirinto"
+    if robo.tem_humano and robo.posicao not in labirinto.entradas and _saidas(labirinto, robo.posicao) <= 1:
+        return 'beco_com_humano', f"Robô com humano em beco sem saída {robo.posicao}"
+    return None
+
+
+def verificar_missao(texto: str) -> Tuple[Optional[Falha], str]:
+    """Executa a missão do AlgoritmoBusca e verifica as invariantes.
+
+    Retorna (falha ou None, sequência compacta executada).
+    """
+    labirinto = Labirinto.de_texto(texto, "estresse.txt")
+    logger = LoggerRobo("estresse.txt", _DIRETORIO_TEMPORARIO)
+    robo = Robo(labirinto, logger)
+    algoritmo = AlgoritmoBusca(robo, verboso=False, trajetoria=Trajetoria(1))
+    sucesso = algoritmo.executar_missao()
+    sequencia = logger.get_sequencia_compacta()
+
+    if algoritmo.tipo_erro in _ALARMES:
+        return {'tipo': 'alarme', 'detalhe': f"{algoritmo.tipo_erro}: {algoritmo.erro}"}, sequencia
+    if algoritmo.tipo_erro is not None and algoritmo.tipo_erro not in _ERROS_ROBO:
+        return {'tipo': 'excecao', 'detalhe': f"{algoritmo.tipo_erro}: {algoritmo.erro}"}, sequencia
+
+    livres = sum(linha.count(TipoCelula.VAZIO.value) for linha in texto.split('\n')) + 2
+    limite = FATOR_LIMITE_COMANDOS * livres
+    if robo.comandos_executados > limite:
+        return {'tipo': 'limite_comandos',
+                'detalhe': f"{robo.comandos_executados} comandos (limite {limite})"}, sequencia
+
+    divergencia = ReproducaoMissao(labirinto, logger.entradas).verificar_log()
+    if divergencia is not None:
+        return {'tipo': 'log_divergente', 'detalhe': f"Replay diverge no passo {divergencia}"}, sequencia
+
+    # Reaplica a sequência conferindo o estado após cada comando (retorno sem becos)
+    labirinto.reiniciar()
+    replay = Robo(labirinto)
+    for passo, letra in enumerate(sequencia, 1):
+        replay.executar_comando(ComandoRobo(letra))
+        violacao = _violacao_de_estado(replay)
+        if violacao is not None:
+            return {'tipo': violacao[0], 'detalhe': f"Passo {passo}: {violacao[1]}"}, sequencia
+
+    # Os labirintos gerados são conexos: o humano sempre pode ser resgatado
+    if not sucesso:
+        return {'tipo': 'missao_incompleta', 'detalhe': algoritmo.erro}, sequencia
+    return None, sequencia
+
+
+def verificar_comandos(texto: str, comandos: str) -> Optional[Falha]:
+    """Executa comandos arbitrários direto no Robo; alarmes recusam o comando, mas o
+    estado do robô deve continuar seguro"""
+    labirinto = Labirinto.de_texto(texto, "estresse.txt")
+    robo = Robo(labirinto)
+    for passo, letra in enumerate(comandos, 1):
+        try:
+            robo.executar_comando(ComandoRobo(letra))
+        except RoboException:
+            pass
+        except Exception as e:
+            return {'tipo': 'excecao', 'detalhe': f"Passo {passo}: {type(e).__name__}: {e}"}
+        violacao = _violacao_de_estado(robo)
+        if violacao is not None:
+            return {'tipo': violacao[0], 'detalhe': f"Passo {passo}: {violacao[1]}"}
+    return None
+
+
+def executar_caso(semente: int, tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO) -> Optional[Falha]:
+    """Gera e verifica um caso (missão planejada + comandos aleatórios ou mutados)"""
+    gerador = random.Random(semente)
+    texto = gerar_labirinto(gerador, gerador.randint(5, tamanho_maximo),
+                            gerador.randint(5, tamanho_maximo), gerador.random() * 0.6)
+    try:
+        falha, sequencia = verificar_missao(texto)
+    except Exception as e:
+        falha, sequencia = {'tipo': 'excecao', 'detalhe': f"{type(e).__name__}: {e}"}, ""
+    if falha is not None:
+        falha.update(semente=semente, mapa=texto, comandos=None)
+        return falha
+
+    base = sequencia if gerador.random() < 0.5 else ""
+    comandos = gerar_comandos(gerador, 4 * len(texto), base)
+    falha = verificar_comandos(texto, comandos)
+    if falha is not None:
+        falha.update(semente=semente, mapa=texto, comandos=comandos)
+    return falha
+
+
+# ----------------------------------------------------------------------
+# Minimização
+# ----------------------------------------------------------------------
+
+def _mapa_valido(texto: str) -> bool:
+    try:
+        Labirinto.de_texto(texto)
+    except RoboException:
+        return False
+    return True
+
+
+def minimizar_mapa(texto: str, ainda_falha: Callable[[str], bool]) -> str:
+    """Reduz o mapa mantendo a falha: corta bordas e fecha células livres com parede"""
+    atual = texto
+
+    def tentar(candidato: str) -> bool:
+        nonlocal atual
+        if candidato != atual and _mapa_valido(candidato) and ainda_falha(candidato):
+            atual = candidato
+            return True
+        return False
+
+    mudou = True
+    while mudou:
+        mudou = False
+        # Cortes de linhas e colunas das bordas (a entrada precisa continuar na borda)
+        for corte in range(4):
+            while True:
+                linhas = atual.split('\n')
+                if corte == 0:
+                    candidato = linhas[1:]
+                elif corte == 1:
+                    candidato = linhas[:-1]
+                elif corte == 2:
+                    candidato = [linha[1:] for linha in linhas]
+                else:
+                    candidato = [linha[:-1] for linha in linhas]
+                if not tentar('\n'.join(candidato)):
+                    break
+                mudou = True
+
+        # Células livres viram parede, uma por vez
+        linhas = [list(linha) for linha in atual.split('\n')]
+        for y, linha in enumerate(linhas):
+            for x, celula in enumerate(linha):
+                if celula != TipoCelula.VAZIO.value:
+                    continue
+                linha[x] = TipoCelula.PAREDE.value
+                if tentar('\n'.join(''.join(l) for l in linhas)):
+                    mudou = True
+                else:
+                    linha[x] = celula
+    return atual
+
+
+def minimizar_comandos(comandos: str, ainda_falha: Callable[[str], bool]) -> str:
+    """Remove trechos da sequência (do maior ao menor) enquanto a falha persistir"""
+    tamanho = max(len(comandos) // 2, 1)
+    while tamanho >= 1:
+        inicio = 0
+        while inicio < len(comandos):
+            candidato = comandos[:inicio] + comandos[inicio + tamanho:]
+            if candidato and ainda_falha(candidato):
+                comandos = candidato
+            else:
+                inicio += tamanho
+        tamanho //= 2
+    return comandos
+
+
+def _mesma_falha(falha: Optional[Falha], original: Falha) -> bool:
+    """Mesma categoria (e, para alarmes e exceções, mesma classe)"""
+    if falha is None or falha['tipo'] != original['tipo']:
+        return False
+    if original['tipo'] in ('alarme', 'excecao'):
+        return falha['detalhe'].split(':')[0] == original['detalhe'].split(':')[0]
+    return True
+
+
+def minimizar_falha(falha: Falha) -> Falha:
+    """Caso mínimo que reproduz a mesma falha (mapa e, se houver, comandos)"""
+    minima = dict(falha)
+    comandos = falha.get('comandos')
+    if comandos:
+        # Alterna comandos e mapa: um mapa menor costuma permitir menos comandos
+        while True:
+            anterior = (minima['mapa'], minima['comandos'])
+            minima['comandos'] = minimizar_comandos(
+                minima['comandos'],
+                lambda c: _mesma_falha(verificar_comandos(minima['mapa'], c), falha))
+            minima['mapa'] = minimizar_mapa(
+                minima['mapa'],
+                lambda t: _mesma_falha(verificar_comandos(t, minima['comandos']), falha))
+            if (minima['mapa'], minima['comandos']) == anterior:
+                break
+        minima['detalhe'] = verificar_comandos(minima['mapa'], minima['comandos'])['detalhe']
+    else:
+        minima['mapa'] = minimizar_mapa(
+            falha['mapa'], lambda t: _mesma_falha(verificar_missao(t)[0], falha))
+        minima['detalhe'] = verificar_missao(minima['mapa'])[0]['detalhe']
+    return minima
+
+
+# ----------------------------------------------------------------------
+# Execução em paralelo
+# ----------------------------------------------------------------------
+
+def executar_estresse(casos: int, trabalhadores: Optional[int] = None, semente: int = 0,
+                      tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO,
+                      minimizar: bool = True) -> List[Falha]:
+    """Executa os casos semente..semente+casos-1 em paralelo e devolve as falhas (minimizadas)"""
+    sementes = range(semente, semente + casos)
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    if trabalhadores == 1:
+        falhas = [executar_caso(s, tamanho_maximo) for s in sementes]
+    else:
+        with ProcessPoolExecutor(max_workers=trabalhadores) as pool:
+            falhas = list(pool.map(executar_caso, sementes, [tamanho_maximo] * casos,
+                                   chunksize=max(1, casos // (trabalhadores * 8))))
+    falhas = [falha for falha in falhas if falha is not None]
+    if minimizar:
+        falhas = [minimizar_falha(falha) for falha in falhas]
+    return falhas
+
+
+def main():
+    """Roda o teste de estresse e grava os casos mínimos que falharam"""
+    parser = argparse.ArgumentParser(description="Teste de estresse com invariantes de segurança")
+    parser.add_argument("--casos", type=int, default=1000)
+    parser.add_argument("--trabalhadores", type=int, default=None, help="processos (padrão: CPUs)")
+    parser.add_argument("--semente", type=int, default=0, help="semente do primeiro caso")
+    parser.add_argument("--tamanho-maximo", type=int, default=TAMANHO_MAXIMO_PADRAO,
+                        help="largura/altura máxima dos labirintos")
+    parser.add_argument("--sem-minimizar", action="store_true")
+    parser.add_argument("--saida", default="falhas_estresse", help="diretório dos casos que falharam")
+    args = parser.parse_args()
+
+    print(f"🧪 Executando {args.casos} casos de estresse...")
+    falhas = executar_estresse(args.casos, args.trabalhadores, args.semente,
+                               args.tamanho_maximo, not args.sem_minimizar)
+    if not falhas:
+        print("✅ Nenhuma invariante violada")
+        return
+
+    os.makedirs(args.saida, exist_ok=True)
+    for falha in falhas:
+        base = os.path.join(args.saida, f"caso_{falha['semente']}")
+        with open(f"{base}.txt", 'w', encoding='utf-8') as arquivo:
+            arquivo.write(falha['mapa'])
+        if falha.get('comandos'):
+            with open(f"{base}.cmd", 'w', encoding='utf-8') as arquivo:
+                arquivo.write(falha['comandos'])
+        print(f"❌ Semente {falha['semente']}: {falha['tipo']} - {falha['detalhe']} ({base}.txt)")
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,17 +16,29 @@ class Direcao(Enum):
     
     def girar_direita(self) -> 'Direcao':
         """Gira 90 graus à direita (sentido horário)"""
-        return Direcao((self.value + 1) % 4)
+        return _DIRECOES[(self.value + 1) % 4]
+    
+    def girar_esquerda(self) -> 'Direcao':
+        """Gira 90 graus à esquerda (sentido anti-horário)"""
+        return _DIRECOES[(self.value - 1) % 4]
+    
+    def oposta(self) -> 'Direcao':
+        """Retorna a direção oposta"""
+        return _DIRECOES[(self.value + 2) % 4]
     
     def get_delta(self) -> Tuple[int, int]:
         """Retorna a variação (dx, dy) para movimento nesta direção"""
-        deltas = {
-            Direcao.NORTE: (0, -1),
-            Direcao.LESTE: (1, 0),
-            Direcao.SUL: (0, 1),
-            Direcao.OESTE: (-1, 0)
-        }
-        return deltas[self]
+        return _DELTAS[self]
+
+
+# Tabelas pré-calculadas (evitam recriar dicionários e instanciar o Enum a cada passo)
+_DIRECOES = list(Direcao)
+_DELTAS = {
+    Direcao.NORTE: (0, -1),
+    Direcao.LESTE: (1, 0),
+    Direcao.SUL: (0, 1),
+    Direcao.OESTE: (-1, 0)
+}
 
 
 @dataclass
@@ -79,6 +91,15 @@ class TipoCelula(Enum):
     ENTRADA = "E"
 
 
+class TipoAlarme(Enum):
+    """Códigos de alarme reportados sem exceções (ambiente de controle)"""
+    NENHUM = "NENHUM"
+    COLISAO = "COLISAO"
+    ATROPELAMENTO = "ATROPELAMENTO"
+    BECO_SEM_SAIDA = "BECO_SEM_SAIDA"
+    OPERACAO_INVALIDA = "OPERACAO_INVALIDA"
+
+
 class RoboException(Exception):
     """Exceção base para erros do robô"""
     pass
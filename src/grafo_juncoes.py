@@ -0,0 +1,284 @@
+"""
+Grafo de junções construído incrementalmente a partir do mapa conhecido
+Corredores de largura um são comprimidos em arestas (comprimento + giros);
+nós são junções, becos e células marcadas como obrigatórias (fronteiras, entrada)
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .estruturas import Posicao, Direcao
+
+
+_DELTAS = [direcao.get_delta() for direcao in Direcao]
+
+
+def _vizinhas(posicao: Posicao) -> List[Posicao]:
+    """As quatro células vizinhas, na ordem de Direcao"""
+    return [Posicao(posicao.x + dx, posicao.y + dy) for dx, dy in _DELTAS]
+
+
+def contar_giros(celulas: List[Posicao]) -> int:
+    """Número de mudanças de direção ao percorrer a sequência de células"""
+    giros = 0
+    delta_anterior = None
+    for anterior, atual in zip(celulas, celulas[1:]):
+        delta = (atual.x - anterior.x, atual.y - anterior.y)
+        if delta_anterior is not None and delta != delta_anterior:
+            giros += 1
+        delta_anterior = delta
+    return giros
+
+
+@dataclass(eq=False)
+class Aresta:
+    """Corredor entre dois nós (células internas na ordem origem -> destino)"""
+    origem: Posicao
+    destino: Posicao
+    celulas: List[Posicao] = field(default_factory=list)
+    comprimento: int = 0
+    giros: int = 0
+
+    @property
+    def custo(self) -> int:
+        """Peso usado no planejamento: avanços + giros"""
+        return self.comprimento + self.giros
+
+    def percorrer_de(self, no: Posicao) -> List[Posicao]:
+        """Células visitadas ao atravessar a aresta a partir do nó (sem incluir o nó)"""
+        if no == self.origem:
+            return self.celulas + [self.destino]
+        return self.celulas[::-1] + [self.origem]
+
+    def outro_extremo(self, no: Posicao) -> Posicao:
+        """Extremo oposto ao nó informado"""
+        return self.destino if no == self.origem else self.origem
+
+
+class GrafoJuncoes:
+    """Grafo de corredores mantido de forma incremental conforme o mapa é descoberto"""
+
+    def __init__(self, chave: Optional[Callable[[Posicao], Tuple]] = None):
+        """chave: ordem total de desempate (resultado independe da ordem de descoberta)"""
+        self.livres: Set[Posicao] = set()
+        self.forcados: Set[Posicao] = set()
+        self.nos: Set[Posicao] = set()
+        self.adjacencias: Dict[Posicao, List[Aresta]] = {}
+        self.aresta_da_celula: Dict[Posicao, Aresta] = {}
+        self.chave = chave or (lambda posicao: (posicao.y, posicao.x))
+        self.expansoes = 0
+        self._pendentes: Set[Posicao] = set()
+
+    # ------------------------------------------------------------------
+    # Atualização incremental
+    # ------------------------------------------------------------------
+
+    def definir_livre(self, posicao: Posicao, livre: bool) -> None:
+        """Marca a célula como transitável (ou não)"""
+        if livre != (posicao in self.livres):
+            if livre:
+                self.livres.add(posicao)
+            else:
+                self.livres.discard(posicao)
+            self._pendentes.add(posicao)
+
+    def definir_forcado(self, posicao: Posicao, forcado: bool) -> None:
+        """Força a célula a ser nó (fronteiras de exploração, entrada)"""
+        if forcado != (posicao in self.forcados):
+            if forcado:
+                self.forcados.add(posicao)
+            else:
+                self.forcados.discard(posicao)
+            self._pendentes.add(posicao)
+
+    def _grau(self, posicao: Posicao) -> int:
+        return sum(1 for vizinha in _vizinhas(posicao) if vizinha in self.livres)
+
+    def _e_no(self, posicao: Posicao) -> bool:
+        return posicao in self.livres and (posicao in self.forcados or self._grau(posicao) != 2)
+
+    def _remover_aresta(self, aresta: Aresta, extremos: Set[Posicao]) -> None:
+        for no in (aresta.origem, aresta.destino):
+            lista = self.adjacencias.get(no)
+            if lista is not None and aresta in lista:
+                lista.remove(aresta)
+            extremos.add(no)
+        for celula in aresta.celulas:
+            if self.aresta_da_celula.get(celula) is aresta:
+                del self.aresta_da_celula[celula]
+
+    def _passos_cobertos(self, no: Posicao) -> Set[Posicao]:
+        """Vizinhas do nó por onde já sai alguma aresta (laços saem pelas duas pontas)"""
+        cobertas = set()
+        for aresta in self.adjacencias[no]:
+            cobertas.add(aresta.percorrer_de(no)[0])
+            if aresta.origem == aresta.destino:
+                cobertas.add(aresta.celulas[-1])
+        return cobertas
+
+    def _tracar(self, no: Posicao, primeira: Posicao) -> None:
+        """Segue o corredor a partir do nó até o próximo nó e registra a aresta"""
+        anterior, atual = no, primeira
+        celulas: List[Posicao] = []
+        while atual not in self.nos:
+            celulas.append(atual)
+            seguinte = [v for v in _vizinhas(atual) if v in self.livres and v != anterior]
+            anterior, atual = atual, seguinte[0]
+
+        aresta = Aresta(no, atual, celulas, len(celulas) + 1,
+                        contar_giros([no] + celulas + [atual]))
+        self.adjacencias[no].append(aresta)
+        if atual != no:
+            self.adjacencias[atual].append(aresta)
+        else:
+            self.adjacencias[no].append(aresta)  # laço: visível pelas duas pontas
+        for celula in celulas:
+            self.aresta_da_celula[celula] = aresta
+
+    def _localizar_extremos(self, celula: Posicao) -> Set[Posicao]:
+        """Nós nas pontas do corredor que contém uma célula ainda não coberta"""
+        extremos = set()
+        for inicio in [v for v in _vizinhas(celula) if v in self.livres]:
+            anterior, atual = celula, inicio
+            while atual not in self.nos and atual != celula:
+                seguinte = [v for v in _vizinhas(atual) if v in self.livres and v != anterior]
+                anterior, atual = atual, seguinte[0]
+            if atual in self.nos:
+                extremos.add(atual)
+        return extremos
+
+    def atualizar(self) -> None:
+        """Processa as células alteradas, refazendo apenas os corredores afetados"""
+        if not self._pendentes:
+            return
+
+        afetadas: Set[Posicao] = set()
+        for posicao in self._pendentes:
+            afetadas.add(posicao)
+            afetadas.update(_vizinhas(posicao))
+        self._pendentes.clear()
+
+        extremos: Set[Posicao] = set()
+        for celula in afetadas:
+            aresta = self.aresta_da_celula.get(celula)
+            if aresta is not None:
+                self._remover_aresta(aresta, extremos)
+            if celula in self.nos:
+                for aresta in list(self.adjacencias[celula]):
+                    self._remover_aresta(aresta, extremos)
+
+        for celula in afetadas:
+            if self._e_no(celula):
+                if celula not in self.nos:
+                    self.nos.add(celula)
+                    self.adjacencias[celula] = []
+                extremos.add(celula)
+            elif celula in self.nos:
+                self.nos.discard(celula)
+                del self.adjacencias[celula]
+
+        # Células de corredor que perderam a aresta e não tocam nenhum extremo já listado
+        for celula in afetadas:
+            if (celula in self.livres and celula not in self.nos and
+                    celula not in self.aresta_da_celula):
+                extremos.update(self._localizar_extremos(celula))
+
+        for no in extremos:
+            if no not in self.nos:
+                continue
+            for vizinha in _vizinhas(no):
+                if vizinha in self.livres and vizinha not in self._passos_cobertos(no):
+                    self._tracar(no, vizinha)
+
+    # ------------------------------------------------------------------
+    # Planejamento
+    # ------------------------------------------------------------------
+
+    def caminho_mais_curto(self, origem: Posicao,
+                           objetivo: Callable[[Posicao], bool]) -> Optional[List[Posicao]]:
+        """Dijkstra sobre o grafo até o nó mais barato que satisfaz o objetivo.
+
+        Retorna as células a percorrer (sem a origem) ou None se inalcançável.
+        """
+        self.atualizar()
+        if origem not in self.livres:
+            return None
+
+        # Pontos de partida: a própria origem (se for nó) ou as pontas do seu corredor
+        partidas: List[Tuple[int, Posicao, List[Posicao]]] = []
+        if origem in self.nos:
+            if objetivo(origem):
+                return []
+            partidas.append((0, origem, []))
+        else:
+            aresta = self.aresta_da_celula.get(origem)
+            if aresta is None:
+                return None
+            i = aresta.celulas.index(origem)
+            para_origem = aresta.celulas[i - 1::-1] + [aresta.origem] if i > 0 else [aresta.origem]
+            para_destino = aresta.celulas[i + 1:] + [aresta.destino]
+            for trecho in (para_origem, para_destino):
+                custo = len(trecho) + contar_giros([origem] + trecho)
+                partidas.append((custo, trecho[-1], trecho))
+
+        chave = self.chave
+        melhor: Dict[Posicao, Tuple] = {}
+        anterior: Dict[Posicao, Tuple[Optional[Posicao], List[Posicao]]] = {}
+        fila = []
+        for custo, no, trecho in partidas:
+            ordem = (custo, chave(trecho[0]) if trecho else ())
+            if no not in melhor or ordem < melhor[no]:
+                melhor[no] = ordem
+                anterior[no] = (None, trecho)
+                heapq.heappush(fila, (custo, chave(no), no))
+
+        fechados: Set[Posicao] = set()
+        while fila:
+            custo, _, no = heapq.heappop(fila)
+            if no in fechados:
+                continue
+            fechados.add(no)
+            self.expansoes += 1
+
+            if objetivo(no):
+                return self._reconstruir(no, anterior)
+
+            for aresta in self.adjacencias[no]:
+                vizinho = aresta.outro_extremo(no)
+                if vizinho in fechados:
+                    continue
+                trecho = aresta.percorrer_de(no)
+                novo = custo + aresta.custo
+                # Desempate determinístico: custo, nó anterior, primeira célula do corredor
+                ordem = (novo, chave(no), chave(trecho[0]))
+                if vizinho not in melhor or ordem < melhor[vizinho]:
+                    melhor[vizinho] = ordem
+                    anterior[vizinho] = (no, trecho)
+                    heapq.heappush(fila, (novo, chave(vizinho), vizinho))
+
+        return None
+
+    def _reconstruir(self, no: Posicao,
+                     anterior: Dict[Posicao, Tuple[Optional[Posicao], List[Posicao]]]) -> List[Posicao]:
+        """Expande a sequência de arestas em células"""
+        trechos = []
+        atual: Optional[Posicao] = no
+        while atual is not None:
+            pai, trecho = anterior[atual]
+            trechos.append(trecho)
+            atual = pai
+        caminho: List[Posicao] = []
+        for trecho in reversed(trechos):
+            caminho.extend(trecho)
+        return caminho
+
+    def get_estatisticas(self) -> Dict:
+        """Tamanho do grafo comparado ao número de células livres"""
+        self.atualizar()
+        return {
+            'celulas_livres': len(self.livres),
+            'nos': len(self.nos),
+            'arestas': len({id(a) for lista in self.adjacencias.values() for a in lista}),
+            'expansoes': self.expansoes,
+        }
@@ -3,46 +3,125 @@ Simulador do ambiente virtual do robô de salvamento
 Responsável por carregar e simular o labirinto
 """
 
-from typing import List, Optional
+import hashlib
+import importlib
+import io
+import os
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO
 from .estruturas import (
     Posicao, Direcao, TipoCelula, TipoSensor,
     RoboException
 )
 
 
+_TIPO_POR_CARACTERE = {tipo.value: tipo for tipo in TipoCelula}
+
+# Formatos comprimidos aceitos: (bytes mágicos, extensões, módulo importado só quando usado)
+_FORMATOS_COMPRIMIDOS = [
+    (b"\x1f\x8b", ('.gz',), 'gzip'),
+    (b"BZh", ('.bz2',), 'bz2'),
+    (b"\xfd7zXZ\x00", ('.xz', '.lzma'), 'lzma'),
+]
+EXTENSOES_MAPA = ('.txt',) + tuple(ext for _, extensoes, _ in _FORMATOS_COMPRIMIDOS
+                                   for ext in extensoes)
+
+
+def abrir_mapa(arquivo_mapa: str) -> TextIO:
+    """Abre um mapa em texto, descomprimindo gzip/bz2/lzma sob demanda.
+
+    O formato vem dos bytes mágicos ou, se não reconhecidos, da extensão.
+    """
+    with open(arquivo_mapa, 'rb') as arquivo:
+        inicio = arquivo.read(6)
+    for magico, _, modulo in _FORMATOS_COMPRIMIDOS:
+        if inicio.startswith(magico):
+            return importlib.import_module(modulo).open(arquivo_mapa, 'rt', encoding='utf-8')
+    for _, extensoes, modulo in _FORMATOS_COMPRIMIDOS:
+        if arquivo_mapa.endswith(extensoes):
+            return importlib.import_module(modulo).open(arquivo_mapa, 'rt', encoding='utf-8')
+    return open(arquivo_mapa, 'r', encoding='utf-8')
+
+
+def nome_base_mapa(arquivo_mapa: str) -> str:
+    """Nome do mapa sem diretório, extensão de compressão e extensão (ex.: mapa.txt.gz -> mapa)"""
+    nome = os.path.basename(arquivo_mapa)
+    for _, extensoes, _ in _FORMATOS_COMPRIMIDOS:
+        if nome.endswith(extensoes):
+            nome = os.path.splitext(nome)[0]
+            break
+    return os.path.splitext(nome)[0]
+
+
+def _linhas_mapa(fluxo: Iterable[str]) -> Iterator[str]:
+    """Equivalente, lendo linha a linha, a texto.strip().split('\\n')"""
+    anterior: Optional[str] = None  # Última linha com conteúdo (pode ser a final)
+    pendentes: List[str] = []       # Linhas em branco depois dela
+    for linha in fluxo:
+        if linha.endswith('\n'):
+            linha = linha[:-1]
+        if not linha.strip():
+            if anterior is not None:
+                pendentes.append(linha)
+            continue
+        if anterior is None:
+            linha = linha.lstrip()
+        else:
+            yield anterior
+            yield from pendentes
+        anterior, pendentes = linha, []
+    # Texto vazio também gera uma linha (vazia), como o split
+    yield anterior.rstrip() if anterior is not None else ''
+
+
+def _girar_horario(linhas: List[str]) -> List[str]:
+    """Gira o mapa 90 graus no sentido horário: a célula (x, y) vai para (altura-1-y, x)"""
+    return [''.join(linha[x] for linha in reversed(linhas)) for x in range(len(linhas[0]))]
+
+
 class Labirinto:
     """Simulador do ambiente virtual do labirinto"""
     
-    def __init__(self, arquivo_mapa: str):
-        """Inicializa o labirinto a partir de um arquivo"""
+    def __init__(self, arquivo_mapa: str, texto: Optional[str] = None):
+        """Inicializa o labirinto a partir de um arquivo (ou do texto já lido, nomeado por arquivo_mapa)"""
+        self.arquivo_mapa = arquivo_mapa
         self.mapa: List[List[str]] = []
         self.largura: int = 0
         self.altura: int = 0
-        self.entrada: Optional[Posicao] = None
-        self.posicao_humano: Optional[Posicao] = None
-        self.humano_coletado: bool = False
+        self.entrada: Optional[Posicao] = None  # Onde o robô é ligado (primeira em ordem de leitura)
+        self.entradas: List[Posicao] = []  # Todas as saídas do prédio, aceitas na ejeção
+        self.posicao_humano: Optional[Posicao] = None  # Primeiro humano (ordem de leitura)
+        self.posicoes_humanos: List[Posicao] = []
+        self.humano_coletado: bool = False  # Um humano está sendo carregado
+        self.retirados: Set[Posicao] = set()  # Humanos fora do lugar (carregados ou já resgatados)
+        self.resgatados: int = 0
+        self._saidas: Dict[Posicao, int] = {}  # Vizinhas que não são parede (paredes não mudam)
         
-        self._carregar_mapa(arquivo_mapa)
+        self._carregar_mapa(arquivo_mapa, texto)
         self._encontrar_entrada_e_humano()
     
-    def _carregar_mapa(self, arquivo_mapa: str) -> None:
-        """Carrega o mapa a partir do arquivo"""
+    @classmethod
+    def de_texto(cls, texto: str, nome: str = "mapa.txt") -> 'Labirinto':
+        """Cria o labirinto a partir do conteúdo de um mapa (o nome identifica os logs)"""
+        return cls(nome, texto)
+    
+    def _carregar_mapa(self, arquivo_mapa: str, texto: Optional[str] = None) -> None:
+        """Carrega o mapa a partir do arquivo (texto puro ou comprimido, lido em fluxo)"""
         try:
-            with open(arquivo_mapa, 'r', encoding='utf-8') as arquivo:
-                linhas = arquivo.read().strip().split('\n')
-                
-            if not linhas:
-                raise RoboException("Arquivo de mapa vazio")
-            
-            self.altura = len(linhas)
-            self.largura = len(linhas[0]) if linhas else 0
-            
-            # Valida se todas as linhas têm o mesmo tamanho
-            for i, linha in enumerate(linhas):
-                if len(linha) != self.largura:
-                    raise RoboException(f"Linha {i+1} tem tamanho diferente das demais")
+            fluxo = abrir_mapa(arquivo_mapa) if texto is None else io.StringIO(texto, newline='\n')
+            with fluxo:
+                self.mapa = []
+                for i, linha in enumerate(_linhas_mapa(fluxo)):
+                    if i == 0:
+                        self.largura = len(linha)
+                    # Valida se todas as linhas têm o mesmo tamanho
+                    elif len(linha) != self.largura:
+                        raise RoboException(f"Linha {i+1} tem tamanho diferente das demais")
+                    self.mapa.append(list(linha))
             
-            self.mapa = [list(linha) for linha in linhas]
+            if not self.mapa:
+                raise RoboException("Arquivo de mapa vazio")
+            self.altura = len(self.mapa)
             
         except FileNotFoundError:
             raise RoboException(f"Arquivo não encontrado: {arquivo_mapa}")
@@ -50,63 +129,51 @@ class Labirinto:
             raise RoboException(f"Erro ao carregar mapa: {e}")
     
     def _encontrar_entrada_e_humano(self) -> None:
-        """Encontra a entrada e a posição inicial do humano"""
-        entrada_encontrada = False
-        humano_encontrado = False
-        
+        """Encontra as entradas e as posições iniciais dos humanos"""
         for y in range(self.altura):
             for x in range(self.largura):
                 celula = self.mapa[y][x]
                 
                 if celula == TipoCelula.ENTRADA.value:
-                    if entrada_encontrada:
-                        raise RoboException("Múltiplas entradas encontradas no mapa")
-                    
                     # Valida se a entrada está na borda
                     if not (x == 0 or x == self.largura-1 or y == 0 or y == self.altura-1):
                         raise RoboException("Entrada deve estar na borda do labirinto")
                     
-                    self.entrada = Posicao(x, y)
-                    entrada_encontrada = True
+                    self.entradas.append(Posicao(x, y))
                 
                 elif celula == TipoCelula.HUMANO.value:
-                    if humano_encontrado:
-                        raise RoboException("Múltiplos humanos encontrados no mapa")
-                    
-                    self.posicao_humano = Posicao(x, y)
-                    humano_encontrado = True
+                    self.posicoes_humanos.append(Posicao(x, y))
         
-        if not entrada_encontrada:
+        if not self.entradas:
             raise RoboException("Nenhuma entrada encontrada no mapa")
+        self.entrada = self.entradas[0]
         
-        if not humano_encontrado:
+        if not self.posicoes_humanos:
             raise RoboException("Nenhum humano encontrado no mapa")
+        self.posicao_humano = self.posicoes_humanos[0]
     
     def posicao_valida(self, posicao: Posicao) -> bool:
         """Verifica se uma posição está dentro dos limites do mapa"""
         return (0 <= posicao.x < self.largura and 
                 0 <= posicao.y < self.altura)
     
+    def _celula(self, x: int, y: int) -> str:
+        """Caractere do mapa em uma posição válida"""
+        return self.mapa[y][x]
+    
     def get_tipo_celula(self, posicao: Posicao) -> TipoCelula:
         """Retorna o tipo da célula na posição especificada"""
         if not self.posicao_valida(posicao):
             return TipoCelula.PAREDE  # Fora do mapa é considerado parede
         
-        celula = self.mapa[posicao.y][posicao.x]
+        celula = self._celula(posicao.x, posicao.y)
         
-        # Se o humano foi coletado, a posição dele vira espaço vazio
-        if (celula == TipoCelula.HUMANO.value and 
-            self.humano_coletado and 
-            posicao == self.posicao_humano):
+        # Humano coletado: a posição dele vira espaço vazio
+        if celula == TipoCelula.HUMANO.value and posicao in self.retirados:
             return TipoCelula.VAZIO
         
-        # Converte caractere para enum
-        for tipo in TipoCelula:
-            if tipo.value == celula:
-                return tipo
-        
-        # Se não reconhecer, considera parede por segurança
-        return TipoCelula.PAREDE
+        # Converte caractere para enum (se não reconhecer, considera parede por segurança)
+        return _TIPO_POR_CARACTERE.get(celula, TipoCelula.PAREDE)
     
     def ler_sensor(self, posicao: Posicao) -> TipoSensor:
         """Simula a leitura de um sensor na posição especificada"""
@@ -114,13 +181,21 @@ class Labirinto:
         
         if tipo_celula == TipoCelula.PAREDE:
             return TipoSensor.PAREDE
-        elif (tipo_celula == TipoCelula.HUMANO and 
-              not self.humano_coletado):
+        elif tipo_celula == TipoCelula.HUMANO:
             return TipoSensor.HUMANO
         else:
-            # VAZIO, ENTRADA ou HUMANO já coletado
+            # VAZIO ou ENTRADA (humano já coletado vira VAZIO)
             return TipoSensor.VAZIO
     
+    def contar_saidas(self, posicao: Posicao) -> int:
+        """Vizinhas da célula que não são parede (calculado uma vez por célula)"""
+        saidas = self._saidas.get(posicao)
+        if saidas is None:
+            saidas = sum(1 for direcao in Direcao
+                         if self.get_tipo_celula(posicao + direcao.get_delta()) != TipoCelula.PAREDE)
+            self._saidas[posicao] = saidas
+        return saidas
+    
     def pode_mover_para(self, posicao: Posicao) -> bool:
         """Verifica se o robô pode se mover para a posição"""
         tipo_celula = self.get_tipo_celula(posicao)
@@ -130,38 +205,59 @@ class Labirinto:
             return False
         
         # Não pode atropelar humano
-        if (tipo_celula == TipoCelula.HUMANO and 
-            not self.humano_coletado):
+        if tipo_celula == TipoCelula.HUMANO:
             return False
         
         return True
     
     def coletar_humano(self, posicao_robo: Posicao) -> bool:
-        """Tenta coletar o humano (deve estar exatamente na posição especificada)"""
+        """Tenta coletar um humano (deve estar exatamente na posição especificada)"""
         if self.humano_coletado:
             return False
         
-        # Verifica se a posição do robô é exatamente onde está o humano
-        if posicao_robo == self.posicao_humano:
+        # Verifica se há um humano ainda no lugar exatamente na posição
+        if self.get_tipo_celula(posicao_robo) == TipoCelula.HUMANO:
+            self.retirados.add(posicao_robo)
             self.humano_coletado = True
             return True
         
         return False
     
+    def reiniciar(self) -> None:
+        """Restaura o estado inicial (humanos no lugar) para reutilizar o mapa carregado"""
+        self.humano_coletado = False
+        self.retirados = set()
+        self.resgatados = 0
+    
     def ejetar_humano(self) -> bool:
-        """Ejeta o humano (deve estar na entrada)"""
+        """Ejeta o humano carregado (deve estar em uma entrada); ele não volta ao labirinto"""
         if not self.humano_coletado:
             return False
         
         self.humano_coletado = False
+        self.resgatados += 1
         return True
     
-    def get_direcao_inicial(self) -> Direcao:
-        """Determina a direção inicial do robô baseada na posição da entrada"""
-        if not self.entrada:
+    def capturar_humanos(self) -> List[int]:
+        """Estado dos humanos em lista plana: [carregando, resgatados, x, y, ...] (retirados)"""
+        estado = [int(self.humano_coletado), self.resgatados]
+        for posicao in sorted(self.retirados, key=lambda p: (p.y, p.x)):
+            estado.extend((posicao.x, posicao.y))
+        return estado
+    
+    def restaurar_humanos(self, estado: List[int]) -> None:
+        """Inverso de capturar_humanos"""
+        self.humano_coletado = bool(estado[0])
+        self.resgatados = estado[1]
+        self.retirados = {Posicao(estado[i], estado[i + 1]) for i in range(2, len(estado), 2)}
+    
+    def get_direcao_inicial(self, entrada: Optional[Posicao] = None) -> Direcao:
+        """Direção para dentro do labirinto a partir de uma entrada (padrão: a de partida)"""
+        entrada = entrada if entrada is not None else self.entrada
+        if not entrada:
             raise RoboException("Entrada não encontrada")
         
-        x, y = self.entrada.x, self.entrada.y
+        x, y = entrada.x, entrada.y
         
         # Entrada na borda superior - robô olha para baixo
         if y == 0:
@@ -178,6 +274,48 @@ class Labirinto:
         else:
             raise RoboException("Entrada não está na borda do labirinto")
     
+    def forma_canonica(self) -> str:
+        """Mapa equivalente para a missão, idêntico para mapas que só diferem por rotação,
+        deslocamento ou paredes inalcançáveis.
+        
+        Mantém a região alcançável a partir da entrada (o resto vira parede), recorta-a e
+        gira o resultado para o robô partir virado para o sul. Os comandos e o log da missão
+        (relativos ao robô) são os mesmos no mapa original e na forma canônica.
+        """
+        parede = TipoCelula.PAREDE.value
+        
+        def transitavel(posicao: Posicao) -> bool:
+            return (self.posicao_valida(posicao) and
+                    _TIPO_POR_CARACTERE.get(self._celula(posicao.x, posicao.y),
+                                            TipoCelula.PAREDE) != TipoCelula.PAREDE)
+        
+        alcancaveis = {self.entrada}
+        fila = deque([self.entrada])
+        while fila:
+            posicao = fila.popleft()
+            for direcao in Direcao:
+                vizinha = posicao + direcao.get_delta()
+                if vizinha not in alcancaveis and transitavel(vizinha):
+                    alcancaveis.add(vizinha)
+                    fila.append(vizinha)
+        if not alcancaveis.issuperset(self.posicoes_humanos):
+            return str(self)  # Humano inalcançável: o recorte mudaria o número de vítimas
+        if len(self.entradas) > 1:
+            return str(self)  # Recorte e giro poderiam tirar saídas da borda ou trocar a de partida
+        
+        x0, x1 = min(p.x for p in alcancaveis), max(p.x for p in alcancaveis)
+        y0, y1 = min(p.y for p in alcancaveis), max(p.y for p in alcancaveis)
+        linhas = [''.join(self._celula(x, y) if Posicao(x, y) in alcancaveis else parede
+                          for x in range(x0, x1 + 1))
+                  for y in range(y0, y1 + 1)]
+        for _ in range((Direcao.SUL.value - self.get_direcao_inicial().value) % 4):
+            linhas = _girar_horario(linhas)
+        return '\n'.join(linhas)
+    
+    def hash_canonico(self) -> str:
+        """Identifica a classe de mapas equivalentes (hash da forma canônica)"""
+        return hashlib.sha256(self.forma_canonica().encode('utf-8')).hexdigest()
+    
     def __str__(self) -> str:
         """Representação em string do labirinto"""
         resultado = []
@@ -0,0 +1,217 @@
+"""
+Labirinto em blocos para mapas que não cabem confortavelmente na memória
+O mapa fica em disco dividido em blocos quadrados de tamanho fixo; só os blocos
+próximos ao robô são carregados, em um cache LRU de capacidade configurável
+"""
+
+import argparse
+import struct
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from .estruturas import Posicao, TipoCelula, RoboException
+from .labirinto import Labirinto, abrir_mapa, _linhas_mapa
+
+
+MAGICO = b"RSBLOCOS"
+VERSAO_BLOCOS = 1
+LADO_PADRAO = 64
+CAPACIDADE_PADRAO = 64
+
+# mágico, versão, largura, altura, lado do bloco, entrada (x, y), humano (x, y)
+_CABECALHO = struct.Struct('<8sIIIIiiii')
+_PREENCHIMENTO = TipoCelula.PAREDE.value.encode('latin-1')
+
+
+def e_mapa_em_blocos(caminho: str) -> bool:
+    """Verifica pelo cabeçalho se o arquivo é um mapa em blocos"""
+    try:
+        with open(caminho, 'rb') as arquivo:
+            return arquivo.read(len(MAGICO)) == MAGICO
+    except OSError:
+        return False
+
+
+def _gravar_faixa(saida: BinaryIO, linhas: List[bytes], largura: int, lado: int) -> None:
+    """Grava uma faixa de até `lado` linhas como uma fileira de blocos"""
+    linhas = linhas + [_PREENCHIMENTO * largura] * (lado - len(linhas))
+    for inicio in range(0, largura, lado):
+        for linha in linhas:
+            trecho = linha[inicio:inicio + lado]
+            saida.write(trecho + _PREENCHIMENTO * (lado - len(trecho)))
+
+
+def converter_para_blocos(arquivo_mapa: str, arquivo_saida: str, lado: int = LADO_PADRAO) -> None:
+    """Converte um mapa em texto (possivelmente comprimido) para blocos, lendo `lado` linhas por vez.
+
+    Aplica as mesmas validações de Labirinto.
+    """
+    if lado < 1:
+        raise RoboException(f"Lado de bloco inválido: {lado}")
+
+    entrada: Optional[Posicao] = None
+    humano: Optional[Posicao] = None
+    largura = altura = 0
+    faixa: List[bytes] = []
+    especiais = (TipoCelula.ENTRADA.value, TipoCelula.HUMANO.value)
+    contagem = {celula: 0 for celula in especiais}
+    especiais_encontradas: List[Tuple[str, Posicao]] = []
+
+    try:
+        with abrir_mapa(arquivo_mapa) as fluxo, open(arquivo_saida, 'wb') as saida:
+            saida.write(b"\0" * _CABECALHO.size)
+            for y, linha in enumerate(_linhas_mapa(fluxo)):
+                if y == 0:
+                    largura = len(linha)
+                elif len(linha) != largura:
+                    raise RoboException(f"Linha {y+1} tem tamanho diferente das demais")
+                altura = y + 1
+
+                # Guarda as duas primeiras de cada; a validação é feita no fim (precisa da altura)
+                for x, celula in enumerate(linha):
+                    if celula in especiais and contagem[celula] < 2:
+                        contagem[celula] += 1
+                        especiais_encontradas.append((celula, Posicao(x, y)))
+
+                # Caracteres fora de latin-1 viram '?', que também é tratado como parede
+                faixa.append(linha.encode('latin-1', errors='replace'))
+                if len(faixa) == lado:
+                    _gravar_faixa(saida, faixa, largura, lado)
+                    faixa = []
+            if faixa:
+                _gravar_faixa(saida, faixa, largura, lado)
+    except FileNotFoundError:
+        raise RoboException(f"Arquivo não encontrado: {arquivo_mapa}")
+    except Exception as e:
+        raise RoboException(f"Erro ao carregar mapa: {e}")
+
+    # Mesma ordem de verificação de Labirinto._encontrar_entrada_e_humano
+    for celula, posicao in especiais_encontradas:
+        if celula == TipoCelula.ENTRADA.value:
+            if entrada is not None:
+                raise RoboException("Múltiplas entradas encontradas no mapa")
+            if not (posicao.x in (0, largura - 1) or posicao.y in (0, altura - 1)):
+                raise RoboException("Entrada deve estar na borda do labirinto")
+            entrada = posicao
+        else:
+            if humano is not None:
+                raise RoboException("Múltiplos humanos encontrados no mapa")
+            humano = posicao
+    if entrada is None:
+        raise RoboException("Nenhuma entrada encontrada no mapa")
+    if humano is None:
+        raise RoboException("Nenhum humano encontrado no mapa")
+
+    with open(arquivo_saida, 'r+b') as saida:
+        saida.write(_CABECALHO.pack(MAGICO, VERSAO_BLOCOS, largura, altura, lado,
+                                    entrada.x, entrada.y, humano.x, humano.y))
+
+
+class LabirintoEmBlocos(Labirinto):
+    """Labirinto lido de um arquivo em blocos; a memória depende da área explorada"""
+
+    def __init__(self, arquivo_blocos: str, capacidade_blocos: int = CAPACIDADE_PADRAO):
+        """Abre o arquivo de blocos (capacidade: blocos mantidos em memória)"""
+        if capacidade_blocos < 1:
+            raise RoboException(f"Capacidade do cache de blocos inválida: {capacidade_blocos}")
+        self.capacidade_blocos = capacidade_blocos
+        self.lado = 0
+        self.blocos_por_linha = 0
+        self.acertos_blocos = 0
+        self.falhas_blocos = 0
+        self._blocos: 'OrderedDict[int, bytes]' = OrderedDict()
+        self._arquivo: Optional[BinaryIO] = None
+        super().__init__(arquivo_blocos)
+
+    def _carregar_mapa(self, arquivo_mapa: str, texto: Optional[str] = None) -> None:
+        """Lê apenas o cabeçalho; os blocos vêm do disco sob demanda"""
+        try:
+            self._arquivo = open(arquivo_mapa, 'rb')
+        except FileNotFoundError:
+            raise RoboException(f"Arquivo não encontrado: {arquivo_mapa}")
+
+        dados = self._arquivo.read(_CABECALHO.size)
+        if len(dados) != _CABECALHO.size:
+            raise RoboException(f"Arquivo não é um mapa em blocos: {arquivo_mapa}")
+        (magico, versao, self.largura, self.altura, self.lado,
+         entrada_x, entrada_y, humano_x, humano_y) = _CABECALHO.unpack(dados)
+        if magico != MAGICO:
+            raise RoboException(f"Arquivo não é um mapa em blocos: {arquivo_mapa}")
+        if versao != VERSAO_BLOCOS:
+            raise RoboException(f"Versão de mapa em blocos incompatível: {versao}")
+
+        self.blocos_por_linha = -(-self.largura // self.lado)
+        self.entrada = Posicao(entrada_x, entrada_y)
+        self.entradas = [self.entrada]  # O formato guarda uma única entrada
+        self.posicao_humano = Posicao(humano_x, humano_y)
+        self.posicoes_humanos = [self.posicao_humano]  # O formato guarda um único humano
+
+    def _encontrar_entrada_e_humano(self) -> None:
+        """Entrada e humano já foram validados na conversão e vêm do cabeçalho"""
+
+    def _bloco(self, indice: int) -> bytes:
+        """Bloco pelo índice, do cache ou do disco (despejando o menos usado)"""
+        bloco = self._blocos.get(indice)
+        if bloco is not None:
+            self._blocos.move_to_end(indice)
+            self.acertos_blocos += 1
+            return bloco
+
+        self.falhas_blocos += 1
+        tamanho = self.lado * self.lado
+        self._arquivo.seek(_CABECALHO.size + indice * tamanho)
+        bloco = self._arquivo.read(tamanho)
+        self._blocos[indice] = bloco
+        if len(self._blocos) > self.capacidade_blocos:
+            self._blocos.popitem(last=False)
+        return bloco
+
+    def _celula(self, x: int, y: int) -> str:
+        lado = self.lado
+        bloco = self._bloco((y // lado) * self.blocos_por_linha + x // lado)
+        return chr(bloco[(y % lado) * lado + x % lado])
+
+    def get_estatisticas_blocos(self) -> Dict:
+        """Uso do cache de blocos"""
+        return {
+            'lado': self.lado,
+            'capacidade': self.capacidade_blocos,
+            'carregados': len(self._blocos),
+            'acertos': self.acertos_blocos,
+            'falhas': self.falhas_blocos,
+        }
+
+    def fechar(self) -> None:
+        """Fecha o arquivo de blocos"""
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __str__(self) -> str:
+        """Representação em string (percorre o mapa inteiro: só para mapas pequenos)"""
+        return '\n'.join(''.join(self._celula(x, y) for x in range(self.largura))
+                         for y in range(self.altura))
+
+
+def abrir_labirinto(arquivo_mapa: str, capacidade_blocos: int = CAPACIDADE_PADRAO) -> Labirinto:
+    """Labirinto em blocos se o arquivo estiver nesse formato; senão, o labirinto comum"""
+    if e_mapa_em_blocos(arquivo_mapa):
+        return LabirintoEmBlocos(arquivo_mapa, capacidade_blocos)
+    return Labirinto(arquivo_mapa)
+
+
+def main():
+    """Converte um mapa em texto para o formato em blocos"""
+    parser = argparse.ArgumentParser(description="Conversão de mapas para armazenamento em blocos")
+    parser.add_argument("arquivo_mapa", help="mapa em texto (.txt, .txt.gz, .txt.bz2, .txt.xz)")
+    parser.add_argument("arquivo_saida", help="arquivo de blocos a gerar (ex.: mapa.blocos)")
+    parser.add_argument("--lado", type=int, default=LADO_PADRAO,
+                        help=f"lado de cada bloco em células (padrão: {LADO_PADRAO})")
+    args = parser.parse_args()
+
+    converter_para_blocos(args.arquivo_mapa, args.arquivo_saida, args.lado)
+    print(f"🧱 Mapa convertido para blocos de {args.lado}x{args.lado}: {args.arquivo_saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,19 @@ import csv
 import os
 from typing import List
 from .estruturas import ComandoRobo, TipoSensor, StatusCarga
+from .labirinto import nome_base_mapa
 
 
 class LoggerRobo:
     """Responsável por gerar logs CSV auditáveis da operação do robô"""
     
-    def __init__(self, nome_arquivo_mapa: str, diretorio_logs: str = "logs"):
+    def __init__(self, nome_arquivo_mapa: str, diretorio_logs: str = "logs", sufixo: str = ""):
         """Inicializa o logger com base no nome do arquivo de mapa"""
         self.entradas: List[List[str]] = []
         
-        # Gera nome do arquivo de log baseado no mapa
-        nome_base = os.path.splitext(os.path.basename(nome_arquivo_mapa))[0]
-        self.arquivo_log = os.path.join(diretorio_logs, f"{nome_base}.csv")
+        # Gera nome do arquivo de log baseado no mapa (sufixo distingue robôs de uma mesma missão)
+        nome_base = nome_base_mapa(nome_arquivo_mapa)
+        self.arquivo_log = os.path.join(diretorio_logs, f"{nome_base}{sufixo}.csv")
         
         # Garante que o diretório existe
         os.makedirs(diretorio_logs, exist_ok=True)
@@ -38,7 +39,7 @@ class LoggerRobo:
         ]
         self.entradas.append(entrada)
 
-    def salvar_log(self) -> None:
+    def salvar_log(self, verboso: bool = True) -> None:
         """Salva o log em arquivo CSV"""
         try:
             with open(self.arquivo_log, 'w', newline='', encoding='utf-8') as arquivo:
@@ -48,7 +49,8 @@ class LoggerRobo:
                 for entrada in self.entradas:
                     writer.writerow(entrada)
                     
-            print(f"Log salvo em: {self.arquivo_log}")
+            if verboso:
+                print(f"Log salvo em: {self.arquivo_log}")
             
         except Exception as e:
             print(f"Erro ao salvar log: {e}")
@@ -0,0 +1,205 @@
+"""
+Métricas de execuções em lote
+Uma linha JSON por missão (JSON Lines) e um resumo agregado no formato texto do
+Prometheus, com histogramas, para ser lido pelo textfile collector do node exporter
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .estruturas import ComandoRobo
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PREFIXO = "robo_salvamento"
+
+# Limites superiores dos buckets (segundos / comandos)
+LIMITES_DURACAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_COMANDOS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+
+_NOMES_COMANDOS = {comando.value: comando.name.lower() for comando in ComandoRobo}
+
+
+def _valor(valor: float) -> str:
+    """Número no formato de exposição (inteiros sem notação científica)"""
+    return str(valor) if isinstance(valor, int) else repr(float(valor))
+
+
+def pico_memoria_kb() -> Optional[int]:
+    """Pico de memória residente do processo em KB (None se indisponível)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return pico // 1024 if os.uname().sysname == "Darwin" else pico
+
+
+def coletar_metricas(nome: str, labirinto, robo, algoritmo, entradas_log: List[List[str]],
+                     duracao: float) -> Dict:
+    """Métricas de uma missão já executada"""
+    comandos = Counter(_NOMES_COMANDOS.get(entrada[0], entrada[0]) for entrada in entradas_log[1:])
+    return {
+        'mapa': nome,
+        'largura': labirinto.largura,
+        'altura': labirinto.altura,
+        'sucesso': algoritmo.missao_concluida,
+        'humanos': algoritmo.total_humanos,
+        'humanos_resgatados': algoritmo.resgatados,
+        'alarme': algoritmo.tipo_erro,
+        'erro': algoritmo.erro,
+        'comandos': robo.comandos_executados,
+        'comandos_por_tipo': dict(comandos),
+        'leituras_sensores': robo.leituras_sensores,
+        'expansoes_grafo': algoritmo.grafo.expansoes,
+        'relaxamentos_distancias': algoritmo.distancias.relaxamentos,
+        'duracao_s': duracao,
+        'fases_s': dict(algoritmo.tempos_fases),
+        'pico_rss_kb': pico_memoria_kb(),
+    }
+
+
+class Histograma:
+    """Histograma cumulativo no estilo Prometheus"""
+
+    def __init__(self, limites: Sequence[float]):
+        self.limites = tuple(limites)
+        self.contagens = [0] * len(self.limites)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        """Registra uma observação"""
+        for i, limite in enumerate(self.limites):
+            if valor <= limite:
+                self.contagens[i] += 1
+        self.soma += valor
+        self.total += 1
+
+    def linhas(self, nome: str, rotulos: str = "") -> List[str]:
+        """Linhas _bucket/_sum/_count no formato texto"""
+        separador = "," if rotulos else ""
+        linhas = [f'{nome}_bucket{{{rotulos}{separador}le="{limite:g}"}} {contagem}'
+                  for limite, contagem in zip(self.limites, self.contagens)]
+        linhas.append(f'{nome}_bucket{{{rotulos}{separador}le="+Inf"}} {self.total}')
+        sufixo = f"{{{rotulos}}}" if rotulos else ""
+        linhas.append(f"{nome}_sum{sufixo} {_valor(self.soma)}")
+        linhas.append(f"{nome}_count{sufixo} {self.total}")
+        return linhas
+
+
+class EscritorMetricas:
+    """Grava as métricas de cada missão e mantém os agregados do lote"""
+
+    def __init__(self, arquivo_jsonl: Optional[str] = None, arquivo_prometheus: Optional[str] = None):
+        """Qualquer um dos arquivos pode ser omitido"""
+        self.arquivo_jsonl = arquivo_jsonl
+        self.arquivo_prometheus = arquivo_prometheus
+        self.inicio = time.monotonic()
+        self.missoes: Counter = Counter()  # (resultado, alarme) -> quantidade
+        self.comandos_por_tipo: Counter = Counter()
+        self.leituras_sensores = 0
+        self.humanos_resgatados = 0
+        self.expansoes = 0
+        self.pico_rss_kb = 0
+        self.acertos_cache = 0
+        self.duplicatas = 0
+        self.duracao = Histograma(LIMITES_DURACAO)
+        self.comandos = Histograma(LIMITES_COMANDOS)
+        self.fases: Dict[str, Histograma] = {}
+
+        for arquivo in (arquivo_jsonl, arquivo_prometheus):
+            diretorio = os.path.dirname(arquivo) if arquivo else ""
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+        if arquivo_jsonl:
+            open(arquivo_jsonl, 'w').close()
+
+    def registrar(self, metricas: Dict) -> None:
+        """Acrescenta a missão ao JSON Lines e aos agregados"""
+        if self.arquivo_jsonl:
+            with open(self.arquivo_jsonl, 'a', encoding='utf-8') as saida:
+                saida.write(json.dumps(metricas, ensure_ascii=False) + "\n")
+
+        resultado = "sucesso" if metricas['sucesso'] else "falha"
+        self.missoes[(resultado, metricas.get('alarme') or "")] += 1
+        self.comandos_por_tipo.update(metricas.get('comandos_por_tipo', {}))
+        self.leituras_sensores += metricas.get('leituras_sensores', 0)
+        self.humanos_resgatados += metricas.get('humanos_resgatados', 0)
+        self.expansoes += metricas.get('expansoes_grafo', 0)
+        self.comandos.observar(metricas['comandos'])
+        if metricas.get('cache'):
+            # Resultado reaproveitado: os tempos guardados não são desta execução
+            self.acertos_cache += 1
+            return
+        if metricas.get('duplicata_de'):
+            # Mapa equivalente a outro do lote: não foi simulado
+            self.duplicatas += 1
+            return
+        self.pico_rss_kb = max(self.pico_rss_kb, metricas.get('pico_rss_kb') or 0)
+        self.duracao.observar(metricas['duracao_s'])
+        for fase, segundos in metricas.get('fases_s', {}).items():
+            self.fases.setdefault(fase, Histograma(LIMITES_DURACAO)).observar(segundos)
+
+    def _texto_prometheus(self) -> str:
+        """Agregados do lote no formato de exposição de texto do Prometheus"""
+        p = PREFIXO
+        linhas: List[str] = []
+
+        def metrica(nome: str, tipo: str, ajuda: str, valores: List[Tuple[str, float]]) -> None:
+            linhas.append(f"# HELP {p}_{nome} {ajuda}")
+            linhas.append(f"# TYPE {p}_{nome} {tipo}")
+            for rotulos, valor in valores:
+                sufixo = f"{{{rotulos}}}" if rotulos else ""
+                linhas.append(f"{p}_{nome}{sufixo} {_valor(valor)}")
+
+        metrica("missoes_total", "counter", "Missões executadas por resultado e alarme",
+                [(f'resultado="{resultado}",alarme="{alarme}"', quantidade)
+                 for (resultado, alarme), quantidade in sorted(self.missoes.items())])
+        metrica("comandos_total", "counter", "Comandos executados por tipo",
+                [(f'tipo="{tipo}"', quantidade) for tipo, quantidade in sorted(self.comandos_por_tipo.items())])
+        metrica("leituras_sensores_total", "counter", "Leituras de sensores", [("", self.leituras_sensores)])
+        metrica("humanos_resgatados_total", "counter", "Humanos levados até a entrada",
+                [("", self.humanos_resgatados)])
+        metrica("comandos_por_humano", "gauge", "Comandos por humano resgatado no lote",
+                [("", sum(self.comandos_por_tipo.values()) / self.humanos_resgatados
+                  if self.humanos_resgatados else 0.0)])
+        metrica("expansoes_grafo_total", "counter", "Expansões do planejador de rotas", [("", self.expansoes)])
+        metrica("cache_acertos_total", "counter", "Missões reaproveitadas do cache de resultados",
+                [("", self.acertos_cache)])
+        metrica("duplicatas_total", "counter", "Missões reaproveitadas de um mapa equivalente do lote",
+                [("", self.duplicatas)])
+        metrica("pico_rss_bytes", "gauge", "Maior pico de memória residente observado",
+                [("", self.pico_rss_kb * 1024)])
+
+        decorrido = time.monotonic() - self.inicio
+        metrica("lote_duracao_segundos", "gauge", "Duração do lote até agora", [("", decorrido)])
+        metrica("lote_missoes_por_segundo", "gauge", "Vazão do lote",
+                [("", self.comandos.total / decorrido if decorrido > 0 else 0.0)])
+
+        linhas.append(f"# HELP {p}_missao_duracao_segundos Duração de cada missão")
+        linhas.append(f"# TYPE {p}_missao_duracao_segundos histogram")
+        linhas.extend(self.duracao.linhas(f"{p}_missao_duracao_segundos"))
+        linhas.append(f"# HELP {p}_missao_comandos Comandos por missão")
+        linhas.append(f"# TYPE {p}_missao_comandos histogram")
+        linhas.extend(self.comandos.linhas(f"{p}_missao_comandos"))
+        linhas.append(f"# HELP {p}_fase_duracao_segundos Duração de cada fase da missão")
+        linhas.append(f"# TYPE {p}_fase_duracao_segundos histogram")
+        for fase, histograma in sorted(self.fases.items()):
+            linhas.extend(histograma.linhas(f"{p}_fase_duracao_segundos", f'fase="{fase}"'))
+        return "\n".join(linhas) + "\n"
+
+    def escrever_prometheus(self) -> None:
+        """Grava o arquivo do Prometheus de forma atômica (o coletor nunca lê pela metade)"""
+        if not self.arquivo_prometheus:
+            return
+        temporario = f"{self.arquivo_prometheus}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as saida:
+            saida.write(self._texto_prometheus())
+        os.replace(temporario, self.arquivo_prometheus)
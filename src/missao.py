@@ -0,0 +1,95 @@
+"""
+Execução silenciosa de missões
+Roda uma missão completa sem saída no console e devolve o resultado em um dicionário
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+from .labirinto import Labirinto
+from .robo import Robo
+from .logger import LoggerRobo
+from .algoritmo_busca import AlgoritmoBusca
+from .corpus import LeitorCorpus
+from .estruturas import RoboException
+from .metricas import coletar_metricas
+
+
+def _executar_com_log(labirinto: Labirinto, diretorio_logs: str, sufixo_log: str,
+                      salvar_log: bool) -> Tuple[Dict, List[List[str]]]:
+    """Executa a missão e devolve o resultado e as entradas do log"""
+    labirinto.reiniciar()
+    logger = LoggerRobo(labirinto.arquivo_mapa, diretorio_logs, sufixo_log)
+    robo = Robo(labirinto, logger)
+    algoritmo = AlgoritmoBusca(robo, verboso=False)
+
+    inicio = time.perf_counter()
+    sucesso = algoritmo.executar_missao()
+    duracao = time.perf_counter() - inicio
+    if salvar_log:
+        logger.salvar_log(verboso=False)
+
+    return {
+        'sucesso': sucesso,
+        'erro': algoritmo.erro,
+        'sequencia': logger.get_sequencia_compacta(),
+        'comandos': robo.comandos_executados,
+        'estatisticas': algoritmo.get_estatisticas(),
+        'log': logger.get_nome_arquivo() if salvar_log else None,
+        'metricas': coletar_metricas(labirinto.arquivo_mapa, labirinto, robo, algoritmo,
+                                     logger.entradas, duracao),
+    }, logger.entradas
+
+
+def executar_missao_silenciosa(labirinto: Labirinto, diretorio_logs: str = "logs",
+                               sufixo_log: str = "", salvar_log: bool = True) -> Dict:
+    """Executa a missão no labirinto (reiniciado antes) e retorna sucesso, sequência e estatísticas"""
+    return _executar_com_log(labirinto, diretorio_logs, sufixo_log, salvar_log)[0]
+
+
+def replicar_resultado(labirinto: Labirinto, representante: Dict, entradas_log: List[List[str]],
+                       diretorio_logs: str = "logs", salvar_log: bool = True) -> Dict:
+    """Resultado de um mapa equivalente (mesmo hash canônico) a um já simulado.
+
+    Comandos e leituras são relativos ao robô, então sequência e log valem sem alteração;
+    só o nome do log e as dimensões nas métricas são os do próprio mapa.
+    """
+    resultado = dict(representante)
+    if salvar_log:
+        logger = LoggerRobo(labirinto.arquivo_mapa, diretorio_logs)
+        logger.entradas = entradas_log
+        logger.salvar_log(verboso=False)
+        resultado['log'] = logger.get_nome_arquivo()
+    resultado['metricas'] = dict(representante['metricas'], mapa=labirinto.arquivo_mapa,
+                                 largura=labirinto.largura, altura=labirinto.altura,
+                                 duracao_s=0.0, fases_s={},
+                                 duplicata_de=representante['metricas']['mapa'])
+    return resultado
+
+
+def executar_faixa_corpus(arquivo_corpus: str, inicio: int, fim: int,
+                          diretorio_logs: str = "logs", salvar_log: bool = True) -> List[Dict]:
+    """Executa as missões das entradas [inicio, fim) de um corpus, lendo um mapa por vez.
+
+    Mapas equivalentes (mesma forma canônica) são simulados uma vez só na faixa.
+    """
+    resultados = []
+    simulados: Dict[str, Tuple[Dict, List[List[str]]]] = {}
+    with LeitorCorpus(arquivo_corpus) as leitor:
+        for indice in range(inicio, min(fim, len(leitor))):
+            try:
+                labirinto = leitor.ler(indice)
+                hash_mapa = labirinto.hash_canonico()
+                if hash_mapa in simulados:
+                    resultado = replicar_resultado(labirinto, *simulados[hash_mapa],
+                                                   diretorio_logs, salvar_log)
+                else:
+                    resultado, entradas = _executar_com_log(labirinto, diretorio_logs, "", salvar_log)
+                    simulados[hash_mapa] = (resultado, entradas)
+                    resultado = dict(resultado)
+            except RoboException as e:
+                # Mapa inválido: registra a falha e segue com os demais
+                resultado = {'sucesso': False, 'erro': str(e)}
+            resultado.update(indice=indice, nome=leitor.nome(indice))
+            resultados.append(resultado)
+    return resultados
@@ -0,0 +1,139 @@
+"""
+Otimizador de sequências de comandos (peephole)
+Remove giros completos e desvios que voltam à mesma pose sem novas leituras
+"""
+
+import argparse
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from .estruturas import Posicao, Direcao, ComandoRobo, RoboException
+from .labirinto import Labirinto
+from .robo import Robo
+from .replay import ler_log
+
+
+# Pose: posição, direção e se carrega o humano
+Pose = Tuple[Posicao, Direcao, bool]
+
+
+def _comandos(sequencia: str) -> List[ComandoRobo]:
+    """Converte a sequência compacta em comandos (LIGAR não faz parte da sequência)"""
+    try:
+        comandos = [ComandoRobo(letra) for letra in sequencia]
+    except ValueError as e:
+        raise RoboException(f"Comando inválido na sequência: {e}")
+    if ComandoRobo.LIGAR in comandos:
+        raise RoboException("Sequência compacta não deve conter LIGAR")
+    return comandos
+
+
+def _observadas(robo: Robo) -> List[Posicao]:
+    """Células cobertas pela linha de log do passo (posição atual e os três sensores)"""
+    posicao, direcao = robo.posicao, robo.direcao
+    return [posicao,
+            posicao + direcao.girar_esquerda().get_delta(),
+            posicao + direcao.girar_direita().get_delta(),
+            posicao + direcao.get_delta()]
+
+
+def simular_sequencia(labirinto: Labirinto, sequencia: str) -> Tuple[List[Pose], List[bool]]:
+    """Executa a sequência com as regras completas de Robo.
+
+    Retorna a pose após cada passo (índice 0 = ao ligar) e, por passo, se ele
+    trouxe alguma leitura de célula ainda não observada.
+    """
+    labirinto.reiniciar()
+    robo = Robo(labirinto)
+    conhecidas: Set[Posicao] = set(_observadas(robo))
+    poses: List[Pose] = [(robo.posicao, robo.direcao, robo.tem_humano)]
+    novidades = [True]
+
+    for comando in _comandos(sequencia):
+        robo.executar_comando(comando)
+        novas = [posicao for posicao in _observadas(robo) if posicao not in conhecidas]
+        conhecidas.update(novas)
+        poses.append((robo.posicao, robo.direcao, robo.tem_humano))
+        novidades.append(bool(novas))
+
+    return poses, novidades
+
+
+def otimizar_sequencia(sequencia: str, labirinto: Labirinto,
+                       preservar_leituras: bool = True) -> str:
+    """Retorna a menor sequência obtida removendo trechos que voltam à mesma pose.
+
+    Um trecho é removível se começa e termina na mesma pose, não contém P nem E
+    e (com preservar_leituras) não observa nenhuma célula nova. Isso cobre ciclos
+    GGGG e idas e voltas por células já vistas. O resultado é reverificado em Robo.
+    """
+    comandos = _comandos(sequencia)
+    poses, novidades = simular_sequencia(labirinto, sequencia)
+    n = len(comandos)
+
+    # custo[j]: menor número de comandos mantidos para chegar à pose do passo j.
+    # Um salto i -> j é válido se nenhum passo em (i, j] é P/E ou traz leitura nova.
+    custo = [0] * (n + 1)
+    origem: List[Optional[int]] = [None] * (n + 1)
+    candidatos: Dict[Pose, Deque[int]] = {poses[0]: deque([0])}
+    limite = 0
+
+    for j in range(1, n + 1):
+        if comandos[j - 1] in (ComandoRobo.PEGAR, ComandoRobo.EJETAR) or (
+                preservar_leituras and novidades[j]):
+            limite = j
+
+        custo[j] = custo[j - 1] + 1
+        origem[j] = j - 1
+
+        mesmos = candidatos.setdefault(poses[j], deque())
+        # Mantém apenas índices ainda alcançáveis, com custo crescente (fila monotônica)
+        while mesmos and mesmos[0] < limite:
+            mesmos.popleft()
+        if mesmos and custo[mesmos[0]] < custo[j]:
+            custo[j] = custo[mesmos[0]]
+            origem[j] = mesmos[0]
+        while mesmos and custo[mesmos[-1]] >= custo[j]:
+            mesmos.pop()
+        mesmos.append(j)
+
+    mantidos = []
+    j = n
+    while j > 0:
+        i = origem[j]
+        if i == j - 1:
+            mantidos.append(comandos[j - 1].value)
+        j = i
+    otimizada = ''.join(reversed(mantidos))
+
+    final_otimizada = verificar_sequencia(otimizada, labirinto)
+    if final_otimizada != poses[-1]:
+        raise RoboException("Sequência otimizada não chega ao mesmo estado final")
+    return otimizada
+
+
+def verificar_sequencia(sequencia: str, labirinto: Labirinto) -> Pose:
+    """Executa a sequência do zero em Robo (alarmes propagam) e retorna a pose final"""
+    poses, _ = simular_sequencia(labirinto, sequencia)
+    return poses[-1]
+
+
+def main():
+    """Otimiza a sequência registrada em um log CSV"""
+    parser = argparse.ArgumentParser(description="Otimizador de sequências de comandos")
+    parser.add_argument("arquivo_mapa")
+    parser.add_argument("arquivo_log")
+    parser.add_argument("--descartar-leituras", action="store_true",
+                        help="remove desvios mesmo que tragam leituras novas")
+    args = parser.parse_args()
+
+    sequencia = ''.join(entrada[0] for entrada in ler_log(args.arquivo_log)[1:])
+    otimizada = otimizar_sequencia(sequencia, Labirinto(args.arquivo_mapa),
+                                   not args.descartar_leituras)
+    print(f"Original:  {len(sequencia)} comandos")
+    print(f"Otimizada: {len(otimizada)} comandos")
+    print(otimizada)
+
+
+if __name__ == "__main__":
+    main()
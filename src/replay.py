@@ -0,0 +1,281 @@
+"""
+Reprodução determinística de missões a partir do log CSV
+Mantém um índice esparso de snapshots (a cada K passos) para saltar a qualquer passo em O(K)
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from .estruturas import Posicao, Direcao, ComandoRobo, TipoSensor, RoboException
+from .labirinto import Labirinto
+from .robo import Robo
+from .checkpoint import hash_labirinto
+
+
+VERSAO_INDICE = 2
+
+_SENSORES = list(TipoSensor)
+_CODIGO_SENSOR = {sensor: i for i, sensor in enumerate(_SENSORES)}
+_SENSOR_POR_VALOR = {sensor.value: sensor for sensor in TipoSensor}
+_DIRECOES = list(Direcao)
+
+
+def ler_log(arquivo_log: str) -> List[List[str]]:
+    """Lê as linhas de um log CSV gerado por LoggerRobo"""
+    try:
+        with open(arquivo_log, 'r', newline='', encoding='utf-8') as arquivo:
+            return [linha for linha in csv.reader(arquivo) if linha]
+    except FileNotFoundError:
+        raise RoboException(f"Log não encontrado: {arquivo_log}")
+
+
+def hash_log(entradas: List[List[str]]) -> str:
+    """Identifica o conteúdo do log (invalida índices de logs diferentes)"""
+    conteudo = '\n'.join(','.join(entrada) for entrada in entradas)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def arquivo_indice_padrao(arquivo_log: str) -> str:
+    """Arquivo auxiliar do índice, ao lado do log"""
+    return f"{arquivo_log}.idx"
+
+
+class ReproducaoMissao:
+    """Reaplica os comandos de um log em Labirinto/Robo com snapshots periódicos"""
+
+    def __init__(self, labirinto: Labirinto, entradas_log: List[List[str]],
+                 intervalo: int = 100, incluir_mapa: bool = False):
+        """Prepara a reprodução (o passo 0 é o estado logo após LIGAR)"""
+        if intervalo < 1:
+            raise RoboException("Intervalo de snapshots deve ser positivo")
+        if not entradas_log or entradas_log[0][0] != ComandoRobo.LIGAR.value:
+            raise RoboException("Log deve começar com LIGAR")
+
+        self.labirinto = labirinto
+        self.entradas = entradas_log
+        self.comandos = [ComandoRobo(entrada[0]) for entrada in entradas_log[1:]]
+        self.intervalo = intervalo
+        self.incluir_mapa = incluir_mapa
+        self.snapshots: List[List] = []
+        self.indice_carregado = False
+
+        labirinto.reiniciar()
+        self.robo = Robo(labirinto)
+        self.passo_atual = 0
+
+    @property
+    def total_passos(self) -> int:
+        """Número de comandos registrados no log (sem contar LIGAR)"""
+        return len(self.comandos)
+
+    # ------------------------------------------------------------------
+    # Índice de snapshots
+    # ------------------------------------------------------------------
+
+    def _capturar(self, mapa: Optional[Dict[Posicao, TipoSensor]]) -> List:
+        """Snapshot compacto: [passo, x, y, direção, tem_humano, humanos, mapa]"""
+        mapa_plano = None
+        if mapa is not None:
+            mapa_plano = []
+            for posicao, leitura in mapa.items():
+                mapa_plano.extend((posicao.x, posicao.y, _CODIGO_SENSOR[leitura]))
+        robo = self.robo
+        return [self.passo_atual, robo.posicao.x, robo.posicao.y, robo.direcao.value,
+                robo.tem_humano, self.labirinto.capturar_humanos(), mapa_plano]
+
+    def _restaurar(self, snapshot: List) -> Optional[Dict[Posicao, TipoSensor]]:
+        """Coloca o robô no estado do snapshot e devolve o mapa salvo (se houver)"""
+        passo, x, y, direcao, tem_humano, humanos, mapa_plano = snapshot
+        self.robo.posicao = Posicao(x, y)
+        self.robo.direcao = _DIRECOES[direcao]
+        self.robo.tem_humano = tem_humano
+        self.labirinto.restaurar_humanos(humanos)
+        self.passo_atual = passo
+        if mapa_plano is None:
+            return None
+        return {
+            Posicao(mapa_plano[i], mapa_plano[i + 1]): _SENSORES[mapa_plano[i + 2]]
+            for i in range(0, len(mapa_plano), 3)
+        }
+
+    def construir_indice(self) -> None:
+        """Reproduz o log inteiro uma vez, guardando um snapshot a cada K passos"""
+        self.labirinto.reiniciar()
+        self.robo = Robo(self.labirinto)
+        self.passo_atual = 0
+        mapa = {} if self.incluir_mapa else None
+        if mapa is not None:
+            self._registrar_leituras(mapa, 0)
+
+        self.snapshots = [self._capturar(mapa)]
+        while self.passo_atual < self.total_passos:
+            self._executar_proximo(mapa)
+            if self.passo_atual % self.intervalo == 0:
+                self.snapshots.append(self._capturar(mapa))
+        self.indice_carregado = False
+
+    def salvar_indice(self, arquivo: str) -> None:
+        """Grava o índice em um arquivo auxiliar compacto (JSON + gzip)"""
+        dados = {
+            'versao': VERSAO_INDICE,
+            'mapa_hash': hash_labirinto(self.labirinto),
+            'log_hash': hash_log(self.entradas),
+            'intervalo': self.intervalo,
+            'incluir_mapa': self.incluir_mapa,
+            'snapshots': self.snapshots,
+        }
+        temporario = f"{arquivo}.tmp"
+        with gzip.open(temporario, 'wt', encoding='utf-8') as saida:
+            json.dump(dados, saida, separators=(',', ':'))
+        os.replace(temporario, arquivo)
+
+    def carregar_indice(self, arquivo: str) -> bool:
+        """Carrega um índice compatível; retorna False se ausente ou desatualizado"""
+        try:
+            with gzip.open(arquivo, 'rt', encoding='utf-8') as entrada:
+                dados = json.load(entrada)
+        except (OSError, ValueError):
+            return False
+
+        compativel = (dados.get('versao') == VERSAO_INDICE and
+                      dados.get('mapa_hash') == hash_labirinto(self.labirinto) and
+                      dados.get('log_hash') == hash_log(self.entradas) and
+                      dados.get('intervalo') == self.intervalo and
+                      (dados.get('incluir_mapa') or not self.incluir_mapa))
+        if not compativel:
+            return False
+
+        self.snapshots = dados['snapshots']
+        if not self.incluir_mapa:
+            for snapshot in self.snapshots:
+                snapshot[6] = None
+        self.indice_carregado = True
+        return True
+
+    def preparar_indice(self, arquivo: str) -> None:
+        """Reutiliza o índice salvo ou o constrói e salva ao lado do log"""
+        if not self.carregar_indice(arquivo):
+            self.construir_indice()
+            self.salvar_indice(arquivo)
+
+    # ------------------------------------------------------------------
+    # Navegação
+    # ------------------------------------------------------------------
+
+    def _registrar_leituras(self, mapa: Dict[Posicao, TipoSensor], passo: int) -> None:
+        """Aplica as leituras registradas no log para o passo informado"""
+        entrada = self.entradas[passo]
+        direcao = self.robo.direcao
+        posicao = self.robo.posicao
+        mapa[posicao + direcao.girar_esquerda().get_delta()] = _SENSOR_POR_VALOR[entrada[1]]
+        mapa[posicao + direcao.girar_direita().get_delta()] = _SENSOR_POR_VALOR[entrada[2]]
+        mapa[posicao + direcao.get_delta()] = _SENSOR_POR_VALOR[entrada[3]]
+        mapa[posicao] = TipoSensor.VAZIO
+
+    def _executar_proximo(self, mapa: Optional[Dict[Posicao, TipoSensor]] = None) -> None:
+        """Executa o próximo comando do log com as regras completas do Robo"""
+        self.robo.executar_comando(self.comandos[self.passo_atual])
+        self.passo_atual += 1
+        if mapa is not None:
+            self._registrar_leituras(mapa, self.passo_atual)
+
+    def ir_para(self, passo: int, com_mapa: bool = False) -> Optional[Dict[Posicao, TipoSensor]]:
+        """Posiciona o robô no estado após o passo informado (no máximo K comandos reaplicados)"""
+        if not 0 <= passo <= self.total_passos:
+            raise RoboException(f"Passo fora do log: {passo} (0..{self.total_passos})")
+        if com_mapa and not self.incluir_mapa:
+            raise RoboException("Índice construído sem mapas: use incluir_mapa=True")
+        if not self.snapshots:
+            self.construir_indice()
+
+        snapshot = self.snapshots[min(passo // self.intervalo, len(self.snapshots) - 1)]
+        mapa = self._restaurar(snapshot)
+        if not com_mapa:
+            mapa = None
+        while self.passo_atual < passo:
+            self._executar_proximo(mapa)
+        return mapa
+
+    def estado_em(self, passo: int) -> Dict:
+        """Estado do robô e leituras registradas no passo informado"""
+        self.ir_para(passo)
+        entrada = self.entradas[passo]
+        return {
+            'passo': passo,
+            'comando': entrada[0],
+            'posicao': self.robo.posicao,
+            'direcao': self.robo.direcao,
+            'tem_humano': self.robo.tem_humano,
+            'sensores': entrada[1:4],
+            'status_carga': entrada[4],
+        }
+
+    def mapa_conhecido_em(self, passo: int) -> Dict[Posicao, TipoSensor]:
+        """Mapa reconstruído a partir das leituras do log até o passo informado"""
+        return self.ir_para(passo, com_mapa=True)
+
+    def verificar_log(self) -> Optional[int]:
+        """Reproduz o log inteiro; retorna o primeiro passo divergente (ou None)"""
+        self.labirinto.reiniciar()
+        self.robo = Robo(self.labirinto)
+        self.passo_atual = 0
+        for passo in range(self.total_passos + 1):
+            if passo > 0:
+                try:
+                    self._executar_proximo()
+                except RoboException:
+                    return passo
+            robo = self.robo
+            leituras = [robo._ler_sensor_esquerdo().value, robo._ler_sensor_direito().value,
+                        robo._ler_sensor_frente().value, robo._get_status_carga().value]
+            if leituras != self.entradas[passo][1:5]:
+                return passo
+        return None
+
+    @classmethod
+    def de_arquivos(cls, arquivo_mapa: str, arquivo_log: str, intervalo: int = 100,
+                    incluir_mapa: bool = False) -> 'ReproducaoMissao':
+        """Carrega mapa e log, reutilizando (ou criando) o índice auxiliar do log"""
+        reproducao = cls(Labirinto(arquivo_mapa), ler_log(arquivo_log), intervalo, incluir_mapa)
+        reproducao.preparar_indice(arquivo_indice_padrao(arquivo_log))
+        return reproducao
+
+
+def main():
+    """Inspeciona um passo de uma missão registrada"""
+    parser = argparse.ArgumentParser(description="Reprodução de missões a partir do log CSV")
+    parser.add_argument("arquivo_mapa")
+    parser.add_argument("arquivo_log")
+    parser.add_argument("passo", type=int)
+    parser.add_argument("--intervalo", type=int, default=100, help="passos entre snapshots")
+    parser.add_argument("--mapa", action="store_true", help="exibe o mapa conhecido no passo")
+    args = parser.parse_args()
+
+    reproducao = ReproducaoMissao.de_arquivos(args.arquivo_mapa, args.arquivo_log,
+                                              args.intervalo, args.mapa)
+    estado = reproducao.estado_em(args.passo)
+    print(f"Passo {estado['passo']}/{reproducao.total_passos}: comando {estado['comando']}")
+    print(f"   • Posição: ({estado['posicao'].x}, {estado['posicao'].y})")
+    print(f"   • Direção: {estado['direcao'].name}")
+    print(f"   • Sensores (esq, dir, frente): {', '.join(estado['sensores'])}")
+    print(f"   • Carga: {estado['status_carga']}")
+
+    if args.mapa:
+        mapa = reproducao.mapa_conhecido_em(args.passo)
+        simbolos = {TipoSensor.PAREDE: 'X', TipoSensor.VAZIO: '.', TipoSensor.HUMANO: '@'}
+        robo = reproducao.robo.posicao
+        for y in range(reproducao.labirinto.altura):
+            linha = ''
+            for x in range(reproducao.labirinto.largura):
+                posicao = Posicao(x, y)
+                linha += 'R' if posicao == robo else simbolos.get(mapa.get(posicao), ' ')
+            print(f"   {linha}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ Hardware embarcado do robô de salvamento
 Implementa sensores, atuadores e validações de segurança
 """
 
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, Tuple, TYPE_CHECKING
 from .estruturas import (
     Posicao, Direcao, ComandoRobo, TipoSensor, StatusCarga,
     ColisaoException, AtropelamentoException, BecoSemSaidaException,
@@ -12,54 +12,82 @@ from .estruturas import (
 from .labirinto import Labirinto
 from .logger import LoggerRobo
 
+if TYPE_CHECKING:
+    from .ruido import ModeloRuido
+    from .telemetria import EmissorTelemetria
+
 
 class Robo:
     """Hardware embarcado do robô com sensores, atuadores e validações"""
     
-    def __init__(self, labirinto: Labirinto, logger: LoggerRobo):
-        """Inicializa o robô no labirinto"""
+    def __init__(self, labirinto: Labirinto, logger: Optional[LoggerRobo] = None,
+                 ruido: Optional['ModeloRuido'] = None,
+                 telemetria: Optional['EmissorTelemetria'] = None):
+        """Inicializa o robô no labirinto (sem logger, nenhuma operação é registrada;
+        ruido: falhas dos sensores vistas pelo algoritmo, ver src/ruido.py;
+        telemetria: publica cada operação ao vivo, ver src/telemetria.py)"""
         self.labirinto = labirinto
         self.logger = logger
+        self.ruido = ruido
+        self.telemetria = telemetria
         
         # Estado do robô
         self.posicao = labirinto.entrada
         self.direcao = labirinto.get_direcao_inicial()
         self.tem_humano = False
-        self.direcao_interior = self.direcao
-        self.direcao_saida = Direcao((self.direcao.value + 2) % 4)
+        self.comandos_executados = 0
+        self.leituras_sensores = 0
+        # Lado de fora de cada entrada (qualquer uma serve para ejetar)
+        self.saidas: Dict[Posicao, Direcao] = {
+            entrada: labirinto.get_direcao_inicial(entrada).oposta() for entrada in labirinto.entradas
+        }
         
         # Registro inicial dos sensores ao ligar
         self._registrar_leitura_inicial()
     
     def _registrar_leitura_inicial(self) -> None:
         """Registra a leitura inicial dos sensores ao ligar o robô"""
+        if self.logger is None and self.telemetria is None:
+            return
+        
         sensor_esquerdo = self._ler_sensor_esquerdo()
         sensor_direito = self._ler_sensor_direito()
         sensor_frente = self._ler_sensor_frente()
         status_carga = StatusCarga.SEM_CARGA
         
-        self.logger.registrar_operacao(
-            ComandoRobo.LIGAR,
-            sensor_esquerdo,
-            sensor_direito,
-            sensor_frente,
-            status_carga
-        )
+        if self.logger is not None:
+            self.logger.registrar_operacao(
+                ComandoRobo.LIGAR,
+                sensor_esquerdo,
+                sensor_direito,
+                sensor_frente,
+                status_carga
+            )
+        if self.telemetria is not None:
+            self.telemetria.publicar(ComandoRobo.LIGAR, self.posicao, self.direcao,
+                                     (sensor_esquerdo, sensor_direito, sensor_frente), False)
     
     def _ler_sensor_na_direcao(self, direcao_sensor: Direcao) -> TipoSensor:
         """Lê um sensor apontado para uma direção absoluta específica"""
-        # Ao chegar na entrada, considere a saída como espaço livre para evitar claustrofobia
-        if self._esta_na_entrada() and direcao_sensor == self.direcao_saida:
+        self.leituras_sensores += 1
+        # Ao chegar em uma entrada, considere a saída como espaço livre para evitar claustrofobia
+        if self.saidas.get(self.posicao) == direcao_sensor:
             return TipoSensor.VAZIO
 
         posicao_sensor = self.posicao + direcao_sensor.get_delta()
         return self.labirinto.ler_sensor(posicao_sensor)
 
+    def observar(self, direcao_sensor: Direcao) -> Optional[TipoSensor]:
+        """Leitura entregue ao algoritmo: com ruído, pode vir trocada ou perdida (None).
+        
+        Validações de segurança e log usam a leitura real do hardware.
+        """
+        leitura = self._ler_sensor_na_direcao(direcao_sensor)
+        return self.ruido.aplicar(leitura) if self.ruido is not None else leitura
+    
     def _ler_sensor_esquerdo(self) -> TipoSensor:
         """Lê o sensor do lado esquerdo do robô"""
-        # Calcula direção à esquerda (3 posições no sentido anti-horário)
-        direcao_esquerda = Direcao((self.direcao.value - 1) % 4)
-        return self._ler_sensor_na_direcao(direcao_esquerda)
+        return self._ler_sensor_na_direcao(self.direcao.girar_esquerda())
     
     def _ler_sensor_direito(self) -> TipoSensor:
         """Lê o sensor do lado direito do robô"""
@@ -75,14 +103,15 @@ class Robo:
         return StatusCarga.COM_HUMANO if self.tem_humano else StatusCarga.SEM_CARGA
     
     def _esta_na_entrada(self, posicao: Optional[Posicao] = None) -> bool:
-        """Verifica se uma posição corresponde à entrada do labirinto"""
+        """Verifica se uma posição corresponde a uma das entradas do labirinto"""
         posicao_checar = posicao if posicao is not None else self.posicao
-        return self.labirinto.entrada == posicao_checar
+        return posicao_checar in self.saidas
 
     def _ajustar_orientacao_para_interior(self) -> None:
         """Garante que o robô esteja virado para dentro ao chegar na entrada"""
-        if self.direcao != self.direcao_interior:
-            self.direcao = self.direcao_interior
+        direcao_interior = self.saidas[self.posicao].oposta()
+        if self.direcao != direcao_interior:
+            self.direcao = direcao_interior
 
     def _girar_para_direcao(self, direcao_alvo: Direcao) -> None:
         """Gira o robô até ficar apontado para a direção desejada"""
@@ -134,35 +163,11 @@ class Robo:
         if self._esta_na_entrada(nova_posicao):
             return
         
-        # Simula o movimento para verificar se resultaria em beco sem saída
-        posicao_original = self.posicao
-        direcao_original = self.direcao
-        
-        # Temporariamente simula estar na nova posição
-        self.posicao = nova_posicao
-        
-        try:
-            # Verifica todas as direções possíveis a partir da nova posição
-            saidas_disponiveis = 0
-            
-            for direcao_teste in [Direcao.NORTE, Direcao.SUL, Direcao.LESTE, Direcao.OESTE]:
-                self.direcao = direcao_teste
-                posicao_teste = nova_posicao + direcao_teste.get_delta()
-                
-                # Se há pelo menos uma saída que não é parede, não é beco
-                if self.labirinto.ler_sensor(posicao_teste) != TipoSensor.PAREDE:
-                    saidas_disponiveis += 1
-            
-            # Se há apenas 1 saída disponível, pode ser um beco sem saída
-            if saidas_disponiveis <= 1:
-                raise BecoSemSaidaException(
-                    f"ALARME: Movimento levaria robô com humano a beco sem saída (claustrofobia!) na posição {nova_posicao}"
-                )
-                
-        finally:
-            # Restaura posição e direção originais
-            self.posicao = posicao_original
-            self.direcao = direcao_original
+        # Uma única saída (a de onde o robô vem) significa beco sem saída
+        if self.labirinto.contar_saidas(nova_posicao) <= 1:
+            raise BecoSemSaidaException(
+                f"ALARME: Movimento levaria robô com humano a beco sem saída (claustrofobia!) na posição {nova_posicao}"
+            )
     
     def avancar(self) -> None:
         """Comando A: Avança uma posição para frente"""
@@ -192,6 +197,48 @@ class Robo:
         # Registra no log
         self._registrar_operacao(ComandoRobo.AVANCAR)
     
+    def _ler_sensores_em(self, posicao: Posicao) -> Tuple[TipoSensor, TipoSensor, TipoSensor]:
+        """Leituras (esquerdo, direito, frente) que o robô teria na posição, com a direção atual"""
+        self.leituras_sensores += 3
+        return (self.labirinto.ler_sensor(posicao + self.direcao.girar_esquerda().get_delta()),
+                self.labirinto.ler_sensor(posicao + self.direcao.girar_direita().get_delta()),
+                self.labirinto.ler_sensor(posicao + self.direcao.get_delta()))
+    
+    def avancar_n(self, n: int) -> int:
+        """Comando A repetido: avança até n células em linha reta, uma linha de log por célula.
+        
+        O primeiro passo passa por todas as validações (alarmes são lançados). Os seguintes
+        validam o trecho com as leituras já feitas e param antes de qualquer célula que
+        dispararia alarme, antes da entrada e logo após a célula em que um sensor lateral
+        muda. Retorna o número de células avançadas.
+        """
+        if n <= 0:
+            return 0
+        
+        laterais = (self._ler_sensor_esquerdo(), self._ler_sensor_direito())
+        self.avancar()
+        leituras = (self._ler_sensor_esquerdo(), self._ler_sensor_direito(),
+                    self._ler_sensor_frente())
+        avancados = 1
+        
+        while avancados < n and leituras[:2] == laterais:
+            destino = self.posicao + self.direcao.get_delta()
+            if (leituras[2] != TipoSensor.VAZIO or self._esta_na_entrada() or
+                    self._esta_na_entrada(destino) or not self.labirinto.posicao_valida(destino)):
+                break
+            
+            novas = self._ler_sensores_em(destino)
+            # Com humano: as três leituras em parede significam beco (a única saída é a de trás)
+            if self.tem_humano and all(leitura == TipoSensor.PAREDE for leitura in novas):
+                break
+            
+            self.posicao = destino
+            self._registrar_operacao(ComandoRobo.AVANCAR, novas)
+            laterais, leituras = leituras[:2], novas
+            avancados += 1
+        
+        return avancados
+    
     def girar(self) -> None:
         """Comando G: Gira 90 graus à direita"""
         self.direcao = self.direcao.girar_direita()
@@ -242,15 +289,16 @@ class Robo:
                 "ALARME: Tentativa de ejetar humano, mas não tem humano!"
             )
         
-        # Deve estar na entrada para ejetar
-        if self.posicao != self.labirinto.entrada:
+        # Deve estar em uma entrada para ejetar
+        direcao_saida = self.saidas.get(self.posicao)
+        if direcao_saida is None:
             raise OperacaoInvalidaException(
                 "ALARME: Tentativa de ejetar humano fora da entrada!"
             )
 
         # Ajusta orientação para saída antes da ejeção
-        if self.direcao != self.direcao_saida:
-            self._girar_para_direcao(self.direcao_saida)
+        if self.direcao != direcao_saida:
+            self._girar_para_direcao(direcao_saida)
         
         # Ejeta o humano
         if self.labirinto.ejetar_humano():
@@ -263,20 +311,28 @@ class Robo:
         # Registra no log
         self._registrar_operacao(ComandoRobo.EJETAR)
     
-    def _registrar_operacao(self, comando: ComandoRobo) -> None:
-        """Registra uma operação no log após execução"""
-        sensor_esquerdo = self._ler_sensor_esquerdo()
-        sensor_direito = self._ler_sensor_direito()
-        sensor_frente = self._ler_sensor_frente()
-        status_carga = self._get_status_carga()
+    def _registrar_operacao(self, comando: ComandoRobo,
+                            leituras: Optional[Tuple[TipoSensor, TipoSensor, TipoSensor]] = None) -> None:
+        """Registra uma operação no log após execução (leituras: sensores já lidos)"""
+        self.comandos_executados += 1
+        if self.logger is None and self.telemetria is None:
+            return
+        
+        if leituras is None:
+            leituras = (self._ler_sensor_esquerdo(), self._ler_sensor_direito(),
+                        self._ler_sensor_frente())
         
-        self.logger.registrar_operacao(
-            comando,
-            sensor_esquerdo,
-            sensor_direito,
-            sensor_frente,
-            status_carga
-        )
+        if self.logger is not None:
+            sensor_esquerdo, sensor_direito, sensor_frente = leituras
+            self.logger.registrar_operacao(
+                comando,
+                sensor_esquerdo,
+                sensor_direito,
+                sensor_frente,
+                self._get_status_carga()
+            )
+        if self.telemetria is not None:
+            self.telemetria.publicar(comando, self.posicao, self.direcao, leituras, self.tem_humano)
     
     def executar_comando(self, comando: ComandoRobo) -> None:
         """Executa um comando específico com validações"""
@@ -0,0 +1,201 @@
+"""
+Sensores com ruído e mapeamento por evidências
+Modelo de falhas dos sensores em campo (trocas parede/vazio e leituras perdidas, com
+semente) e contagens de evidência por célula em blocos compactos, usadas pelo algoritmo
+para só confiar em uma célula após leituras suficientes.
+Também mede o custo do mapeamento robusto (comandos extras e CPU) em um conjunto de mapas
+"""
+
+import argparse
+import math
+import random
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .estruturas import Posicao, TipoSensor, RoboException
+
+LADO_BLOCO = 32
+LIMITE_EVIDENCIA = 127  # Contagens em um byte com sinal
+RISCO_PADRAO = 1e-6
+MAXIMO_LEITURAS = 256  # Por célula e registro, contando leituras perdidas
+
+
+class ModeloRuido:
+    """Falhas dos sensores: parede lida como vazio (e vice-versa) e leituras perdidas.
+
+    O sensor de humano (térmico) não se confunde com parede: leituras de humano só
+    podem ser perdidas, nunca inventadas.
+    """
+
+    def __init__(self, taxa_troca: float = 0.0, taxa_perda: float = 0.0,
+                 semente: Optional[int] = None, risco: float = RISCO_PADRAO):
+        """taxa_troca < 0.5 (acima disso a leitura não informa nada) e taxa_perda < 1;
+        risco é a chance aceita de confiar em uma célula errada"""
+        if not 0.0 <= taxa_troca < 0.5:
+            raise RoboException(f"Taxa de troca deve estar em [0, 0.5): {taxa_troca}")
+        if not 0.0 <= taxa_perda < 1.0:
+            raise RoboException(f"Taxa de perda deve estar em [0, 1): {taxa_perda}")
+        self.taxa_troca = taxa_troca
+        self.taxa_perda = taxa_perda
+        self.maximo_leituras = MAXIMO_LEITURAS
+        self.semente = semente
+        self._aleatorio = random.Random(semente)
+        self.trocas = 0
+        self.perdas = 0
+
+        # Leituras concordantes (em saldo) para confiar numa célula: (p / (1 - p))^k <= risco
+        if taxa_troca > 0:
+            self.confianca = max(1, math.ceil(math.log(risco) / math.log(taxa_troca / (1 - taxa_troca))))
+        else:
+            self.confianca = 1
+
+    def aplicar(self, leitura: TipoSensor) -> Optional[TipoSensor]:
+        """Leitura observada (None se perdida)"""
+        if self.taxa_perda and self._aleatorio.random() < self.taxa_perda:
+            self.perdas += 1
+            return None
+        if (self.taxa_troca and leitura != TipoSensor.HUMANO and
+                self._aleatorio.random() < self.taxa_troca):
+            self.trocas += 1
+            return TipoSensor.VAZIO if leitura == TipoSensor.PAREDE else TipoSensor.PAREDE
+        return leitura
+
+    def capturar(self) -> Dict:
+        """Configuração, posição do gerador e contadores, serializáveis (checkpoints)"""
+        versao, estado_interno, gauss = self._aleatorio.getstate()
+        return {
+            'taxa_troca': self.taxa_troca,
+            'taxa_perda': self.taxa_perda,
+            'confianca': self.confianca,
+            'aleatorio': [versao, list(estado_interno), gauss],
+            'trocas': self.trocas,
+            'perdas': self.perdas,
+        }
+
+    def restaurar(self, estado: Dict) -> None:
+        """Inverso de capturar; o modelo deve ter a mesma configuração"""
+        if (estado['taxa_troca'], estado['taxa_perda'], estado['confianca']) != \
+                (self.taxa_troca, self.taxa_perda, self.confianca):
+            raise RoboException("Checkpoint salvo com outra configuração de ruído")
+        versao, estado_interno, gauss = estado['aleatorio']
+        self._aleatorio.setstate((versao, tuple(estado_interno), gauss))
+        self.trocas = estado['trocas']
+        self.perdas = estado['perdas']
+
+
+class EvidenciasCelulas:
+    """Saldo de leituras (vazio: +1, parede: -1) por célula, em blocos de bytes alocados sob demanda"""
+
+    def __init__(self, lado_bloco: int = LADO_BLOCO):
+        self.lado = lado_bloco
+        self.blocos: Dict[Tuple[int, int], array] = {}
+
+    def _local(self, posicao: Posicao) -> Tuple[Tuple[int, int], int]:
+        bx, x = divmod(posicao.x, self.lado)
+        by, y = divmod(posicao.y, self.lado)
+        return (bx, by), y * self.lado + x
+
+    def contagem(self, posicao: Posicao) -> int:
+        """Saldo de evidências da célula (0 se nunca lida)"""
+        chave, indice = self._local(posicao)
+        bloco = self.blocos.get(chave)
+        return bloco[indice] if bloco is not None else 0
+
+    def somar(self, posicao: Posicao, valor: int) -> int:
+        """Acrescenta evidências (saturando no limite de um byte) e devolve o novo saldo"""
+        chave, indice = self._local(posicao)
+        bloco = self.blocos.get(chave)
+        if bloco is None:
+            bloco = self.blocos[chave] = array('b', bytes(self.lado * self.lado))
+        novo = max(-LIMITE_EVIDENCIA, min(LIMITE_EVIDENCIA, bloco[indice] + valor))
+        bloco[indice] = novo
+        return novo
+
+    def fixar_livre(self, posicao: Posicao) -> None:
+        """Célula em que o robô esteve: livre com certeza"""
+        self.somar(posicao, 2 * LIMITE_EVIDENCIA)
+
+    def bytes_usados(self) -> int:
+        """Memória dos blocos alocados"""
+        return sum(bloco.itemsize * len(bloco) for bloco in self.blocos.values())
+
+    def capturar(self) -> List:
+        """Blocos serializáveis: [bx, by, bytes em hexadecimal] por bloco"""
+        return [[bx, by, bloco.tobytes().hex()] for (bx, by), bloco in self.blocos.items()]
+
+    def restaurar(self, blocos: List) -> None:
+        """Inverso de capturar"""
+        self.blocos = {(bx, by): array('b', bytes.fromhex(conteudo)) for bx, by, conteudo in blocos}
+
+
+# ----------------------------------------------------------------------
+# Medição do custo do mapeamento robusto
+# ----------------------------------------------------------------------
+
+def _executar(texto: str, ruido: Optional[ModeloRuido]) -> Dict:
+    """Missão silenciosa (sem log) no mapa, com ou sem ruído"""
+    from .algoritmo_busca import AlgoritmoBusca
+    from .labirinto import Labirinto
+    from .robo import Robo
+
+    robo = Robo(Labirinto.de_texto(texto), ruido=ruido)
+    algoritmo = AlgoritmoBusca(robo, verboso=False)
+    inicio = time.process_time()
+    sucesso = algoritmo.executar_missao()
+    return {
+        'sucesso': sucesso,
+        'alarme': algoritmo.tipo_erro,
+        'comandos': robo.comandos_executados,
+        'leituras': robo.leituras_sensores,
+        'releituras': algoritmo.releituras,
+        'cpu_s': time.process_time() - inicio,
+        'evidencias_bytes': algoritmo.evidencias.bytes_usados() if algoritmo.evidencias else 0,
+    }
+
+
+def medir_custo(textos_mapas: Sequence[str], taxa_troca: float, taxa_perda: float,
+                sementes: int = 5) -> Dict:
+    """Compara as missões com ruído às missões com sensores perfeitos nos mesmos mapas"""
+    base = [_executar(texto, None) for texto in textos_mapas]
+    com_ruido = [_executar(texto, ModeloRuido(taxa_troca, taxa_perda, semente))
+                 for texto in textos_mapas for semente in range(sementes)]
+    comandos_base = sum(r['comandos'] for r in base) * sementes
+    cpu_base = sum(r['cpu_s'] for r in base) * sementes
+    comandos = sum(r['comandos'] for r in com_ruido)
+    cpu = sum(r['cpu_s'] for r in com_ruido)
+    return {
+        'missoes': len(com_ruido),
+        'sucessos': sum(1 for r in com_ruido if r['sucesso']),
+        'alarmes': sum(1 for r in com_ruido if r['alarme'] and r['alarme'] != RoboException.__name__),
+        'comandos_extras': comandos / comandos_base - 1 if comandos_base else 0.0,
+        'cpu_extra': cpu / cpu_base - 1 if cpu_base else 0.0,
+        'releituras_por_missao': sum(r['releituras'] for r in com_ruido) / len(com_ruido),
+        'evidencias_bytes_max': max(r['evidencias_bytes'] for r in com_ruido),
+    }
+
+
+def main():
+    """Relata o custo do mapeamento robusto para várias taxas de ruído"""
+    from .escalonador import _ler_mapas
+
+    parser = argparse.ArgumentParser(description="Custo do mapeamento com sensores ruidosos")
+    parser.add_argument("mapas", help="arquivo de mapa ou diretório")
+    parser.add_argument("--trocas", default="0.01,0.05,0.1",
+                        help="taxas de troca parede/vazio separadas por vírgula (padrão: 0.01,0.05,0.1)")
+    parser.add_argument("--perda", type=float, default=0.05, help="taxa de leituras perdidas (padrão: 0.05)")
+    parser.add_argument("--sementes", type=int, default=5, help="execuções por mapa e taxa (padrão: 5)")
+    args = parser.parse_args()
+
+    textos = _ler_mapas(args.mapas)
+    print(f"📡 {len(textos)} mapas, perda {args.perda:.0%}, {args.sementes} sementes por taxa")
+    for taxa in (float(valor) for valor in args.trocas.split(',')):
+        resumo = medir_custo(textos, taxa, args.perda, args.sementes)
+        print(f"   • troca {taxa:.0%}: {resumo['sucessos']}/{resumo['missoes']} sucessos "
+              f"({resumo['alarmes']} alarmes), comandos {resumo['comandos_extras']:+.1%}, "
+              f"CPU {resumo['cpu_extra']:+.1%}, {resumo['releituras_por_missao']:.1f} releituras/missão, "
+              f"evidências até {resumo['evidencias_bytes_max'] / 1024:.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
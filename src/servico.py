@@ -0,0 +1,323 @@
+"""
+Serviço local de missões
+Servidor HTTP assíncrono (TCP ou socket UNIX) que executa missões em um pool de processos
+aquecido, com cache de labirintos já interpretados em cada processo
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import lzma
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+
+from .labirinto import Labirinto, abrir_mapa
+from .missao import executar_missao_silenciosa
+from .estruturas import RoboException
+
+
+LIMITE_CACHE_LABIRINTOS = 256
+TAMANHO_MAXIMO_CORPO = 16 * 1024 * 1024
+
+_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+# Cache de cada processo trabalhador: hash do mapa -> Labirinto interpretado
+_labirintos: 'OrderedDict[str, Labirinto]' = OrderedDict()
+
+
+def _hash_mapa(texto: str, nome: str) -> str:
+    """Chave do cache (o nome entra porque define o arquivo de log)"""
+    return hashlib.sha256(f"{nome}\0{texto}".encode('utf-8')).hexdigest()
+
+
+def _aquecer() -> int:
+    """Tarefa vazia: força o pool a criar o processo (imports já feitos)"""
+    return os.getpid()
+
+
+def executar_no_trabalhador(texto: str, nome: str, diretorio_logs: str,
+                            salvar_log: bool) -> Dict:
+    """Executa uma missão dentro de um processo do pool, reaproveitando labirintos já lidos"""
+    chave = _hash_mapa(texto, nome)
+    labirinto = _labirintos.get(chave)
+    if labirinto is None:
+        labirinto = Labirinto.de_texto(texto, nome)
+        _labirintos[chave] = labirinto
+        if len(_labirintos) > LIMITE_CACHE_LABIRINTOS:
+            _labirintos.popitem(last=False)
+    else:
+        _labirintos.move_to_end(chave)
+
+    # O sufixo evita que mapas diferentes com o mesmo nome sobrescrevam o log um do outro
+    return executar_missao_silenciosa(labirinto, diretorio_logs, f"_{chave[:8]}", salvar_log)
+
+
+class _LinhaMuitoLonga(Exception):
+    """Linha de pedido ou cabeçalho maior que o limite do leitor"""
+
+
+class ServicoMissoes:
+    """Recebe missões por HTTP e as executa em processos reutilizados"""
+
+    def __init__(self, trabalhadores: Optional[int] = None, limite_concorrencia: Optional[int] = None,
+                 timeout: float = 30.0, diretorio_logs: str = "logs", max_fila: int = 1000):
+        """Configura o pool (limite padrão: um pedido em execução por processo)"""
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.limite_concorrencia = limite_concorrencia or self.trabalhadores
+        self.timeout = timeout
+        self.diretorio_logs = diretorio_logs
+        self.max_fila = max_fila
+
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.servidor: Optional[asyncio.AbstractServer] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._conexoes: Set[asyncio.StreamWriter] = set()
+        self._em_execucao: Set[Future] = set()
+        self.pendentes = 0
+        self.atendidas = 0
+        self.expiradas = 0
+
+    async def iniciar(self, host: str = "127.0.0.1", porta: int = 8765,
+                      socket_unix: Optional[str] = None) -> asyncio.AbstractServer:
+        """Cria e aquece o pool e começa a aceitar conexões"""
+        self.pool = ProcessPoolExecutor(max_workers=self.trabalhadores)
+        self._semaforo = asyncio.Semaphore(self.limite_concorrencia)
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _aquecer)
+                               for _ in range(self.trabalhadores)))
+
+        if socket_unix:
+            self.servidor = await asyncio.start_unix_server(self._atender, path=socket_unix)
+        else:
+            self.servidor = await asyncio.start_server(self._atender, host, porta)
+        return self.servidor
+
+    async def encerrar(self) -> None:
+        """Para de aceitar conexões e desliga o pool"""
+        if self.servidor is not None:
+            self.servidor.close()
+            for writer in list(self._conexoes):
+                writer.close()
+            await self.servidor.wait_closed()
+        if self.pool is not None:
+            # Cancela o que ainda está na fila (shutdown(cancel_futures=True) só existe a partir do 3.9)
+            for tarefa in list(self._em_execucao):
+                tarefa.cancel()
+            self.pool.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    async def _executar_com_limite(self, *argumentos) -> Dict:
+        """Ocupa uma vaga até o processo terminar, mesmo que o pedido já tenha expirado"""
+        await self._semaforo.acquire()
+        tarefa = self.pool.submit(executar_no_trabalhador, *argumentos)
+        self._em_execucao.add(tarefa)
+        futuro = asyncio.wrap_future(tarefa)
+        futuro.add_done_callback(lambda _: self._em_execucao.discard(tarefa))
+        futuro.add_done_callback(lambda _: self._semaforo.release())
+        return await asyncio.shield(futuro)
+
+    async def executar(self, pedido: Dict) -> Tuple[int, Dict]:
+        """Executa um pedido de missão e retorna (status HTTP, resposta JSON)"""
+        if 'mapa' in pedido:
+            if not isinstance(pedido['mapa'], str):
+                return 400, {'erro': "'mapa' deve ser o texto do mapa"}
+            texto = pedido['mapa']
+            nome = pedido.get('nome', 'missao.txt')
+        elif 'arquivo' in pedido:
+            if not isinstance(pedido['arquivo'], str):
+                return 400, {'erro': "'arquivo' deve ser o caminho do mapa"}
+            try:
+                with abrir_mapa(pedido['arquivo']) as arquivo:
+                    texto = arquivo.read()
+            except (ValueError, TypeError, EOFError, lzma.LZMAError) as e:
+                return 400, {'erro': f"Arquivo de mapa inválido: {e}"}
+            except OSError as e:
+                return 400, {'erro': f"Arquivo não encontrado: {e}"}
+            nome = pedido.get('nome', os.path.basename(pedido['arquivo']))
+        else:
+            return 400, {'erro': "Pedido deve conter 'mapa' (texto) ou 'arquivo' (caminho)"}
+        if not isinstance(nome, str):
+            return 400, {'erro': "'nome' deve ser o nome do arquivo do mapa"}
+
+        if self.pendentes >= self.max_fila:
+            return 503, {'erro': "Fila de missões cheia"}
+
+        try:
+            timeout = float(pedido.get('timeout', self.timeout))
+        except (ValueError, TypeError):
+            return 400, {'erro': f"Timeout inválido: {pedido.get('timeout')!r}"}
+        if not timeout > 0:
+            return 400, {'erro': f"Timeout deve ser positivo: {timeout:g}"}
+        self.pendentes += 1
+        try:
+            resultado = await asyncio.wait_for(
+                self._executar_com_limite(texto, nome, self.diretorio_logs,
+                                          bool(pedido.get('salvar_log', True))),
+                timeout)
+        except asyncio.TimeoutError:
+            self.expiradas += 1
+            return 504, {'erro': f"Missão excedeu o tempo limite de {timeout:g}s"}
+        except RoboException as e:
+            return 400, {'erro': str(e)}
+        finally:
+            self.pendentes -= 1
+
+        self.atendidas += 1
+        return 200, resultado
+
+    def get_estatisticas(self) -> Dict:
+        """Situação atual do serviço"""
+        return {
+            'trabalhadores': self.trabalhadores,
+            'limite_concorrencia': self.limite_concorrencia,
+            'pendentes': self.pendentes,
+            'atendidas': self.atendidas,
+            'expiradas': self.expiradas,
+        }
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _rotear(self, metodo: str, caminho: str, corpo: bytes) -> Tuple[int, Dict]:
+        """Despacha o pedido HTTP para a operação correspondente"""
+        if caminho == "/missao":
+            if metodo != "POST":
+                return 405, {'erro': "Use POST em /missao"}
+            try:
+                pedido = json.loads(corpo.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError) as e:
+                return 400, {'erro': f"JSON inválido: {e}"}
+            if not isinstance(pedido, dict):
+                return 400, {'erro': "Pedido deve ser um objeto JSON"}
+            return await self.executar(pedido)
+
+        if caminho == "/saude":
+            return 200, self.get_estatisticas()
+
+        return 404, {'erro': f"Caminho desconhecido: {caminho}"}
+
+    @staticmethod
+    def _responder(writer: asyncio.StreamWriter, status: int, resposta: Dict,
+                   manter_conexao: bool) -> None:
+        """Escreve a resposta HTTP com corpo JSON"""
+        corpo = json.dumps(resposta, ensure_ascii=False).encode('utf-8')
+        cabecalho = (f"HTTP/1.1 {status} {_STATUS[status]}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(corpo)}\r\n"
+                     f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n")
+        writer.write(cabecalho.encode('latin-1') + corpo)
+
+    @staticmethod
+    async def _ler_linha(reader: asyncio.StreamReader) -> bytes:
+        """Lê uma linha do pedido (acima do limite do leitor, recusa o pedido)"""
+        try:
+            return await reader.readline()
+        except ValueError:
+            raise _LinhaMuitoLonga()
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atende pedidos HTTP/1.1 em sequência na mesma conexão (keep-alive)"""
+        self._conexoes.add(writer)
+        try:
+            while True:
+                linha = await self._ler_linha(reader)
+                if not linha:
+                    break
+                partes = linha.decode('latin-1').split()
+                if len(partes) != 3:
+                    self._responder(writer, 400, {'erro': "Linha de pedido inválida"}, False)
+                    break
+                metodo, caminho, versao = partes
+
+                cabecalhos = {}
+                while True:
+                    linha = await self._ler_linha(reader)
+                    if linha in (b"\r\n", b"\n", b""):
+                        break
+                    chave, _, valor = linha.decode('latin-1').partition(':')
+                    cabecalhos[chave.strip().lower()] = valor.strip()
+
+                tamanho = cabecalhos.get('content-length', '') or '0'
+                if not tamanho.isdecimal():
+                    self._responder(writer, 400, {'erro': "Content-Length inválido"}, False)
+                    break
+                tamanho = int(tamanho)
+                if tamanho > TAMANHO_MAXIMO_CORPO:
+                    self._responder(writer, 413, {'erro': "Corpo do pedido muito grande"}, False)
+                    break
+                corpo = await reader.readexactly(tamanho) if tamanho else b""
+
+                status, resposta = await self._rotear(metodo, caminho, corpo)
+                manter = (versao == "HTTP/1.1" and
+                          cabecalhos.get('connection', '').lower() != "close")
+                self._responder(writer, status, resposta, manter)
+                await writer.drain()
+                if not manter:
+                    break
+        except _LinhaMuitoLonga:
+            self._responder(writer, 400, {'erro': "Linha do pedido muito longa"}, False)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            # Último recurso: um erro inesperado responde 500 em vez de fechar a conexão calado
+            try:
+                self._responder(writer, 500, {'erro': f"Erro interno: {e}"}, False)
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            self._conexoes.discard(writer)
+            writer.close()
+
+
+async def _servir(servico: ServicoMissoes, host: str, porta: int,
+                  socket_unix: Optional[str]) -> None:
+    """Mantém o serviço no ar até ser interrompido"""
+    servidor = await servico.iniciar(host, porta, socket_unix)
+    endereco = socket_unix or f"http://{host}:{porta}"
+    print(f"🤖 Serviço de missões em {endereco} ({servico.trabalhadores} processos)")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servico.encerrar()
+
+
+def main():
+    """Inicia o serviço local de missões"""
+    parser = argparse.ArgumentParser(description="Serviço local de missões (HTTP + pool de processos)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--socket", default=None, help="caminho de socket UNIX (substitui host/porta)")
+    parser.add_argument("--trabalhadores", type=int, default=None, help="processos no pool")
+    parser.add_argument("--limite", type=int, default=None, help="missões simultâneas")
+    parser.add_argument("--timeout", type=float, default=30.0, help="tempo limite por missão (s)")
+    parser.add_argument("--logs", default="logs", help="diretório dos logs CSV")
+    args = parser.parse_args()
+
+    servico = ServicoMissoes(args.trabalhadores, args.limite, args.timeout, args.logs)
+    try:
+        asyncio.run(_servir(servico, args.host, args.porta, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
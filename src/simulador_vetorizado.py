@@ -0,0 +1,253 @@
+"""
+Simulador vetorizado do robô de salvamento
+Mantém N labirintos e N robôs em arrays NumPy e avança todos em uma única chamada
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .estruturas import Direcao, TipoCelula, TipoSensor, ComandoRobo, RoboException
+from .labirinto import Labirinto
+
+
+# Códigos das células na grade compacta
+CELULA_PAREDE = 0
+CELULA_VAZIO = 1
+CELULA_HUMANO = 2
+
+# Códigos das leituras dos sensores
+SENSOR_PAREDE = 0
+SENSOR_VAZIO = 1
+SENSOR_HUMANO = 2
+
+# Códigos dos comandos
+CMD_AVANCAR = 0
+CMD_GIRAR = 1
+CMD_PEGAR = 2
+CMD_EJETAR = 3
+
+CODIGO_COMANDO = {
+    ComandoRobo.AVANCAR: CMD_AVANCAR,
+    ComandoRobo.GIRAR: CMD_GIRAR,
+    ComandoRobo.PEGAR: CMD_PEGAR,
+    ComandoRobo.EJETAR: CMD_EJETAR,
+}
+
+CODIGO_LETRA = {comando.value: codigo for comando, codigo in CODIGO_COMANDO.items()}
+
+SENSOR_PARA_TIPO = {
+    SENSOR_PAREDE: TipoSensor.PAREDE,
+    SENSOR_VAZIO: TipoSensor.VAZIO,
+    SENSOR_HUMANO: TipoSensor.HUMANO,
+}
+
+# Espessura da borda de paredes: cobre o vizinho do destino de um avanço para fora do mapa
+_BORDA = 2
+
+# Deltas indexados pelo valor de Direcao (NORTE, LESTE, SUL, OESTE)
+_DX = np.array([d.get_delta()[0] for d in Direcao], dtype=np.int32)
+_DY = np.array([d.get_delta()[1] for d in Direcao], dtype=np.int32)
+
+_CELULA_POR_CARACTERE = {
+    TipoCelula.VAZIO.value: CELULA_VAZIO,
+    TipoCelula.ENTRADA.value: CELULA_VAZIO,
+    TipoCelula.HUMANO.value: CELULA_HUMANO,
+}
+
+
+@dataclass
+class ResultadoPasso:
+    """Resultado de um passo vetorizado (um elemento por ambiente)"""
+    sensores: np.ndarray          # (N, 3): esquerdo, direito, frente
+    com_humano: np.ndarray        # (N,) bool
+    colisao: np.ndarray           # (N,) bool
+    atropelamento: np.ndarray     # (N,) bool
+    beco_sem_saida: np.ndarray    # (N,) bool
+    operacao_invalida: np.ndarray # (N,) bool
+
+    @property
+    def alarme(self) -> np.ndarray:
+        """Máscara de ambientes que dispararam qualquer alarme neste passo"""
+        return (self.colisao | self.atropelamento |
+                self.beco_sem_saida | self.operacao_invalida)
+
+
+class SimuladorVetorizado:
+    """Simula N robôs em N labirintos com as mesmas regras de Robo"""
+
+    def __init__(self, labirintos: Sequence[Labirinto]):
+        """Empacota os labirintos em uma grade (N, H+4, W+4) com borda de paredes"""
+        if not labirintos:
+            raise RoboException("Nenhum labirinto informado para o simulador")
+        if any(len(lab.posicoes_humanos) > 1 for lab in labirintos):
+            raise RoboException("O simulador vetorizado aceita um único humano por mapa")
+        if any(len(lab.entradas) > 1 for lab in labirintos):
+            raise RoboException("O simulador vetorizado aceita uma única entrada por mapa")
+
+        self.n = len(labirintos)
+        altura = max(lab.altura for lab in labirintos)
+        largura = max(lab.largura for lab in labirintos)
+
+        # A borda extra faz leituras fora do mapa retornarem parede sem testes de limite
+        self.grade = np.zeros((self.n, altura + 2 * _BORDA, largura + 2 * _BORDA),
+                              dtype=np.int8)
+        self.entrada_x = np.zeros(self.n, dtype=np.int32)
+        self.entrada_y = np.zeros(self.n, dtype=np.int32)
+        self.humano_x = np.zeros(self.n, dtype=np.int32)
+        self.humano_y = np.zeros(self.n, dtype=np.int32)
+        self.direcao_interior = np.zeros(self.n, dtype=np.int8)
+
+        for i, lab in enumerate(labirintos):
+            for y, linha in enumerate(lab.mapa):
+                self.grade[i, y + _BORDA, _BORDA:lab.largura + _BORDA] = [
+                    _CELULA_POR_CARACTERE.get(c, CELULA_PAREDE) for c in linha
+                ]
+            self.entrada_x[i] = lab.entrada.x
+            self.entrada_y[i] = lab.entrada.y
+            self.humano_x[i] = lab.posicao_humano.x
+            self.humano_y[i] = lab.posicao_humano.y
+            self.direcao_interior[i] = lab.get_direcao_inicial().value
+
+        self.direcao_saida = (self.direcao_interior + 2) % 4
+        self._indices = np.arange(self.n)
+
+        # Estado dos robôs
+        self.x = np.zeros(self.n, dtype=np.int32)
+        self.y = np.zeros(self.n, dtype=np.int32)
+        self.direcao = np.zeros(self.n, dtype=np.int8)
+        self.com_humano = np.zeros(self.n, dtype=bool)
+        self.humano_coletado = np.zeros(self.n, dtype=bool)
+        self.ativo = np.zeros(self.n, dtype=bool)
+
+        self.reiniciar()
+
+    def reiniciar(self, mascara: Optional[np.ndarray] = None) -> np.ndarray:
+        """Recoloca os robôs selecionados na entrada e retorna os sensores iniciais"""
+        if mascara is None:
+            mascara = np.ones(self.n, dtype=bool)
+
+        self.x[mascara] = self.entrada_x[mascara]
+        self.y[mascara] = self.entrada_y[mascara]
+        self.direcao[mascara] = self.direcao_interior[mascara]
+        self.com_humano[mascara] = False
+        self.humano_coletado[mascara] = False
+        self.ativo[mascara] = True
+
+        return self.ler_sensores()
+
+    def _celula(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Tipo efetivo das células (humano coletado vira vazio)"""
+        celula = self.grade[self._indices, y + _BORDA, x + _BORDA]
+        coletado = (celula == CELULA_HUMANO) & self.humano_coletado
+        return np.where(coletado, CELULA_VAZIO, celula)
+
+    def _ler_sensor(self, direcao: np.ndarray) -> np.ndarray:
+        """Lê o sensor apontado para a direção absoluta informada"""
+        leitura = self._celula(self.x + _DX[direcao], self.y + _DY[direcao])
+        # Na entrada, o lado de fora é considerado livre (mesma regra de Robo)
+        saida_livre = self._na_entrada(self.x, self.y) & (direcao == self.direcao_saida)
+        return np.where(saida_livre, SENSOR_VAZIO, leitura).astype(np.int8)
+
+    def _na_entrada(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Máscara de posições que coincidem com a entrada"""
+        return (x == self.entrada_x) & (y == self.entrada_y)
+
+    def ler_sensores(self) -> np.ndarray:
+        """Retorna as leituras (N, 3) na ordem esquerdo, direito, frente"""
+        sensores = np.empty((self.n, 3), dtype=np.int8)
+        sensores[:, 0] = self._ler_sensor((self.direcao - 1) % 4)
+        sensores[:, 1] = self._ler_sensor((self.direcao + 1) % 4)
+        sensores[:, 2] = self._ler_sensor(self.direcao)
+        return sensores
+
+    def _contar_saidas(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Conta vizinhos que não são parede (validação de beco com humano)"""
+        saidas = np.zeros(self.n, dtype=np.int8)
+        for d in range(4):
+            saidas += self._celula(x + _DX[d], y + _DY[d]) != CELULA_PAREDE
+        return saidas
+
+    def step(self, comandos) -> ResultadoPasso:
+        """Executa um comando por ambiente; ambientes com alarme ficam inativos"""
+        cmd = np.asarray(comandos, dtype=np.int8)
+        if cmd.shape != (self.n,):
+            raise RoboException(f"Esperados {self.n} comandos, recebidos {cmd.shape}")
+
+        ativos = self.ativo.copy()
+        colisao = np.zeros(self.n, dtype=bool)
+        atropelamento = np.zeros(self.n, dtype=bool)
+        beco = np.zeros(self.n, dtype=bool)
+        invalida = np.zeros(self.n, dtype=bool)
+        na_entrada = self._na_entrada(self.x, self.y)
+
+        # Comando A: avançar
+        avancar = ativos & (cmd == CMD_AVANCAR)
+        invalida |= avancar & self.com_humano & na_entrada
+        avancar &= ~invalida
+
+        nx = self.x + _DX[self.direcao]
+        ny = self.y + _DY[self.direcao]
+        destino = self._celula(nx, ny)
+        colisao |= avancar & (destino == CELULA_PAREDE)
+        atropelamento |= avancar & (destino == CELULA_HUMANO)
+        avancar &= ~(colisao | atropelamento)
+
+        destino_entrada = self._na_entrada(nx, ny)
+        beco |= (avancar & self.com_humano & ~destino_entrada &
+                 (self._contar_saidas(nx, ny) <= 1))
+        avancar &= ~beco
+
+        self.x = np.where(avancar, nx, self.x)
+        self.y = np.where(avancar, ny, self.y)
+        chegou_com_humano = avancar & self.com_humano & destino_entrada
+        self.direcao = np.where(chegou_com_humano, self.direcao_interior, self.direcao)
+
+        # Comando G: girar à direita
+        girar = ativos & (cmd == CMD_GIRAR)
+        self.direcao = np.where(girar, (self.direcao + 1) % 4, self.direcao).astype(np.int8)
+
+        # Comando P: pegar humano à frente
+        pegar = ativos & (cmd == CMD_PEGAR)
+        sem_humano_frente = self._ler_sensor(self.direcao) != SENSOR_HUMANO
+        pegar_invalido = pegar & (self.com_humano | sem_humano_frente)
+        invalida |= pegar_invalido
+        pegar &= ~pegar_invalido
+        self.com_humano |= pegar
+        self.humano_coletado |= pegar
+
+        # Comando E: ejetar na entrada (gira automaticamente para a saída)
+        ejetar = ativos & (cmd == CMD_EJETAR)
+        ejetar_invalido = ejetar & (~self.com_humano | ~na_entrada)
+        invalida |= ejetar_invalido
+        ejetar &= ~ejetar_invalido
+        self.direcao = np.where(ejetar, self.direcao_saida, self.direcao).astype(np.int8)
+        self.com_humano &= ~ejetar  # O humano resgatado não volta ao labirinto
+
+        sensores = self.ler_sensores()
+
+        # Validação pós-movimento/giro: com humano, fora da entrada, três paredes
+        encurralado = ((avancar | girar) & self.com_humano &
+                       ~self._na_entrada(self.x, self.y) &
+                       np.all(sensores == SENSOR_PAREDE, axis=1))
+        beco |= encurralado
+
+        self.ativo &= ~(colisao | atropelamento | beco | invalida)
+
+        return ResultadoPasso(
+            sensores=sensores,
+            com_humano=self.com_humano.copy(),
+            colisao=colisao,
+            atropelamento=atropelamento,
+            beco_sem_saida=beco,
+            operacao_invalida=invalida,
+        )
+
+
+def codificar_comandos(sequencia: str) -> np.ndarray:
+    """Converte uma sequência compacta (ex.: 'AAGP') em códigos de comando"""
+    try:
+        return np.array([CODIGO_LETRA[letra] for letra in sequencia], dtype=np.int8)
+    except KeyError as e:
+        raise RoboException(f"Comando inválido na sequência: {e}")
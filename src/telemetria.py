@@ -0,0 +1,309 @@
+"""
+Telemetria ao vivo das missões
+O robô publica cada operação (pose, comando, sensores e carga) em um buffer circular de
+tamanho fixo; leitores (threads ou outros processos, via memória compartilhada) acompanham
+o fluxo no próprio ritmo sem nunca bloquear a missão. Um visor de terminal desenha o mapa
+explorado a partir do fluxo
+"""
+
+import argparse
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .estruturas import Posicao, Direcao, ComandoRobo, TipoSensor, RoboException
+
+
+MAGICO = b'RTEL'
+VERSAO = 1
+CAPACIDADE_PADRAO = 1 << 16  # Registros no buffer (2MB)
+
+# Cabeçalho: mágico, versão, encerrado, capacidade e total de registros escritos
+_CABECALHO = struct.Struct('<4sBBxxIQ')
+_DESLOCAMENTO_ENCERRADO = 5
+_DESLOCAMENTO_ESCRITOS = 12
+_ESCRITOS = struct.Struct('<Q')
+_INICIO_REGISTROS = 24
+
+# Registro: sequência (índice + 1, 0 durante a escrita), missão, x, y, direção, comando,
+# sensores esquerdo, direito e frente, carga
+_REGISTRO = struct.Struct('<QIiiBBBBBB2x')
+_SEQUENCIA = struct.Struct('<Q')
+
+_COMANDOS = list(ComandoRobo)
+_CODIGO_COMANDO = {comando: i for i, comando in enumerate(_COMANDOS)}
+_SENSORES = list(TipoSensor)
+_CODIGO_SENSOR = {sensor: i for i, sensor in enumerate(_SENSORES)}
+_DIRECOES = list(Direcao)
+
+_CARACTERE_SENSOR = {TipoSensor.PAREDE: 'X', TipoSensor.VAZIO: '.', TipoSensor.HUMANO: '@'}
+_SETA = {Direcao.NORTE: '^', Direcao.LESTE: '>', Direcao.SUL: 'v', Direcao.OESTE: '<'}
+
+
+@dataclass
+class RegistroTelemetria:
+    """Uma operação publicada (estado após o comando, como no log CSV)"""
+    indice: int
+    missao: int
+    posicao: Posicao
+    direcao: Direcao
+    comando: ComandoRobo
+    sensores: Tuple[TipoSensor, TipoSensor, TipoSensor]  # Esquerdo, direito, frente
+    com_humano: bool
+
+
+class CanalTelemetria:
+    """Buffer circular de registros com um único escritor e leitores sem trava.
+
+    Sem nome, o buffer fica na memória do processo (leitores em threads); com nome, em
+    memória compartilhada, aberta por outros processos com CanalTelemetria.abrir(nome).
+    O escritor nunca espera: leitores lentos perdem os registros sobrescritos (e sabem
+    quantos). Cada registro traz a própria sequência, zerada durante a escrita, para que
+    o leitor descarte registros sobrescritos enquanto os copiava.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO, nome: Optional[str] = None):
+        """Cria o canal (nome: segmento de memória compartilhada, que não pode existir)"""
+        if capacidade < 1:
+            raise RoboException(f"Capacidade da telemetria deve ser positiva: {capacidade}")
+        tamanho = _INICIO_REGISTROS + capacidade * _REGISTRO.size
+        self._memoria = None
+        if nome is None:
+            self.buffer = bytearray(tamanho)
+        else:
+            from multiprocessing import shared_memory
+            try:
+                self._memoria = shared_memory.SharedMemory(name=nome, create=True, size=tamanho)
+            except FileExistsError:
+                raise RoboException(f"Canal de telemetria já existe: {nome}")
+            self.buffer = self._memoria.buf
+        self.nome = nome
+        self.capacidade = capacidade
+        self.dono = True
+        self._escritos = 0
+        _CABECALHO.pack_into(self.buffer, 0, MAGICO, VERSAO, 0, capacidade, 0)
+
+    @classmethod
+    def abrir(cls, nome: str) -> 'CanalTelemetria':
+        """Conecta a um canal em memória compartilhada criado por outro processo"""
+        from multiprocessing import shared_memory
+        try:
+            try:
+                memoria = shared_memory.SharedMemory(name=nome, track=False)
+            except TypeError:
+                # Python < 3.13: sem desregistrar, o processo leitor apagaria o segmento ao sair
+                memoria = shared_memory.SharedMemory(name=nome)
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(memoria._name, 'shared_memory')
+        except FileNotFoundError:
+            raise RoboException(f"Canal de telemetria não encontrado: {nome}")
+
+        magico, versao, _, capacidade, _ = _CABECALHO.unpack_from(memoria.buf, 0)
+        if magico != MAGICO or versao != VERSAO:
+            memoria.close()
+            raise RoboException(f"Canal de telemetria incompatível: {nome}")
+        canal = cls.__new__(cls)
+        canal._memoria = memoria
+        canal.buffer = memoria.buf
+        canal.nome = nome
+        canal.capacidade = capacidade
+        canal.dono = False
+        canal._escritos = 0
+        return canal
+
+    def emissor(self, missao: int = 0) -> 'EmissorTelemetria':
+        """Publicador das operações de um robô (missao identifica o robô no fluxo)"""
+        return EmissorTelemetria(self, missao)
+
+    def publicar(self, missao: int, posicao: Posicao, direcao: Direcao, comando: ComandoRobo,
+                 sensores: Tuple[TipoSensor, TipoSensor, TipoSensor], com_humano: bool) -> None:
+        """Escreve um registro sobrescrevendo o mais antigo (nunca bloqueia)"""
+        indice = self._escritos
+        deslocamento = _INICIO_REGISTROS + (indice % self.capacidade) * _REGISTRO.size
+        _REGISTRO.pack_into(self.buffer, deslocamento, 0, missao, posicao.x, posicao.y,
+                            direcao.value, _CODIGO_COMANDO[comando], _CODIGO_SENSOR[sensores[0]],
+                            _CODIGO_SENSOR[sensores[1]], _CODIGO_SENSOR[sensores[2]], com_humano)
+        _SEQUENCIA.pack_into(self.buffer, deslocamento, indice + 1)
+        self._escritos = indice + 1
+        _ESCRITOS.pack_into(self.buffer, _DESLOCAMENTO_ESCRITOS, indice + 1)
+
+    def escritos(self) -> int:
+        """Total de registros publicados desde a criação"""
+        return _ESCRITOS.unpack_from(self.buffer, _DESLOCAMENTO_ESCRITOS)[0]
+
+    @property
+    def encerrado(self) -> bool:
+        """O escritor terminou (nenhum registro novo virá)"""
+        return bool(self.buffer[_DESLOCAMENTO_ENCERRADO])
+
+    def fechar(self) -> None:
+        """Libera o canal; o dono marca o fim do fluxo e remove o segmento compartilhado
+        (leitores já conectados continuam lendo o que foi escrito)"""
+        if self.dono:
+            self.buffer[_DESLOCAMENTO_ENCERRADO] = 1
+        if self._memoria is not None:
+            self.buffer = None
+            self._memoria.close()
+            if self.dono:
+                self._memoria.unlink()
+            self._memoria = None
+
+
+class EmissorTelemetria:
+    """Liga um robô ao canal, identificando seus registros pela missão"""
+
+    __slots__ = ('canal', 'missao')
+
+    def __init__(self, canal: CanalTelemetria, missao: int = 0):
+        self.canal = canal
+        self.missao = missao
+
+    def publicar(self, comando: ComandoRobo, posicao: Posicao, direcao: Direcao,
+                 sensores: Tuple[TipoSensor, TipoSensor, TipoSensor], com_humano: bool) -> None:
+        self.canal.publicar(self.missao, posicao, direcao, comando, sensores, com_humano)
+
+
+class LeitorTelemetria:
+    """Acompanha o canal a partir de um índice, contando os registros perdidos"""
+
+    def __init__(self, canal: CanalTelemetria, desde_inicio: bool = True):
+        """desde_inicio=False ignora o que já foi publicado"""
+        self.canal = canal
+        self.proximo = 0 if desde_inicio else canal.escritos()
+        self.perdidos = 0
+
+    def ler(self) -> List[RegistroTelemetria]:
+        """Registros publicados desde a última leitura (os sobrescritos entram em perdidos)"""
+        escritos = self.canal.escritos()
+        capacidade = self.canal.capacidade
+        if escritos - self.proximo > capacidade:
+            self.perdidos += escritos - capacidade - self.proximo
+            self.proximo = escritos - capacidade
+
+        buffer = self.canal.buffer
+        registros = []
+        for indice in range(self.proximo, escritos):
+            deslocamento = _INICIO_REGISTROS + (indice % capacidade) * _REGISTRO.size
+            (sequencia, missao, x, y, direcao, comando, esquerdo, direito, frente,
+             com_humano) = _REGISTRO.unpack(bytes(buffer[deslocamento:deslocamento + _REGISTRO.size]))
+            # Sequência diferente antes ou depois da cópia: o escritor já passou por aqui
+            if (sequencia != indice + 1 or
+                    _SEQUENCIA.unpack_from(buffer, deslocamento)[0] != indice + 1):
+                self.perdidos += 1
+                continue
+            registros.append(RegistroTelemetria(
+                indice, missao, Posicao(x, y), _DIRECOES[direcao], _COMANDOS[comando],
+                (_SENSORES[esquerdo], _SENSORES[direito], _SENSORES[frente]), bool(com_humano)))
+        self.proximo = escritos
+        return registros
+
+
+# ----------------------------------------------------------------------
+# Visor de terminal
+# ----------------------------------------------------------------------
+
+class VisorTelemetria:
+    """Mapa explorado de uma missão, reconstruído incrementalmente pelos sensores publicados"""
+
+    def __init__(self, missao: Optional[int] = None):
+        """missao=None acompanha a primeira missão que aparecer no fluxo"""
+        self.missao = missao
+        self.celulas: Dict[Posicao, str] = {}
+        self.ultimo: Optional[RegistroTelemetria] = None
+        self.missoes: Dict[int, RegistroTelemetria] = {}  # Último registro de cada missão
+        self.registros = 0
+
+    def aplicar(self, registro: RegistroTelemetria) -> None:
+        """Incorpora um registro (um novo LIGAR da missão acompanhada recomeça o mapa)"""
+        self.registros += 1
+        self.missoes[registro.missao] = registro
+        if self.missao is None:
+            self.missao = registro.missao
+        if registro.missao != self.missao:
+            return
+        if registro.comando == ComandoRobo.LIGAR:
+            self.celulas = {}
+
+        posicao, direcao = registro.posicao, registro.direcao
+        esquerdo, direito, frente = registro.sensores
+        for vizinha, leitura in ((posicao + direcao.girar_esquerda().get_delta(), esquerdo),
+                                 (posicao + direcao.girar_direita().get_delta(), direito),
+                                 (posicao + direcao.get_delta(), frente)):
+            self.celulas[vizinha] = _CARACTERE_SENSOR[leitura]
+        self.celulas[posicao] = '.'
+        self.ultimo = registro
+
+    def desenhar(self) -> str:
+        """Mapa conhecido com o robô (seta na direção atual); desconhecido em branco"""
+        if not self.celulas:
+            return ""
+        x0, x1 = min(p.x for p in self.celulas), max(p.x for p in self.celulas)
+        y0, y1 = min(p.y for p in self.celulas), max(p.y for p in self.celulas)
+        robo = self.ultimo.posicao if self.ultimo else None
+        linhas = []
+        for y in range(y0, y1 + 1):
+            linha = []
+            for x in range(x0, x1 + 1):
+                posicao = Posicao(x, y)
+                if posicao == robo:
+                    linha.append(_SETA[self.ultimo.direcao])
+                else:
+                    linha.append(self.celulas.get(posicao, ' '))
+            linhas.append(''.join(linha))
+        return '\n'.join(linhas)
+
+
+def _conectar(nome: str, espera: float) -> CanalTelemetria:
+    """Abre o canal, aguardando até `espera` segundos que a missão o crie"""
+    limite = time.monotonic() + espera
+    while True:
+        try:
+            return CanalTelemetria.abrir(nome)
+        except RoboException:
+            if time.monotonic() >= limite:
+                raise
+            time.sleep(0.05)
+
+
+def main():
+    """Acompanha um canal de telemetria desenhando o mapa explorado"""
+    parser = argparse.ArgumentParser(description="Visor da telemetria ao vivo das missões")
+    parser.add_argument("nome", help="canal em memória compartilhada (main.py --telemetria NOME)")
+    parser.add_argument("--missao", type=int, default=None,
+                        help="missão acompanhada (padrão: a primeira do fluxo)")
+    parser.add_argument("--intervalo", type=float, default=0.2, help="segundos entre quadros (padrão: 0.2)")
+    parser.add_argument("--espera", type=float, default=30.0,
+                        help="segundos aguardando o canal ser criado (padrão: 30)")
+    args = parser.parse_args()
+
+    try:
+        canal = _conectar(args.nome, args.espera)
+    except RoboException as e:
+        parser.error(str(e))
+    leitor = LeitorTelemetria(canal)
+    visor = VisorTelemetria(args.missao)
+    try:
+        while True:
+            encerrado = canal.encerrado
+            registros = leitor.ler()
+            for registro in registros:
+                visor.aplicar(registro)
+            if registros and visor.ultimo is not None:
+                ultimo = visor.ultimo
+                print("\x1b[H\x1b[J" + visor.desenhar())
+                print(f"\n📡 missão {visor.missao}: {ultimo.comando.value} em ({ultimo.posicao.x}, "
+                      f"{ultimo.posicao.y}){' com humano' if ultimo.com_humano else ''} | "
+                      f"{visor.registros} registros, {len(visor.missoes)} missões, "
+                      f"{leitor.perdidos} perdidos", flush=True)
+            if encerrado:
+                break
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        canal.fechar()
+
+
+if __name__ == "__main__":
+    main()
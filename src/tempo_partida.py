@@ -0,0 +1,75 @@
+"""
+Medição do tempo de partida a frio
+Compara, em processos novos, o interpretador vazio, a importação do ponto de entrada
+e uma missão completa, e lista as importações mais caras (python -X importtime)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Sequence, Tuple
+
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPA_PADRAO = os.path.join(RAIZ_PROJETO, "mapas", "teste_simples.txt")
+
+
+def medir_partida(argumentos: Sequence[str], repeticoes: int = 10) -> List[float]:
+    """Segundos de parede de cada execução de `python <argumentos>` em um processo novo"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, *argumentos], cwd=RAIZ_PROJETO, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def importacoes_mais_caras(modulo: str = "main", quantidade: int = 10) -> List[Tuple[str, float]]:
+    """Módulos de maior tempo acumulado de importação (segundos), via -X importtime"""
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                           cwd=RAIZ_PROJETO, check=True, capture_output=True, text=True).stderr
+    tempos = []
+    for linha in saida.splitlines():
+        partes = linha.split('|')
+        if len(partes) == 3 and partes[1].strip().isdigit():
+            tempos.append((partes[2].strip(), int(partes[1]) / 1e6))
+    return sorted(tempos, key=lambda item: item[1], reverse=True)[:quantidade]
+
+
+def _mediana(valores: List[float]) -> float:
+    ordenados = sorted(valores)
+    return ordenados[len(ordenados) // 2]
+
+
+def main():
+    """Relata o custo de partida de uma missão curta"""
+    parser = argparse.ArgumentParser(description="Tempo de partida a frio do simulador")
+    parser.add_argument("mapa", nargs="?", default=MAPA_PADRAO, help="mapa da missão medida")
+    parser.add_argument("--repeticoes", type=int, default=10, help="execuções por medida (padrão: 10)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as logs:
+        medidas = [
+            ("Interpretador", ["-c", "pass"]),
+            ("Importação do main", ["-c", "import main"]),
+            ("Missão completa", ["main.py", os.path.abspath(args.mapa), logs, "--no-cache"]),
+        ]
+        print(f"⏱️  Partida a frio (mediana de {args.repeticoes} execuções):")
+        base = None
+        for nome, argumentos in medidas:
+            mediana = _mediana(medir_partida(argumentos, args.repeticoes))
+            extra = f" (+{(mediana - base) * 1000:.1f}ms)" if base is not None else ""
+            print(f"   • {nome}: {mediana * 1000:.1f}ms{extra}")
+            base = base if base is not None else mediana
+
+    print("\n📦 Importações mais caras (tempo acumulado):")
+    for modulo, segundos in importacoes_mais_caras():
+        print(f"   • {modulo}: {segundos * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Registro compacto da trajetória do robô
+Movimentos guardados como inteiros em um array (x, y, direção), com modo circular
+que mantém só os últimos N e despejo opcional do histórico completo em arquivo
+"""
+
+import os
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from .estruturas import Posicao, Direcao
+
+
+CAMPOS = 3  # x, y, direção
+TIPO = 'i'
+TAMANHO_REGISTRO = CAMPOS * array(TIPO).itemsize
+LIMITE_PADRAO = 10_000
+_LOTE_DESPEJO = 4096  # movimentos acumulados antes de escrever no arquivo
+_DIRECOES = list(Direcao)
+
+Movimento = Tuple[Posicao, Direcao]
+
+
+class Trajetoria:
+    """Movimentos do robô com memória limitada (limite=None guarda todos)"""
+
+    def __init__(self, limite: Optional[int] = LIMITE_PADRAO, arquivo_despejo: Optional[str] = None):
+        """Configura o modo circular (limite de movimentos) e o arquivo de histórico"""
+        if limite is not None and limite < 1:
+            raise ValueError(f"Limite de trajetória inválido: {limite}")
+        self.limite = limite
+        self.arquivo_despejo = arquivo_despejo
+        self.total = 0
+        self._dados = array(TIPO)
+        self._inicio = 0  # Movimento mais antigo quando o buffer circular está cheio
+        self._pendentes = array(TIPO)
+        self._arquivo_iniciado = False  # Na primeira gravação, um histórico antigo é sobrescrito
+
+    def registrar(self, posicao: Posicao, direcao: Direcao) -> None:
+        """Acrescenta um movimento"""
+        registro = (posicao.x, posicao.y, direcao.value)
+        if self.limite is None or len(self._dados) < self.limite * CAMPOS:
+            self._dados.extend(registro)
+        else:
+            i = self._inicio * CAMPOS
+            self._dados[i:i + CAMPOS] = array(TIPO, registro)
+            self._inicio = (self._inicio + 1) % self.limite
+        self.total += 1
+
+        if self.arquivo_despejo is not None:
+            self._pendentes.extend(registro)
+            if len(self._pendentes) >= _LOTE_DESPEJO * CAMPOS:
+                self.descarregar()
+
+    def descarregar(self) -> None:
+        """Grava no arquivo de histórico os movimentos ainda pendentes"""
+        if self.arquivo_despejo is None or not self._pendentes:
+            return
+        if not self._arquivo_iniciado:
+            diretorio = os.path.dirname(self.arquivo_despejo)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+        with open(self.arquivo_despejo, 'ab' if self._arquivo_iniciado else 'wb') as arquivo:
+            self._pendentes.tofile(arquivo)
+        self._arquivo_iniciado = True
+        self._pendentes = array(TIPO)
+
+    def __len__(self) -> int:
+        """Total de movimentos registrados (inclusive os que já saíram da memória)"""
+        return self.total
+
+    @property
+    def em_memoria(self) -> int:
+        """Movimentos mantidos em memória"""
+        return len(self._dados) // CAMPOS
+
+    def _plana(self) -> array:
+        """Movimentos em memória, do mais antigo ao mais recente"""
+        corte = self._inicio * CAMPOS
+        return self._dados[corte:] + self._dados[:corte]
+
+    def __iter__(self) -> Iterator[Movimento]:
+        plana = self._plana()
+        for i in range(0, len(plana), CAMPOS):
+            yield Posicao(plana[i], plana[i + 1]), _DIRECOES[plana[i + 2]]
+
+    def ultimos(self, n: int) -> List[Movimento]:
+        """Os n movimentos mais recentes ainda em memória"""
+        movimentos = list(self)
+        return movimentos[-n:] if n > 0 else []
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def capturar(self) -> dict:
+        """Estado serializável (o histórico em arquivo é descarregado antes)"""
+        self.descarregar()
+        return {'total': self.total, 'movimentos': self._plana().tolist()}
+
+    def restaurar(self, estado: dict) -> None:
+        """Volta ao estado capturado, descartando do arquivo o que foi gravado depois dele"""
+        movimentos = array(TIPO, estado['movimentos'])
+        if self.limite is not None:
+            movimentos = movimentos[-self.limite * CAMPOS:]
+        self._dados = movimentos
+        self._inicio = 0
+        self.total = estado['total']
+        self._pendentes = array(TIPO)
+
+        if self.arquivo_despejo is not None and os.path.exists(self.arquivo_despejo):
+            with open(self.arquivo_despejo, 'r+b') as arquivo:
+                arquivo.truncate(min(os.path.getsize(self.arquivo_despejo),
+                                     self.total * TAMANHO_REGISTRO))
+            self._arquivo_iniciado = True
+
+
+def ler_historico(arquivo_despejo: str) -> Iterator[Movimento]:
+    """Percorre o histórico completo gravado em arquivo, em lotes"""
+    with open(arquivo_despejo, 'rb') as arquivo:
+        while True:
+            lote = array(TIPO)
+            try:
+                lote.fromfile(arquivo, _LOTE_DESPEJO * CAMPOS)
+            except EOFError:
+                pass  # Último lote, menor que o tamanho máximo
+            for i in range(0, len(lote) - CAMPOS + 1, CAMPOS):
+                yield Posicao(lote[i], lote[i + 1]), _DIRECOES[lote[i + 2]]
+            if len(lote) < _LOTE_DESPEJO * CAMPOS:
+                return
@@ -8,6 +8,16 @@ import unittest
 import sys
 import os
 import tempfile
+import random
+import json
+import csv
+import gzip
+import bz2
+import lzma
+import asyncio
+import threading
+import http.client
+import subprocess
 from unittest.mock import patch
 
 # Adiciona diretório do projeto ao path
@@ -15,14 +25,39 @@ projeto_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, projeto_dir)
 
 from src.estruturas import (
-    Posicao, Direcao, TipoSensor, ComandoRobo, StatusCarga,
+    Posicao, Direcao, TipoSensor, ComandoRobo, StatusCarga, TipoAlarme,
     ColisaoException, AtropelamentoException, BecoSemSaidaException,
-    OperacaoInvalidaException
+    OperacaoInvalidaException, RoboException
 )
 from src.labirinto import Labirinto
 from src.robo import Robo
 from src.logger import LoggerRobo
 from src.algoritmo_busca import AlgoritmoBusca
+from src.ambiente import AmbienteRobo
+from src.busca_cooperativa import BuscaCooperativa
+from src.checkpoint import GerenciadorCheckpoint, capturar_estado, restaurar_estado, carregar_checkpoint
+from src.replay import ReproducaoMissao, arquivo_indice_padrao
+from src.grafo_juncoes import GrafoJuncoes
+from src.campo_distancias import CampoDistancias, nucleo_sem_becos
+from src.servico import ServicoMissoes
+from src.cache_resultados import CacheResultados, chave_resultado
+from src.labirinto_blocos import LabirintoEmBlocos, converter_para_blocos, abrir_labirinto
+from src.trajetoria import Trajetoria, ler_historico
+from src.estresse import (executar_estresse, executar_caso, gerar_labirinto,
+                           minimizar_falha, verificar_missao)
+from src.corpus import EscritorCorpus, LeitorCorpus, faixa_shard, e_corpus
+from src.missao import executar_missao_silenciosa, executar_faixa_corpus
+from src.otimizador import otimizar_sequencia, verificar_sequencia
+from src.metricas import EscritorMetricas, Histograma
+from src.escalonador import executar_frota, executar_missao_assincrona
+from src.tempo_partida import medir_partida, importacoes_mais_caras
+from src.ruido import ModeloRuido, EvidenciasCelulas, medir_custo
+from src.telemetria import CanalTelemetria, LeitorTelemetria, VisorTelemetria
+
+try:
+    import numpy
+except ImportError:  # NumPy é opcional (apenas para o simulador vetorizado)
+    numpy = None
 
 
 class TestEstruturas(unittest.TestCase):
@@ -308,6 +343,1484 @@ class TestIntegracao(unittest.TestCase):
         print("✅ Componentes funcionando corretamente!")
 
 
+@unittest.skipIf(numpy is None, "NumPy não instalado")
+class TestSimuladorVetorizado(unittest.TestCase):
+    """Testa conformidade do simulador vetorizado com Robo"""
+
+    MAPAS = [
+        "XXXEX\nX...X\nX.@.X\nXXXXX",
+        "XXXXXXX\nE.....X\nXXXXX.X\nX...@.X\nXXXXXXX",
+        "XXXXX\nE..@X\nXXXXX",
+        "XXXXEXXXX\nX.......X\nX.XXX.X.X\nX...X...X\nXXX.X.X.X\nX.......X\nX.XXXXX.X\nX....@..X",
+    ]
+
+    def setUp(self):
+        """Cria os arquivos de mapa temporários"""
+        self.arquivos = []
+        for texto in self.MAPAS:
+            arquivo = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+            arquivo.write(texto)
+            arquivo.close()
+            self.arquivos.append(arquivo.name)
+
+    def tearDown(self):
+        """Limpa arquivos temporários"""
+        for nome in self.arquivos:
+            os.unlink(nome)
+
+    def _novo_robo(self, arquivo):
+        labirinto = Labirinto(arquivo)
+        return Robo(labirinto, LoggerRobo(arquivo, "temp"))
+
+    def _comparar(self, sequencias):
+        """Aplica as sequências em Robo e no simulador e compara passo a passo"""
+        from src.simulador_vetorizado import (
+            SimuladorVetorizado, CODIGO_LETRA, SENSOR_PARA_TIPO
+        )
+
+        robos = [self._novo_robo(arquivo) for arquivo in self.arquivos]
+        simulador = SimuladorVetorizado([robo.labirinto for robo in robos])
+        alarmes = [None] * len(robos)
+        passos = max(len(seq) for seq in sequencias)
+
+        for passo in range(passos):
+            comandos = []
+            for i, robo in enumerate(robos):
+                letra = sequencias[i][passo] if passo < len(sequencias[i]) else 'G'
+                comandos.append(CODIGO_LETRA[letra])
+                if alarmes[i] is not None:
+                    continue
+                try:
+                    robo.executar_comando(ComandoRobo(letra))
+                except Exception as e:
+                    alarmes[i] = type(e)
+
+            resultado = simulador.step(comandos)
+
+            for i, robo in enumerate(robos):
+                if not simulador.ativo[i] and alarmes[i] is None:
+                    self.fail(f"Simulador disparou alarme indevido no mapa {i}, passo {passo}")
+                if alarmes[i] is not None:
+                    self.assertFalse(simulador.ativo[i])
+                    continue
+                self.assertEqual((simulador.x[i], simulador.y[i]), (robo.posicao.x, robo.posicao.y))
+                self.assertEqual(int(simulador.direcao[i]), robo.direcao.value)
+                self.assertEqual(bool(resultado.com_humano[i]), robo.tem_humano)
+                esperado = [robo._ler_sensor_esquerdo(), robo._ler_sensor_direito(),
+                            robo._ler_sensor_frente()]
+                obtido = [SENSOR_PARA_TIPO[int(v)] for v in resultado.sensores[i]]
+                self.assertEqual(obtido, esperado)
+
+            for i, tipo in enumerate(alarmes):
+                if tipo is None or not resultado.alarme[i]:
+                    continue
+                mascaras = {
+                    ColisaoException: resultado.colisao,
+                    AtropelamentoException: resultado.atropelamento,
+                    BecoSemSaidaException: resultado.beco_sem_saida,
+                    OperacaoInvalidaException: resultado.operacao_invalida,
+                }
+                self.assertTrue(mascaras[tipo][i], f"Alarme {tipo.__name__} divergente no mapa {i}")
+
+    def test_conformidade_comandos_aleatorios(self):
+        """Sequências aleatórias produzem os mesmos estados e alarmes que Robo"""
+        gerador = random.Random(42)
+        for _ in range(30):
+            sequencias = [
+                ''.join(gerador.choice('AAAAGGP' + 'E' * (gerador.random() < 0.3))
+                        for _ in range(40))
+                for _ in self.arquivos
+            ]
+            self._comparar(sequencias)
+
+    def test_conformidade_missao_completa(self):
+        """Sequências reais de missão (com P e E) são reproduzidas sem alarmes"""
+        sequencias = []
+        for arquivo in self.arquivos:
+            robo = self._novo_robo(arquivo)
+            AlgoritmoBusca(robo).executar_missao()
+            sequencias.append(robo.logger.get_sequencia_compacta())
+        self._comparar(sequencias)
+
+
+class TestAmbiente(unittest.TestCase):
+    """Testa a API reset/step do ambiente de controle"""
+
+    def setUp(self):
+        """Prepara mapa de teste simples"""
+        self.arquivo_temp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        self.arquivo_temp.write("XXXXXXX\nE.....X\nXXXXX.X\nX...@.X\nXXXXXXX")
+        self.arquivo_temp.close()
+        self.labirinto = Labirinto(self.arquivo_temp.name)
+
+    def tearDown(self):
+        """Limpa arquivos"""
+        os.unlink(self.arquivo_temp.name)
+
+    def test_alarme_sem_excecao(self):
+        """Colisão vira código de alarme e encerra o episódio"""
+        ambiente = AmbienteRobo()
+        ambiente.reset(self.labirinto)
+        ambiente.step('G')
+        observacao, terminal, alarme = ambiente.step('A')
+
+        self.assertTrue(terminal)
+        self.assertEqual(alarme, TipoAlarme.COLISAO)
+        self.assertEqual(len(observacao), 4)
+
+    def test_missao_completa_e_reutilizacao(self):
+        """Episódios consecutivos reutilizam o labirinto carregado"""
+        logger = LoggerRobo(self.arquivo_temp.name, "temp")
+        AlgoritmoBusca(Robo(self.labirinto, logger)).executar_missao()
+        sequencia = logger.get_sequencia_compacta()
+        self.assertTrue(sequencia.endswith('E'))
+
+        ambiente = AmbienteRobo()
+        for _ in range(2):
+            observacao = ambiente.reset(self.labirinto)
+            self.assertEqual(observacao[3], StatusCarga.SEM_CARGA)
+            # As giradas automáticas da ejeção já aparecem na sequência registrada
+            for comando in sequencia:
+                observacao, terminal, alarme = ambiente.step(comando)
+                self.assertEqual(alarme, TipoAlarme.NENHUM)
+            self.assertTrue(terminal)
+
+    def test_log_opcional(self):
+        """Com registro ativo, o ambiente gera as mesmas linhas que o Robo"""
+        ambiente = AmbienteRobo(registrar_log=True, diretorio_logs="temp")
+        ambiente.reset(self.labirinto)
+        ambiente.step(ComandoRobo.AVANCAR)
+        self.assertEqual([linha[0] for linha in ambiente.logger.entradas], ['LIGAR', 'A'])
+
+        self.assertIsNone(AmbienteRobo().logger)
+
+
+class TestBuscaCooperativa(unittest.TestCase):
+    """Testa a busca com múltiplos robôs e mapa compartilhado"""
+
+    MAPA = ("XXXXXXXXXEXXXXXXXXXXX\n"
+            "X...X...............X\n"
+            "X.XXX.X.XXXXXX..XXX.X\n"
+            "X...X.X.....X.X...X.X\n"
+            "X.X.X.X..XX.X.XXX.XXX\n"
+            "X.X.....X.......X...X\n"
+            "X.XXXXX.X.XXXXX...X.X\n"
+            "X.X.....X.......X...X\n"
+            "X.X.XXXXXXXXXXX.X.X.X\n"
+            "X...X....@....X.X.X.X\n"
+            "XX.XX.XXX.X.X.X...XXX\n"
+            "X.X...X.X.X.X...X...X\n"
+            "X.X.X.X.X.X.X..XXXX.X\n"
+            "X.......X.........X.X\n"
+            "XXXXXXXXXXXXXXXXXXXXX")
+
+    def setUp(self):
+        """Prepara mapa com vários corredores"""
+        self.arquivo_temp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        self.arquivo_temp.write(self.MAPA)
+        self.arquivo_temp.close()
+
+    def tearDown(self):
+        """Limpa arquivos"""
+        os.unlink(self.arquivo_temp.name)
+
+    def test_varios_humanos_recusados(self):
+        """A equipe resgata um único humano: mapas com mais vítimas são recusados"""
+        with self.assertRaises(RoboException):
+            BuscaCooperativa(Labirinto.de_texto(self.MAPA.replace("X.X.X.X.X", "X.X@X.X.X", 1)), 2, "temp")
+
+    def _executar(self, num_robos):
+        busca = BuscaCooperativa(Labirinto(self.arquivo_temp.name), num_robos, "temp")
+        self.assertTrue(busca.executar_missao())
+        return busca
+
+    def test_missao_com_varios_robos(self):
+        """Equipes de tamanhos diferentes concluem o resgate"""
+        for num_robos in (1, 2, 4):
+            busca = self._executar(num_robos)
+            self.assertTrue(busca.missao_concluida)
+            self.assertTrue(all(a.concluido or a.robo is None for a in busca.agentes))
+
+    def test_equipe_encontra_humano_mais_rapido(self):
+        """Mais robôs reduzem os ciclos até encontrar o humano"""
+        sozinho = self._executar(1).ciclo_humano_encontrado
+        equipe = self._executar(3).ciclo_humano_encontrado
+        self.assertLess(equipe, sozinho)
+
+    def test_linha_do_tempo_mesclada(self):
+        """A linha do tempo contém todas as linhas dos logs individuais"""
+        busca = self._executar(3)
+        total = sum(len(a.logger.entradas) for a in busca.agentes)
+        self.assertEqual(len(busca.linha_do_tempo), total)
+
+        ciclos = [int(linha[0]) for linha in busca.linha_do_tempo]
+        self.assertEqual(ciclos, sorted(ciclos))
+        self.assertEqual({a.logger.get_nome_arquivo() for a in busca.agentes},
+                         {os.path.join("temp", f"{os.path.splitext(os.path.basename(self.arquivo_temp.name))[0]}_robo{i}.csv")
+                          for i in (1, 2, 3)})
+
+
+class _ProcessoInterrompido(BaseException):
+    """Simula a morte do processo (não é capturada por executar_missao)"""
+
+
+class _CheckpointComFalha(GerenciadorCheckpoint):
+    """Interrompe a missão logo após o n-ésimo checkpoint"""
+
+    def __init__(self, arquivo, falhar_apos):
+        super().__init__(arquivo, a_cada_comandos=3, a_cada_segundos=None)
+        self.falhar_apos = falhar_apos
+
+    def salvar(self, algoritmo):
+        super().salvar(algoritmo)
+        if self.salvamentos == self.falhar_apos:
+            raise _ProcessoInterrompido()
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Testa checkpoint e retomada de missões"""
+
+    def setUp(self):
+        """Prepara mapa e arquivo de checkpoint temporários"""
+        self.arquivo_temp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        self.arquivo_temp.write("XXXXEXXXX\nX.......X\nX.XXX.X.X\nX...X...X\n"
+                                "XXX.X.X.X\nX.......X\nX.XXXXX.X\nX....@..X")
+        self.arquivo_temp.close()
+        self.arquivo_checkpoint = self.arquivo_temp.name + ".checkpoint"
+
+    def tearDown(self):
+        """Limpa arquivos"""
+        os.unlink(self.arquivo_temp.name)
+        for arquivo in (self.arquivo_checkpoint, self.arquivo_checkpoint + ".csv"):
+            if os.path.exists(arquivo):
+                os.unlink(arquivo)
+
+    def _nova_missao(self, checkpoint=None):
+        robo = Robo(Labirinto(self.arquivo_temp.name), LoggerRobo(self.arquivo_temp.name, "temp"))
+        return AlgoritmoBusca(robo, checkpoint)
+
+    def test_retomada_gera_log_identico(self):
+        """Interromper e retomar em qualquer checkpoint produz o mesmo log"""
+        referencia = self._nova_missao()
+        self.assertTrue(referencia.executar_missao())
+        log_referencia = referencia.robo.logger.entradas
+
+        falhar_apos = 0
+        while True:
+            falhar_apos += 1
+            interrompida = self._nova_missao(_CheckpointComFalha(self.arquivo_checkpoint, falhar_apos))
+            try:
+                interrompida.executar_missao()
+                break  # Checkpoints esgotados: todas as interrupções foram testadas
+            except _ProcessoInterrompido:
+                pass
+
+            checkpoint = GerenciadorCheckpoint(self.arquivo_checkpoint, a_cada_comandos=3)
+            retomada = self._nova_missao(checkpoint)
+            checkpoint.retomar(retomada)
+            self.assertTrue(retomada.executar_missao())
+            self.assertEqual(retomada.robo.logger.entradas, log_referencia)
+            self.assertEqual(retomada.get_estatisticas(), referencia.get_estatisticas())
+            # Contadores de trabalho somam o que foi feito antes da interrupção
+            self.assertEqual(retomada.robo.leituras_sensores, referencia.robo.leituras_sensores)
+            self.assertEqual(retomada.grafo.expansoes, referencia.grafo.expansoes)
+            self.assertEqual(retomada.distancias.relaxamentos, referencia.distancias.relaxamentos)
+
+        self.assertGreater(falhar_apos, 5)
+
+    def test_log_gravado_aos_poucos(self):
+        """O checkpoint guarda só a posição do log; o que passou dela é descartado na retomada"""
+        referencia = self._nova_missao()
+        referencia.executar_missao()
+        arquivo_log = self.arquivo_checkpoint + ".csv"
+
+        interrompida = self._nova_missao(_CheckpointComFalha(self.arquivo_checkpoint, 4))
+        with self.assertRaises(_ProcessoInterrompido):
+            interrompida.executar_missao()
+        estado = carregar_checkpoint(self.arquivo_checkpoint)
+        self.assertNotIn('log', estado)
+        with open(arquivo_log, newline='', encoding='utf-8') as arquivo:
+            gravado = list(csv.reader(arquivo))
+        self.assertEqual(gravado, interrompida.robo.logger.entradas[:estado['log_entradas']])
+        with open(arquivo_log, 'a', encoding='utf-8') as arquivo:
+            arquivo.write("A,PAREDE,PAREDE,VAZIO,SEM CARGA\n")  # gravação após o último checkpoint
+
+        checkpoint = GerenciadorCheckpoint(self.arquivo_checkpoint, a_cada_comandos=3)
+        retomada = self._nova_missao(checkpoint)
+        checkpoint.retomar(retomada)
+        self.assertEqual(retomada.robo.logger.entradas, gravado)
+        self.assertTrue(retomada.executar_missao())
+        self.assertEqual(retomada.robo.logger.entradas, referencia.robo.logger.entradas)
+        checkpoint.salvar(retomada)
+        with open(arquivo_log, newline='', encoding='utf-8') as arquivo:
+            self.assertEqual(list(csv.reader(arquivo)), referencia.robo.logger.entradas)
+        checkpoint.remover()
+        self.assertFalse(os.path.exists(arquivo_log))
+
+    def test_checkpoint_de_outro_mapa(self):
+        """Retomar com o mapa errado é recusado"""
+        GerenciadorCheckpoint(self.arquivo_checkpoint).salvar(self._nova_missao())
+
+        outro = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        outro.write("XXXXX\nE..@X\nXXXXX")
+        outro.close()
+        try:
+            robo = Robo(Labirinto(outro.name), LoggerRobo(outro.name, "temp"))
+            with self.assertRaises(RoboException):
+                GerenciadorCheckpoint(self.arquivo_checkpoint).retomar(AlgoritmoBusca(robo))
+        finally:
+            os.unlink(outro.name)
+
+
+class TestReplay(unittest.TestCase):
+    """Testa a reprodução de missões com índice de snapshots"""
+
+    def setUp(self):
+        """Executa uma missão e salva seu log"""
+        self.arquivo_temp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        self.arquivo_temp.write("XXXXEXXXX\nX.......X\nX.XXX.X.X\nX...X...X\n"
+                                "XXX.X.X.X\nX.......X\nX.XXXXX.X\nX....@..X")
+        self.arquivo_temp.close()
+
+        self.logger = LoggerRobo(self.arquivo_temp.name, "temp")
+        robo = Robo(Labirinto(self.arquivo_temp.name), self.logger)
+        AlgoritmoBusca(robo).executar_missao()
+        self.logger.salvar_log()
+        self.arquivo_log = self.logger.get_nome_arquivo()
+        self.arquivo_indice = arquivo_indice_padrao(self.arquivo_log)
+
+    def tearDown(self):
+        """Limpa arquivos"""
+        for nome in (self.arquivo_temp.name, self.arquivo_log, self.arquivo_indice):
+            if os.path.exists(nome):
+                os.unlink(nome)
+
+    def test_salto_igual_a_reproducao_completa(self):
+        """Saltar via snapshot dá o mesmo estado e mapa que reproduzir do início"""
+        indexada = ReproducaoMissao.de_arquivos(self.arquivo_temp.name, self.arquivo_log,
+                                                intervalo=7, incluir_mapa=True)
+        for passo in (0, 6, 7, 8, 20, indexada.total_passos):
+            completa = ReproducaoMissao(Labirinto(self.arquivo_temp.name), self.logger.entradas,
+                                        intervalo=10 ** 6, incluir_mapa=True)
+            self.assertEqual(indexada.mapa_conhecido_em(passo), completa.mapa_conhecido_em(passo))
+            self.assertEqual((indexada.robo.posicao, indexada.robo.direcao, indexada.robo.tem_humano),
+                             (completa.robo.posicao, completa.robo.direcao, completa.robo.tem_humano))
+            self.assertEqual(indexada.estado_em(passo)['comando'], self.logger.entradas[passo][0])
+
+    def test_indice_reutilizado(self):
+        """O arquivo auxiliar é reaproveitado em investigações seguintes"""
+        primeira = ReproducaoMissao.de_arquivos(self.arquivo_temp.name, self.arquivo_log, intervalo=5)
+        self.assertFalse(primeira.indice_carregado)
+        self.assertTrue(os.path.exists(self.arquivo_indice))
+
+        segunda = ReproducaoMissao.de_arquivos(self.arquivo_temp.name, self.arquivo_log, intervalo=5)
+        self.assertTrue(segunda.indice_carregado)
+        self.assertEqual(segunda.snapshots, primeira.snapshots)
+
+    def test_verificacao_do_log(self):
+        """Logs íntegros reproduzem; logs adulterados apontam o passo divergente"""
+        entradas = [list(entrada) for entrada in self.logger.entradas]
+        reproducao = ReproducaoMissao(Labirinto(self.arquivo_temp.name), entradas)
+        self.assertIsNone(reproducao.verificar_log())
+
+        entradas[3][3] = 'HUMANO' if entradas[3][3] != 'HUMANO' else 'PAREDE'
+        self.assertEqual(reproducao.verificar_log(), 3)
+
+class TestGrafoJuncoes(unittest.TestCase):
+    """Testa a compressão de corredores em grafo de junções"""
+
+    MAPA = ["XXXXXXXXX",
+            "X.......X",
+            "X.XXXXX.X",
+            "X.X...X.X",
+            "X.X.X.X.X",
+            "X...X...X",
+            "XXXXXXXXX"]
+
+    def _livres(self):
+        return [Posicao(x, y) for y, linha in enumerate(self.MAPA)
+                for x, c in enumerate(linha) if c == '.']
+
+    def _estrutura(self, grafo):
+        grafo.atualizar()
+        arestas = {(frozenset((a.origem, a.destino)), tuple(sorted(a.celulas, key=lambda p: (p.y, p.x))))
+                   for lista in grafo.adjacencias.values() for a in lista}
+        return set(grafo.nos), arestas
+
+    def test_corredor_comprimido(self):
+        """Corredores viram arestas com comprimento e giros"""
+        grafo = GrafoJuncoes()
+        for posicao in self._livres():
+            grafo.definir_livre(posicao, True)
+        grafo.definir_forcado(Posicao(1, 1), True)
+        estatisticas = grafo.get_estatisticas()
+        self.assertEqual(estatisticas['celulas_livres'], 24)
+        self.assertEqual(estatisticas['nos'], 1)  # anel inteiro vira um laço no ponto forçado
+        self.assertEqual(estatisticas['arestas'], 1)
+
+        grafo.definir_forcado(Posicao(5, 3), True)
+        caminho = grafo.caminho_mais_curto(Posicao(1, 1), lambda p: p == Posicao(5, 3))
+        self.assertEqual(caminho[-1], Posicao(5, 3))
+        for anterior, atual in zip([Posicao(1, 1)] + caminho, caminho):
+            self.assertEqual(abs(anterior.x - atual.x) + abs(anterior.y - atual.y), 1)
+        self.assertEqual(len(caminho), 10)
+
+    def test_incremental_igual_reconstrucao(self):
+        """A ordem de descoberta não altera o grafo resultante"""
+        livres = self._livres()
+        completo = GrafoJuncoes()
+        for posicao in livres:
+            completo.definir_livre(posicao, True)
+
+        gerador = random.Random(7)
+        for _ in range(5):
+            incremental = GrafoJuncoes()
+            ordem = livres[:]
+            gerador.shuffle(ordem)
+            for posicao in ordem:
+                incremental.definir_livre(posicao, True)
+                incremental.definir_forcado(posicao, True)
+                incremental.atualizar()
+            for posicao in ordem:
+                incremental.definir_forcado(posicao, False)
+                incremental.atualizar()
+            self.assertEqual(self._estrutura(incremental), self._estrutura(completo))
+
+    def test_missao_sem_humano_acessivel_termina(self):
+        """Exploração guiada pelo grafo esgota as fronteiras em vez de vagar até o limite"""
+        arquivo = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        arquivo.write("XXEXXXX\nX.....X\nX.XXX.X\nX.X@X.X\nX.XXX.X\nX.....X\nXXXXXXX")
+        arquivo.close()
+        try:
+            algoritmo = AlgoritmoBusca(Robo(Labirinto(arquivo.name)))
+            with self.assertRaises(RoboException):
+                algoritmo._explorar_ate_encontrar_humano()
+            self.assertLess(algoritmo.iteracao, 100)
+        finally:
+            os.unlink(arquivo.name)
+
+
+class TestAvancoMultiplo(unittest.TestCase):
+    """Testa o avanço de várias células em uma única chamada"""
+
+    def setUp(self):
+        """Corredor reto com uma abertura lateral"""
+        self.arquivo_temp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        self.arquivo_temp.write("XEXXX\nX.XXX\nX.XXX\nX....\nX.XXX\nX.XXX\nX@XXX\nXXXXX")
+        self.arquivo_temp.close()
+
+    def tearDown(self):
+        """Limpa arquivo temporário"""
+        os.unlink(self.arquivo_temp.name)
+
+    def _robo(self):
+        return Robo(Labirinto(self.arquivo_temp.name), LoggerRobo(self.arquivo_temp.name, "temp"))
+
+    def test_log_identico_ao_avanco_simples(self):
+        """Cada célula gera a mesma linha de log que o comando A isolado"""
+        rapido, simples = self._robo(), self._robo()
+        total = 0
+        while total < 4:
+            total += rapido.avancar_n(4 - total)
+        for _ in range(4):
+            simples.avancar()
+        self.assertEqual(rapido.logger.entradas, simples.logger.entradas)
+        self.assertEqual(rapido.posicao, simples.posicao)
+        self.assertEqual(rapido.comandos_executados, simples.comandos_executados)
+
+    def test_para_quando_sensor_lateral_muda(self):
+        """Para na célula em que a abertura lateral aparece"""
+        robo = self._robo()
+        self.assertEqual(robo.avancar_n(10), 3)
+        self.assertEqual(robo.posicao, Posicao(1, 3))
+        self.assertEqual(robo._ler_sensor_esquerdo(), TipoSensor.VAZIO)
+
+    def test_para_antes_de_alarme(self):
+        """Depois do primeiro passo, nunca avança para uma célula com alarme"""
+        robo = self._robo()
+        robo.avancar_n(3)
+        self.assertEqual(robo.avancar_n(10), 1)  # sai da abertura lateral
+        self.assertEqual(robo.avancar_n(10), 1)  # para diante do humano, sem atropelar
+        self.assertEqual(robo.posicao, Posicao(1, 5))
+        self.assertEqual(robo._ler_sensor_frente(), TipoSensor.HUMANO)
+        with self.assertRaises(AtropelamentoException):
+            robo.avancar_n(1)
+
+
+class TestOtimizador(unittest.TestCase):
+    """Testa o otimizador de sequências de comandos"""
+
+    def setUp(self):
+        """Corredor vertical com humano no fim"""
+        self.arquivo_temp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        self.arquivo_temp.write("XEX\nX.X\nX.X\nX.X\nX@X\nXXX")
+        self.arquivo_temp.close()
+        self.labirinto = Labirinto(self.arquivo_temp.name)
+
+    def tearDown(self):
+        """Limpa arquivo temporário"""
+        os.unlink(self.arquivo_temp.name)
+
+    def test_remove_ida_e_volta_sem_leituras_novas(self):
+        """Desvio por células já vistas que volta à mesma pose é removido"""
+        self.assertEqual(otimizar_sequencia("AAGGAGGAAP", self.labirinto), "AAAP")
+
+    def test_giros_completos(self):
+        """GGGG só some quando não traz leituras novas (ou se elas forem descartadas)"""
+        self.assertEqual(otimizar_sequencia("AGGGGAAP", self.labirinto), "AAAP")
+        # Na entrada, o giro revela o lado de fora: só sai sem preservar leituras
+        self.assertEqual(otimizar_sequencia("GGGGAAAP", self.labirinto), "GGGGAAAP")
+        self.assertEqual(otimizar_sequencia("GGGGAAAP", self.labirinto, preservar_leituras=False),
+                         "AAAP")
+
+    def test_missao_otimizada_valida(self):
+        """A sequência otimizada de uma missão real é válida e termina no mesmo estado"""
+        arquivo = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        arquivo.write("XXXXXXXEX\nX.@.X...X\nX.X.X.X.X\nX.X...X.X\n"
+                      "X.XXX.X.X\nX.X.....X\nXXXXXXXXX")
+        arquivo.close()
+        try:
+            logger = LoggerRobo(arquivo.name, "temp")
+            labirinto = Labirinto(arquivo.name)
+            self.assertTrue(AlgoritmoBusca(Robo(labirinto, logger)).executar_missao())
+            original = logger.get_sequencia_compacta()
+            for preservar in (True, False):
+                otimizada = otimizar_sequencia(original, labirinto, preservar)
+                self.assertLess(len(otimizada), len(original))
+                self.assertEqual(verificar_sequencia(otimizada, labirinto),
+                                 verificar_sequencia(original, labirinto))
+        finally:
+            os.unlink(arquivo.name)
+
+
+class TestCampoDistancias(unittest.TestCase):
+    """Testa o campo de distâncias até a entrada mantido durante a exploração"""
+
+    MAPA = ["XXEXXXX",
+            "X.....X",
+            "X.XXX.X",
+            "X.X...X",
+            "X...X.X",
+            "XXXXXXX"]
+
+    def _livres(self):
+        return [Posicao(x, y) for y, linha in enumerate(self.MAPA)
+                for x, c in enumerate(linha) if c in '.E']
+
+    def test_incremental_igual_bfs(self):
+        """Qualquer ordem de descoberta resulta nas distâncias de uma BFS completa"""
+        completo = CampoDistancias(Posicao(2, 0))
+        completo.reconstruir(self._livres())
+        self.assertEqual(completo.distancia(Posicao(3, 3)), 8)
+
+        gerador = random.Random(3)
+        for _ in range(5):
+            campo = CampoDistancias(Posicao(2, 0))
+            ordem = self._livres()
+            gerador.shuffle(ordem)
+            for posicao in ordem:
+                campo.definir_livre(posicao, True)
+            self.assertEqual(campo.distancias, completo.distancias)
+
+    def test_caminho_pelo_gradiente(self):
+        """O caminho desce uma unidade por passo até a entrada"""
+        campo = CampoDistancias(Posicao(2, 0))
+        campo.reconstruir(self._livres())
+        caminho = campo.caminho_ate_origem(Posicao(3, 3))
+        self.assertEqual(len(caminho), 8)
+        self.assertEqual(caminho[-1], Posicao(2, 0))
+        for anterior, atual in zip([Posicao(3, 3)] + caminho, caminho):
+            self.assertEqual(campo.distancia(anterior) - 1, campo.distancia(atual))
+
+    def test_retorno_da_missao_usa_campo(self):
+        """Após a coleta, o caminho de volta já tem o tamanho da distância conhecida"""
+        arquivo = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        arquivo.write("XXXXEXXXX\nX.......X\nX.XXX.X.X\nX...X...X\n"
+                      "XXX.X.X.X\nX.......X\nX.XXXXX.X\nX....@..X")
+        arquivo.close()
+        try:
+            algoritmo = AlgoritmoBusca(Robo(Labirinto(arquivo.name)))
+            algoritmo._explorar_ate_encontrar_humano()
+            algoritmo.robo.pegar_humano()
+            caminho = algoritmo._calcular_caminho_volta()
+            self.assertEqual(len(caminho) - 1, algoritmo.distancias.distancia(algoritmo.robo.posicao))
+            algoritmo._voltar_para_entrada()
+            self.assertEqual(algoritmo.robo.posicao, algoritmo.posicao_entrada)
+        finally:
+            os.unlink(arquivo.name)
+
+    def test_preenchimento_de_becos_mantem_ciclos(self):
+        """Só o ramo sem saída é preenchido; o ciclo e as células preservadas ficam"""
+        nucleo = nucleo_sem_becos(self._livres(), (Posicao(2, 0), Posicao(3, 3)))
+        self.assertEqual(nucleo, set(self._livres()) - {Posicao(5, 4)})
+
+    def test_retorno_em_arvore_usa_so_o_corredor(self):
+        """Em labirintos sem ciclos, o núcleo do retorno é exatamente o caminho de volta"""
+        for semente in range(10):
+            gerador = random.Random(semente)
+            texto = gerar_labirinto(gerador, 25, 25, aberturas=0)
+            algoritmo = AlgoritmoBusca(Robo(Labirinto.de_texto(texto)), verboso=False)
+            self.assertTrue(algoritmo.executar_missao())
+            self.assertEqual(algoritmo.nucleo_retorno, set(algoritmo.caminho_volta))
+            self.assertLess(len(algoritmo.nucleo_retorno), len(algoritmo.distancias.livres))
+
+    def test_saidas_da_celula(self):
+        """A contagem de saídas trata o humano como não-parede e o exterior como parede"""
+        labirinto = Labirinto.de_texto("\n".join(self.MAPA[:3] + ["X.X@..X"] + self.MAPA[4:]))
+        self.assertEqual(labirinto.contar_saidas(Posicao(2, 0)), 1)
+        self.assertEqual(labirinto.contar_saidas(Posicao(3, 4)), 2)
+        self.assertEqual(labirinto.contar_saidas(Posicao(5, 4)), 1)
+
+
+class TestServico(unittest.TestCase):
+    """Testa o serviço local de missões (HTTP + pool de processos)"""
+
+    MAPA = "XXXXEXXXX\nX.......X\nX.XXX.X.X\nX...X...X\nXXX.X.X.X\nX.......X\nX.XXXXX.X\nX....@..X"
+
+    def setUp(self):
+        """Sobe o serviço em uma porta livre, com o laço de eventos em outra thread"""
+        self.loop = asyncio.new_event_loop()
+        self.servico = ServicoMissoes(trabalhadores=2, diretorio_logs="temp")
+        servidor = self.loop.run_until_complete(self.servico.iniciar(porta=0))
+        self.porta = servidor.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.conexao = http.client.HTTPConnection("127.0.0.1", self.porta, timeout=30)
+
+    def tearDown(self):
+        """Encerra conexão, serviço e laço de eventos"""
+        self.conexao.close()
+        asyncio.run_coroutine_threadsafe(self.servico.encerrar(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def _pedir(self, pedido):
+        self.conexao.request("POST", "/missao", json.dumps(pedido))
+        resposta = self.conexao.getresponse()
+        return resposta.status, json.loads(resposta.read())
+
+    def test_missao_igual_a_execucao_local(self):
+        """A resposta traz a mesma sequência de uma execução local, pela mesma conexão"""
+        local = executar_missao_silenciosa(Labirinto.de_texto(self.MAPA, "servico.txt"),
+                                           "temp", salvar_log=False)
+        for _ in range(3):
+            status, resposta = self._pedir({'mapa': self.MAPA, 'nome': 'servico.txt'})
+            self.assertEqual(status, 200)
+            self.assertTrue(resposta['sucesso'])
+            self.assertEqual(resposta['sequencia'], local['sequencia'])
+            self.assertEqual(resposta['estatisticas'], local['estatisticas'])
+            self.assertTrue(os.path.exists(resposta['log']))
+        os.unlink(resposta['log'])
+        self.assertEqual(self.servico._em_execucao, set())  # tarefas concluídas deixam de ser rastreadas
+
+    def test_erros(self):
+        """Mapa inválido, tempo limite e caminho desconhecido"""
+        status, resposta = self._pedir({'mapa': "XXX\nX.X\nXXX"})
+        self.assertEqual(status, 400)
+        self.assertIn("entrada", resposta['erro'])
+
+        status, _ = self._pedir({'mapa': self.MAPA, 'timeout': 1e-6, 'salvar_log': False})
+        self.assertEqual(status, 504)
+
+        self.conexao.request("GET", "/saude")
+        resposta = self.conexao.getresponse()
+        self.assertEqual(json.loads(resposta.read())['expiradas'], 1)
+
+        self.conexao.request("GET", "/outro")
+        resposta = self.conexao.getresponse()
+        resposta.read()
+        self.assertEqual(resposta.status, 404)
+
+    def test_arquivo_comprimido_e_pedidos_invalidos(self):
+        """Mapas comprimidos são aceitos; arquivo ilegível e timeout inválido respondem 400"""
+        diretorio = tempfile.mkdtemp()
+        comprimido = os.path.join(diretorio, "servico.txt.gz")
+        with gzip.open(comprimido, 'wt', encoding='utf-8') as arquivo:
+            arquivo.write(self.MAPA)
+        status, resposta = self._pedir({'arquivo': comprimido, 'salvar_log': False})
+        self.assertEqual(status, 200)
+        self.assertTrue(resposta['sucesso'])
+        
+        binario = os.path.join(diretorio, "binario.txt")
+        with open(binario, 'wb') as arquivo:
+            arquivo.write(b"\xff\xfe\x00X")
+        for pedido in ({'arquivo': binario}, {'arquivo': 42},
+                       {'mapa': self.MAPA, 'timeout': "abc"}, {'mapa': self.MAPA, 'timeout': 0},
+                       {'mapa': 5}, {'mapa': self.MAPA, 'nome': 5}, {'arquivo': comprimido, 'nome': []}):
+            status, _ = self._pedir(pedido)
+            self.assertEqual(status, 400, pedido)
+
+    def test_cabecalhos_invalidos(self):
+        """Content-Length inválido ou linha longa demais respondem 400 antes de fechar"""
+        for cabecalho, valor, erro in (('Content-Length', 'abc', "Content-Length inválido"),
+                                       ('Content-Length', '-5', "Content-Length inválido"),
+                                       ('X-Longo', 'a' * 100000, "muito longa")):
+            conexao = http.client.HTTPConnection("127.0.0.1", self.porta, timeout=30)
+            conexao.putrequest("POST", "/missao", skip_accept_encoding=True)
+            conexao.putheader(cabecalho, valor)
+            conexao.endheaders()
+            resposta = conexao.getresponse()
+            self.assertEqual(resposta.status, 400)
+            self.assertIn(erro, json.loads(resposta.read())['erro'])
+            conexao.close()
+
+    def test_erro_interno_responde_500(self):
+        """Uma falha inesperada no atendimento ainda responde ao cliente"""
+        async def falhar(*argumentos):
+            raise RuntimeError("falha simulada")
+        self.servico._rotear = falhar
+        status, resposta = self._pedir({'mapa': self.MAPA})
+        self.assertEqual(status, 500)
+        self.assertIn("falha simulada", resposta['erro'])
+
+
+class TestCacheResultados(unittest.TestCase):
+    """Testa o cache de resultados endereçado por conteúdo"""
+
+    def setUp(self):
+        """Cache em diretório temporário"""
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove o diretório do cache"""
+        import shutil
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_chave_depende_de_mapa_e_configuracao(self):
+        """Mudar o mapa ou a configuração muda a chave"""
+        base = chave_resultado("XEX\nX@X", {'robos': 1})
+        self.assertEqual(base, chave_resultado("XEX\nX@X", {'robos': 1}))
+        self.assertNotEqual(base, chave_resultado("XEX\nX.X\nX@X", {'robos': 1}))
+        self.assertNotEqual(base, chave_resultado("XEX\nX@X", {'robos': 2}))
+
+    def test_acerto_devolve_resultado_e_log(self):
+        """Um acerto devolve o que foi guardado sem nova simulação"""
+        cache = CacheResultados(self.diretorio)
+        chave = chave_resultado("mapa", {})
+        self.assertIsNone(cache.obter(chave))
+        cache.guardar(chave, {'sucesso': True, 'sequencia': 'AP'}, [['LIGAR', 'PAREDE', 'PAREDE', 'VAZIO', 'SEM CARGA']])
+
+        reaberto = CacheResultados(self.diretorio)
+        guardado = reaberto.obter(chave)
+        self.assertEqual(guardado['sequencia'], 'AP')
+        self.assertEqual(guardado['log'][0][0], 'LIGAR')
+        self.assertEqual((reaberto.acertos, cache.falhas), (1, 1))
+
+    def test_despejo_lru_por_tamanho(self):
+        """Acima do limite, saem as entradas usadas há mais tempo"""
+        cache = CacheResultados(self.diretorio, limite_bytes=10 ** 9)
+        gerador = random.Random(1)
+        chaves = [chave_resultado(str(i), {}) for i in range(4)]
+        for i, chave in enumerate(chaves):
+            ruido = ''.join(gerador.choice('AGPE') for _ in range(4000))
+            cache.guardar(chave, {'sequencia': ruido}, [])
+            os.utime(cache._arquivo(chave), (1000 + i, 1000 + i))
+        cache.obter(chaves[0])  # renova a mais antiga
+
+        cache.limite_bytes = cache.tamanho
+        cache.guardar(chave_resultado("nova", {}), {'sequencia': 'A'}, [])
+        self.assertIsNotNone(cache.obter(chaves[0]))
+        self.assertIsNone(cache.obter(chaves[1]))
+        self.assertLessEqual(cache.tamanho, cache.limite_bytes)
+
+
+class TestCorpus(unittest.TestCase):
+    """Testes do corpus de mapas em arquivo único"""
+    
+    MAPAS = {
+        'reta.txt': "XXXXX\nE...@\nXXXXX",
+        'curva.txt': "XXXX\nE..X\nXX.X\nXX@X",
+        'quebrado.txt': "XXXX\nE..\nXX@X",
+    }
+    
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.arquivo = os.path.join(self.diretorio, "mapas.corpus")
+        with EscritorCorpus(self.arquivo, 'lzma') as escritor:
+            escritor.adicionar('reta.txt', self.MAPAS['reta.txt'])
+            escritor.adicionar('curva.txt', self.MAPAS['curva.txt'], 'nenhuma')
+            escritor.adicionar('quebrado.txt', self.MAPAS['quebrado.txt'], 'gzip')
+    
+    def test_leitura_por_indice_com_compressoes_mistas(self):
+        """Cada entrada volta com o próprio texto, independente da compressão"""
+        self.assertTrue(e_corpus(self.arquivo))
+        with LeitorCorpus(self.arquivo) as leitor:
+            self.assertEqual(len(leitor), 3)
+            for indice, (nome, texto) in enumerate(self.MAPAS.items()):
+                self.assertEqual(leitor.nome(indice), nome)
+                self.assertEqual(leitor.ler_texto(indice), texto)
+            labirinto = leitor.ler(1)
+            self.assertEqual(labirinto.arquivo_mapa, 'curva.txt')
+            self.assertEqual(labirinto.posicao_humano, Posicao(2, 3))
+    
+    def test_iteracao_preguicosa(self):
+        """A iteração só interpreta o mapa quando ele é pedido"""
+        with LeitorCorpus(self.arquivo) as leitor:
+            iterador = leitor.iterar(0, 3)
+            self.assertEqual(next(iterador)[1].largura, 5)
+            self.assertEqual(next(iterador)[0], 1)
+            with self.assertRaises(RoboException):
+                next(iterador)
+    
+    def test_shards_cobrem_o_corpus(self):
+        """Os shards são faixas contíguas, disjuntas e cobrem todas as entradas"""
+        for total in (0, 1, 7, 100):
+            for shards in (1, 3, 8):
+                faixas = [faixa_shard(total, i, shards) for i in range(shards)]
+                self.assertEqual(faixas[0][0], 0)
+                self.assertEqual(faixas[-1][1], total)
+                for (_, fim), (inicio, _) in zip(faixas, faixas[1:]):
+                    self.assertEqual(fim, inicio)
+        with self.assertRaises(RoboException):
+            faixa_shard(10, 3, 3)
+
+    def test_shard_invalido_na_linha_de_comando(self):
+        """--shard fora da forma I/N é recusado com mensagem de uso"""
+        for shard in ("1of2", "3", "2/2", "/2", "a/b"):
+            saida = subprocess.run([sys.executable, "main.py", self.arquivo, "--shard", shard,
+                                    "--no-cache"], cwd=projeto_dir, capture_output=True, text=True)
+            self.assertEqual(saida.returncode, 2, shard)
+            self.assertIn("--shard deve ter a forma I/N", saida.stderr)
+
+    def test_execucao_de_faixa(self):
+        """Mapas inválidos viram falhas sem interromper o restante da faixa"""
+        resultados = executar_faixa_corpus(self.arquivo, 0, 3, self.diretorio)
+        self.assertEqual([r['nome'] for r in resultados], list(self.MAPAS))
+        self.assertEqual([r['sucesso'] for r in resultados], [True, True, False])
+        self.assertIn("tamanho diferente", resultados[2]['erro'])
+        self.assertTrue(os.path.exists(os.path.join(self.diretorio, "curva.csv")))
+    
+    def test_arquivo_que_nao_e_corpus(self):
+        """Arquivos de mapa comuns não são confundidos com corpus"""
+        arquivo = os.path.join(self.diretorio, "mapa.txt")
+        with open(arquivo, 'w') as f:
+            f.write(self.MAPAS['reta.txt'])
+        self.assertFalse(e_corpus(arquivo))
+        with self.assertRaises(RoboException):
+            LeitorCorpus(arquivo)
+
+
+class TestMapasComprimidos(unittest.TestCase):
+    """Testes da leitura de mapas gzip/bz2/lzma"""
+    
+    TEXTO = "\n  XXXXX\nE...X\nXX.@X\nXXXXX  \n\n"
+    
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.original = os.path.join(self.diretorio, "mapa.txt")
+        with open(self.original, 'w', encoding='utf-8') as f:
+            f.write(self.TEXTO)
+    
+    def _gravar(self, nome: str, dados: bytes) -> str:
+        caminho = os.path.join(self.diretorio, nome)
+        with open(caminho, 'wb') as f:
+            f.write(dados)
+        return caminho
+    
+    def test_formatos_equivalem_ao_texto(self):
+        """Mapa, entrada e humano são os mesmos em qualquer formato"""
+        dados = self.TEXTO.encode('utf-8')
+        original = Labirinto(self.original)
+        for nome, comprimido in [("mapa.txt.gz", gzip.compress(dados)),
+                                 ("mapa.txt.bz2", bz2.compress(dados)),
+                                 ("mapa.txt.xz", lzma.compress(dados)),
+                                 ("mapa.txt.lzma", lzma.compress(dados, format=lzma.FORMAT_ALONE)),
+                                 ("sem_extensao.txt", gzip.compress(dados))]:
+            labirinto = Labirinto(self._gravar(nome, comprimido))
+            self.assertEqual(labirinto.mapa, original.mapa, nome)
+            self.assertEqual((labirinto.entrada, labirinto.posicao_humano),
+                             (original.entrada, original.posicao_humano))
+    
+    def test_validacao_inalterada(self):
+        """Linhas irregulares continuam sendo rejeitadas com a mesma mensagem"""
+        caminho = self._gravar("torto.txt.gz", gzip.compress(b"XXXX\nE..\nXX@X"))
+        with self.assertRaisesRegex(RoboException, "Linha 2 tem tamanho diferente"):
+            Labirinto(caminho)
+        with self.assertRaises(RoboException):
+            Labirinto(self._gravar("corrompido.txt.gz", b"\x1f\x8bnao e gzip"))
+    
+    def test_nome_do_log_sem_extensao_de_compressao(self):
+        """O log de mapa.txt.gz se chama mapa.csv"""
+        caminho = self._gravar("mapa.txt.gz", gzip.compress(self.TEXTO.encode('utf-8')))
+        logger = LoggerRobo(caminho, self.diretorio)
+        self.assertEqual(os.path.basename(logger.get_nome_arquivo()), "mapa.csv")
+
+
+class TestLabirintoEmBlocos(unittest.TestCase):
+    """Testes do labirinto armazenado em blocos com cache LRU"""
+    
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+    
+    def _converter(self, texto: str, lado: int) -> str:
+        arquivo = os.path.join(self.diretorio, "mapa.txt")
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        saida = os.path.join(self.diretorio, "mapa.blocos")
+        converter_para_blocos(arquivo, saida, lado)
+        return saida
+    
+    def test_missao_igual_ao_labirinto_em_memoria(self):
+        """Mesmas células, entrada, humano e sequência de comandos"""
+        arquivo = os.path.join(projeto_dir, "mapas", "exemplo_professor.txt")
+        original = Labirinto(arquivo)
+        converter_para_blocos(arquivo, os.path.join(self.diretorio, "ex.blocos"), 3)
+        em_blocos = abrir_labirinto(os.path.join(self.diretorio, "ex.blocos"), capacidade_blocos=2)
+        self.assertIsInstance(em_blocos, LabirintoEmBlocos)
+        self.assertEqual(str(em_blocos), str(original))
+        self.assertEqual((em_blocos.entrada, em_blocos.posicao_humano),
+                         (original.entrada, original.posicao_humano))
+        
+        esperado = executar_missao_silenciosa(original, self.diretorio, salvar_log=False)
+        obtido = executar_missao_silenciosa(em_blocos, self.diretorio, salvar_log=False)
+        self.assertEqual(obtido['sequencia'], esperado['sequencia'])
+    
+    def test_memoria_limitada_pela_capacidade(self):
+        """Em um corredor longo só ficam em memória os blocos mais recentes"""
+        largura = 400
+        texto = "\n".join(["X" * largura, "E" + "." * (largura - 3) + "@X", "X" * largura])
+        labirinto = LabirintoEmBlocos(self._converter(texto, 8), capacidade_blocos=2)
+        resultado = executar_missao_silenciosa(labirinto, self.diretorio, salvar_log=False)
+        
+        self.assertTrue(resultado['sucesso'])
+        blocos = labirinto.get_estatisticas_blocos()
+        self.assertLessEqual(blocos['carregados'], 2)
+        self.assertGreater(blocos['falhas'], largura // 8)  # Na volta, os blocos já foram despejados
+        self.assertGreater(blocos['acertos'], blocos['falhas'])
+        labirinto.fechar()
+    
+    def test_validacoes_iguais_as_do_texto(self):
+        """Mapas inválidos geram os mesmos erros que Labirinto"""
+        for texto, mensagem in [("XXXX\nE..\nXX@X", "Linha 2 tem tamanho diferente"),
+                                ("XXX\nXEX\nX@X", "Entrada deve estar na borda"),
+                                ("E@E\nXXX", "Múltiplas entradas"),
+                                ("XEX\nX.X", "Nenhum humano")]:
+            with self.assertRaisesRegex(RoboException, mensagem):
+                self._converter(texto, 2)
+
+
+class TestTrajetoria(unittest.TestCase):
+    """Testes do registro compacto da trajetória"""
+    
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.movimentos = [(Posicao(i, i % 7), Direcao(i % 4)) for i in range(10000)]
+    
+    def test_modo_circular_mantem_os_ultimos(self):
+        """Com limite, a memória fica constante e guarda só os mais recentes"""
+        trajetoria = Trajetoria(limite=100)
+        for posicao, direcao in self.movimentos:
+            trajetoria.registrar(posicao, direcao)
+        self.assertEqual(len(trajetoria), 10000)
+        self.assertEqual(trajetoria.em_memoria, 100)
+        self.assertEqual(list(trajetoria), self.movimentos[-100:])
+        self.assertEqual(trajetoria.ultimos(3), self.movimentos[-3:])
+    
+    def test_historico_completo_em_arquivo(self):
+        """O arquivo de despejo guarda todos os movimentos, em ordem"""
+        arquivo = os.path.join(self.diretorio, "trajetoria.bin")
+        trajetoria = Trajetoria(limite=10, arquivo_despejo=arquivo)
+        for posicao, direcao in self.movimentos:
+            trajetoria.registrar(posicao, direcao)
+        trajetoria.descarregar()
+        self.assertEqual(list(ler_historico(arquivo)), self.movimentos)
+    
+    def test_restaurar_descarta_movimentos_posteriores(self):
+        """Ao retomar, o histórico em arquivo volta ao ponto do checkpoint"""
+        arquivo = os.path.join(self.diretorio, "trajetoria.bin")
+        trajetoria = Trajetoria(limite=50, arquivo_despejo=arquivo)
+        for posicao, direcao in self.movimentos[:6000]:
+            trajetoria.registrar(posicao, direcao)
+        estado = json.loads(json.dumps(trajetoria.capturar()))
+        for posicao, direcao in self.movimentos[6000:9000]:
+            trajetoria.registrar(posicao, direcao)
+        trajetoria.descarregar()
+        
+        retomada = Trajetoria(limite=50, arquivo_despejo=arquivo)
+        retomada.restaurar(estado)
+        for posicao, direcao in self.movimentos[6000:]:
+            retomada.registrar(posicao, direcao)
+        retomada.descarregar()
+        self.assertEqual(len(retomada), 10000)
+        self.assertEqual(list(retomada), self.movimentos[-50:])
+        self.assertEqual(list(ler_historico(arquivo)), self.movimentos)
+    
+    def test_estatisticas_da_missao(self):
+        """O algoritmo conta movimentos mesmo além do limite em memória"""
+        labirinto = Labirinto(os.path.join(projeto_dir, "mapas", "exemplo_professor.txt"))
+        completa = AlgoritmoBusca(Robo(labirinto), verboso=False, trajetoria=Trajetoria(None))
+        self.assertTrue(completa.executar_missao())
+        
+        labirinto.reiniciar()
+        limitada = AlgoritmoBusca(Robo(labirinto), verboso=False, trajetoria=Trajetoria(2))
+        self.assertTrue(limitada.executar_missao())
+        self.assertEqual(limitada.get_estatisticas()['caminho_percorrido'],
+                         completa.get_estatisticas()['caminho_percorrido'])
+        self.assertEqual(limitada.trajetoria.em_memoria, 2)
+
+
+class TestEstresse(unittest.TestCase):
+    """Testes do teste de estresse com invariantes de segurança"""
+    
+    def test_gerador_produz_mapas_validos(self):
+        """Labirintos gerados passam pelas validações e têm entrada na borda"""
+        for semente in range(50):
+            gerador = random.Random(semente)
+            texto = gerar_labirinto(gerador, gerador.randint(5, 20), gerador.randint(5, 20))
+            labirinto = Labirinto.de_texto(texto)
+            self.assertIsNotNone(labirinto.get_direcao_inicial())
+    
+    def test_casos_aleatorios_sem_violacoes(self):
+        """Missões e comandos aleatórios não violam nenhuma invariante"""
+        self.assertEqual(executar_estresse(15, trabalhadores=1, tamanho_maximo=15), [])
+    
+    def test_missao_conhecida_passa(self):
+        """O mapa de exemplo cumpre todas as invariantes da missão"""
+        with open(os.path.join(projeto_dir, "mapas", "exemplo_professor.txt"), encoding='utf-8') as f:
+            falha, sequencia = verificar_missao(f.read())
+        self.assertIsNone(falha)
+        self.assertTrue(sequencia.endswith("E"))
+    
+    def test_regressao_de_seguranca_e_minimizada(self):
+        """Sem a validação de colisão, o caso é detectado e reduzido a um único avanço"""
+        with patch.object(Robo, '_validar_colisao', lambda self, posicao: None):
+            falha = executar_caso(3)
+            self.assertEqual(falha['tipo'], 'posicao_invalida')
+            minima = minimizar_falha(falha)
+        self.assertEqual(minima['comandos'], "A")
+        self.assertEqual(minima['mapa'].count('.'), 0)
+
+
+class TestMetricas(unittest.TestCase):
+    """Testes da exportação de métricas em JSON Lines e Prometheus"""
+    
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.mapas = os.path.join(projeto_dir, "mapas")
+    
+    def test_metricas_da_missao(self):
+        """Comandos por tipo somam o total e as fases da missão são cronometradas"""
+        labirinto = Labirinto(os.path.join(self.mapas, "exemplo_professor.txt"))
+        metricas = executar_missao_silenciosa(labirinto, self.diretorio, salvar_log=False)['metricas']
+        self.assertTrue(metricas['sucesso'])
+        self.assertIsNone(metricas['alarme'])
+        self.assertEqual(sum(metricas['comandos_por_tipo'].values()), metricas['comandos'])
+        self.assertEqual(metricas['comandos_por_tipo']['ejetar'], 1)
+        self.assertGreater(metricas['leituras_sensores'], 0)
+        self.assertEqual(set(metricas['fases_s']), {'exploracao', 'coleta', 'retorno', 'ejecao'})
+        self.assertEqual((metricas['largura'], metricas['altura']), (labirinto.largura, labirinto.altura))
+    
+    def test_histograma_cumulativo(self):
+        """Buckets são cumulativos e +Inf conta todas as observações"""
+        histograma = Histograma((1, 5))
+        for valor in (0.5, 3, 3, 10):
+            histograma.observar(valor)
+        self.assertEqual(histograma.linhas("h"), [
+            'h_bucket{le="1"} 1', 'h_bucket{le="5"} 3', 'h_bucket{le="+Inf"} 4',
+            'h_sum 16.5', 'h_count 4'])
+    
+    def test_lote_gera_jsonl_e_prometheus(self):
+        """Uma linha por missão e agregados por resultado, incluindo falhas"""
+        jsonl = os.path.join(self.diretorio, "metricas.jsonl")
+        prom = os.path.join(self.diretorio, "robo.prom")
+        escritor = EscritorMetricas(jsonl, prom)
+        for nome in ("exemplo_professor.txt", "teste_simples.txt", "teste_complexo.txt"):
+            labirinto = Labirinto(os.path.join(self.mapas, nome))
+            escritor.registrar(executar_missao_silenciosa(labirinto, self.diretorio,
+                                                          salvar_log=False)['metricas'])
+        escritor.escrever_prometheus()
+        
+        with open(jsonl, encoding='utf-8') as f:
+            linhas = [json.loads(linha) for linha in f]
+        self.assertEqual([linha['sucesso'] for linha in linhas], [True, True, False])
+        with open(prom, encoding='utf-8') as f:
+            texto = f.read()
+        self.assertIn('robo_salvamento_missao_duracao_segundos_count 3', texto)
+        self.assertIn('robo_salvamento_missao_comandos_bucket{le="+Inf"} 3', texto)
+        self.assertIn('fase="exploracao"', texto)
+        falhas = [l for l in texto.splitlines() if l.startswith('robo_salvamento_missoes_total{resultado="falha"')]
+        self.assertEqual(len(falhas), 1)
+        self.assertFalse(os.path.exists(prom + ".tmp"))
+
+
+class TestEscalonador(unittest.TestCase):
+    """Testes do escalonador assíncrono com latência dos atuadores"""
+    
+    def setUp(self):
+        with open(os.path.join(projeto_dir, "mapas", "exemplo_professor.txt"), encoding='utf-8') as f:
+            self.texto = f.read()
+    
+    def test_passo_a_passo_igual_a_execucao_direta(self):
+        """Os passos da missão reproduzem os comandos da execução direta"""
+        direta = Robo(Labirinto.de_texto(self.texto))
+        self.assertTrue(AlgoritmoBusca(direta, verboso=False).executar_missao())
+        
+        robo = Robo(Labirinto.de_texto(self.texto))
+        comandos = []
+        passos = AlgoritmoBusca(robo, verboso=False).passos_missao()
+        while True:
+            try:
+                comando, quantidade = next(passos)
+            except StopIteration as fim:
+                self.assertTrue(fim.value)
+                break
+            comandos.extend([comando] * quantidade)
+        self.assertEqual(len(comandos), direta.comandos_executados)
+        self.assertEqual(robo.posicao, direta.posicao)
+    
+    def test_tempo_simulado_soma_latencias(self):
+        """O tempo simulado é a soma das latências dos comandos executados"""
+        latencias = {ComandoRobo.AVANCAR: 1.0, ComandoRobo.GIRAR: 0.0,
+                     ComandoRobo.PEGAR: 10.0, ComandoRobo.EJETAR: 100.0}
+        resultado = asyncio.run(executar_missao_assincrona(Labirinto.de_texto(self.texto),
+                                                           latencias, escala_tempo=0))
+        self.assertTrue(resultado['sucesso'])
+        avancos = resultado['tempo_simulado_s'] - 110.0
+        self.assertGreater(avancos, 0)
+        self.assertEqual(avancos, int(avancos))
+    
+    def test_missoes_intercaladas_no_mesmo_loop(self):
+        """Muitas missões concorrentes terminam como se executadas isoladamente"""
+        resumo = asyncio.run(executar_frota([self.texto], 200, escala_tempo=0))
+        self.assertEqual(resumo['sucessos'], 200)
+        direta = Robo(Labirinto.de_texto(self.texto))
+        AlgoritmoBusca(direta, verboso=False).executar_missao()
+        self.assertEqual(resumo['comandos'], 200 * direta.comandos_executados)
+        self.assertGreater(resumo['cpu_s'], 0)
+
+    def test_frota_sem_missoes(self):
+        """Frotas sem missões são recusadas"""
+        for missoes in (0, -1):
+            with self.assertRaises(RoboException):
+                asyncio.run(executar_frota([self.texto], missoes, escala_tempo=0))
+
+
+class TestPartida(unittest.TestCase):
+    """Testes do tempo de partida do ponto de entrada"""
+    
+    def test_ponto_de_entrada_nao_carrega_recursos_opcionais(self):
+        """Importar o main carrega só o necessário para uma missão"""
+        opcionais = ['numpy', 'lzma', 'bz2', 'concurrent.futures', 'asyncio', 'tests',
+                     'src.servico', 'src.simulador_vetorizado', 'src.busca_cooperativa',
+                     'src.checkpoint', 'src.corpus', 'src.missao']
+        codigo = "import sys, main; print(' '.join(sys.modules))"
+        carregados = subprocess.run([sys.executable, "-c", codigo], cwd=projeto_dir, check=True,
+                                    capture_output=True, text=True).stdout.split()
+        self.assertIn('src.algoritmo_busca', carregados)
+        self.assertEqual([modulo for modulo in opcionais if modulo in carregados], [])
+    
+    def test_medicao_de_partida(self):
+        """A medição executa processos novos e lista as importações do main"""
+        tempos = medir_partida(["-c", "pass"], repeticoes=2)
+        self.assertEqual(len(tempos), 2)
+        self.assertTrue(all(tempo > 0 for tempo in tempos))
+        modulos = [modulo for modulo, _ in importacoes_mais_caras("main", 50)]
+        self.assertIn('src.labirinto', modulos)
+
+
+class TestCanonicalizacao(unittest.TestCase):
+    """Testes da forma canônica dos mapas e da deduplicação em lote"""
+    
+    MAPA = "XEXXX\nX...X\nX.X.X\nX.X@X\nXXXXX"
+    
+    @staticmethod
+    def _girar(texto: str) -> str:
+        linhas = texto.split("\n")
+        return "\n".join(''.join(linha[x] for linha in reversed(linhas)) for x in range(len(linhas[0])))
+    
+    def _executar(self, texto: str):
+        labirinto = Labirinto.de_texto(texto)
+        logger = LoggerRobo("mapa.txt", tempfile.mkdtemp())
+        algoritmo = AlgoritmoBusca(Robo(labirinto, logger), verboso=False)
+        return algoritmo.executar_missao(), logger.entradas
+    
+    def test_rotacoes_tem_mesma_forma_e_mesmo_log(self):
+        """Girar o mapa não muda a forma canônica nem os comandos e leituras relativos ao robô"""
+        base = Labirinto.de_texto(self.MAPA)
+        esperado = self._executar(self.MAPA)
+        self.assertTrue(esperado[0])
+        texto = self.MAPA
+        for _ in range(3):
+            texto = self._girar(texto)
+            self.assertEqual(Labirinto.de_texto(texto).hash_canonico(), base.hash_canonico())
+            self.assertEqual(self._executar(texto), esperado)
+    
+    def test_regioes_inalcancaveis_sao_descartadas(self):
+        """Células fora do alcance da entrada não distinguem mapas"""
+        linhas = self.MAPA.split("\n")
+        ampliado = "\n".join([linha + "X.." for linha in linhas] + ["X.X.X..X"])
+        labirinto = Labirinto.de_texto(ampliado)
+        self.assertEqual(labirinto.forma_canonica(), Labirinto.de_texto(self.MAPA).forma_canonica())
+        self.assertEqual(self._executar(ampliado), self._executar(self.MAPA))
+        self.assertNotEqual(labirinto.hash_canonico(),
+                            Labirinto.de_texto(self.MAPA.replace("X.X.X", "X...X")).hash_canonico())
+    
+    def test_corpus_simula_cada_classe_uma_vez(self):
+        """Duplicatas reaproveitam o resultado e ganham o próprio log"""
+        diretorio = tempfile.mkdtemp()
+        arquivo = os.path.join(diretorio, "mapas.corpus")
+        with EscritorCorpus(arquivo) as escritor:
+            escritor.adicionar('base.txt', self.MAPA)
+            escritor.adicionar('girado.txt', self._girar(self.MAPA))
+        resultados = executar_faixa_corpus(arquivo, 0, 2, diretorio)
+        self.assertEqual(resultados[1]['metricas']['duplicata_de'], 'base.txt')
+        self.assertEqual(resultados[0]['sequencia'], resultados[1]['sequencia'])
+        with open(os.path.join(diretorio, "base.csv")) as a, open(os.path.join(diretorio, "girado.csv")) as b:
+            self.assertEqual(a.read(), b.read())
+        
+        escritor = EscritorMetricas()
+        for resultado in resultados:
+            escritor.registrar(resultado['metricas'])
+        self.assertEqual(escritor.duplicatas, 1)
+        self.assertEqual(escritor.duracao.total, 1)
+
+
+class TestRuido(unittest.TestCase):
+    """Testes dos sensores ruidosos e do mapeamento por evidências"""
+    
+    def setUp(self):
+        with open(os.path.join(projeto_dir, "mapas", "exemplo_professor.txt"), encoding='utf-8') as f:
+            self.texto = f.read()
+    
+    def _executar(self, ruido):
+        logger = LoggerRobo("mapa.txt", tempfile.mkdtemp())
+        robo = Robo(Labirinto.de_texto(self.texto), logger, ruido)
+        algoritmo = AlgoritmoBusca(robo, verboso=False)
+        return algoritmo.executar_missao(), logger.get_sequencia_compacta(), algoritmo
+    
+    def test_modelo_reprodutivel_e_validado(self):
+        """A mesma semente gera as mesmas falhas; humano nunca é inventado"""
+        leituras = [TipoSensor.PAREDE, TipoSensor.VAZIO, TipoSensor.HUMANO] * 200
+        a, b = ModeloRuido(0.2, 0.1, semente=7), ModeloRuido(0.2, 0.1, semente=7)
+        observadas = [a.aplicar(leitura) for leitura in leituras]
+        self.assertEqual(observadas, [b.aplicar(leitura) for leitura in leituras])
+        self.assertGreater(a.trocas, 0)
+        self.assertGreater(a.perdas, 0)
+        for real, observada in zip(leituras, observadas):
+            self.assertTrue(observada is None or (observada == TipoSensor.HUMANO) == (real == TipoSensor.HUMANO))
+        for taxas in ((0.5, 0.0), (-0.1, 0.0), (0.1, 1.0)):
+            with self.assertRaises(RoboException):
+                ModeloRuido(*taxas)
+    
+    def test_evidencias_compactas(self):
+        """Saldo por célula em blocos de bytes, saturado e com coordenadas negativas"""
+        evidencias = EvidenciasCelulas(lado_bloco=8)
+        self.assertEqual(evidencias.contagem(Posicao(3, 3)), 0)
+        self.assertEqual(evidencias.somar(Posicao(-1, 2), -1), -1)
+        for _ in range(300):
+            evidencias.somar(Posicao(3, 3), 1)
+        self.assertEqual(evidencias.contagem(Posicao(3, 3)), 127)
+        self.assertEqual(evidencias.contagem(Posicao(-1, 2)), -1)
+        self.assertEqual(evidencias.bytes_usados(), 2 * 64)
+    
+    def test_missao_com_ruido_mantem_comandos(self):
+        """Com releituras, a missão ruidosa faz os mesmos comandos da missão sem ruído"""
+        sucesso, sequencia, _ = self._executar(None)
+        for semente in range(5):
+            sucesso_ruido, sequencia_ruido, algoritmo = self._executar(ModeloRuido(0.1, 0.1, semente))
+            self.assertEqual((sucesso_ruido, sequencia_ruido), (sucesso, sequencia))
+            self.assertGreater(algoritmo.releituras, 0)
+    
+    def test_checkpoint_com_ruido(self):
+        """Retomada guarda gerador, contadores e evidências: mesma missão da execução contínua"""
+        sucesso, sequencia, completo = self._executar(ModeloRuido(0.2, 0.1, 3))
+        
+        robo = Robo(Labirinto.de_texto(self.texto), LoggerRobo("mapa.txt", tempfile.mkdtemp()),
+                    ModeloRuido(0.2, 0.1, 3))
+        interrompido = AlgoritmoBusca(robo, verboso=False)
+        passos = interrompido.passos_missao()
+        for _ in range(15):
+            next(passos)
+        estado = json.loads(json.dumps(capturar_estado(interrompido)))
+        
+        with self.assertRaises(RoboException):
+            restaurar_estado(AlgoritmoBusca(Robo(Labirinto.de_texto(self.texto)), verboso=False), estado)
+        logger = LoggerRobo("mapa.txt", tempfile.mkdtemp())
+        ruido = ModeloRuido(0.2, 0.1, 99)  # Semente diferente: o estado do gerador vem do checkpoint
+        retomado = AlgoritmoBusca(Robo(Labirinto.de_texto(self.texto), logger, ruido), verboso=False)
+        logger.entradas = [list(entrada) for entrada in robo.logger.entradas]  # log já gravado
+        restaurar_estado(retomado, estado)
+        self.assertTrue(retomado.executar_missao())
+        self.assertEqual(logger.get_sequencia_compacta(), sequencia)
+        self.assertEqual((retomado.releituras, ruido.trocas, ruido.perdas),
+                         (completo.releituras, completo.ruido.trocas, completo.ruido.perdas))
+        self.assertEqual(retomado.evidencias.blocos, completo.evidencias.blocos)
+    
+    def test_medicao_de_custo(self):
+        """A medição compara com a execução sem ruído nos mesmos mapas"""
+        resumo = medir_custo([self.texto], 0.05, 0.05, sementes=3)
+        self.assertEqual(resumo['missoes'], 3)
+        self.assertEqual(resumo['sucessos'], 3)
+        self.assertEqual(resumo['alarmes'], 0)
+        self.assertAlmostEqual(resumo['comandos_extras'], 0.0)
+
+
+class TestMultiplosHumanos(unittest.TestCase):
+    """Testes de mapas com várias vítimas"""
+    
+    # A fica ao lado do corredor, B no fim dele e C ao lado, perto de B
+    MAPA = "XEXXXX\nX.XXXX\nX.@XXX\nX.XXXX\nX.@XXX\nX@XXXX\nXXXXXX"
+    
+    def test_humanos_resgatados_nao_voltam(self):
+        """Cada humano é coletado no próprio lugar e, ejetado, deixa a célula livre"""
+        labirinto = Labirinto.de_texto(self.MAPA)
+        self.assertEqual(labirinto.posicoes_humanos, [Posicao(2, 2), Posicao(2, 4), Posicao(1, 5)])
+        self.assertFalse(labirinto.coletar_humano(Posicao(1, 1)))
+        self.assertTrue(labirinto.coletar_humano(Posicao(2, 4)))
+        self.assertFalse(labirinto.coletar_humano(Posicao(2, 2)))  # Um de cada vez
+        self.assertEqual(labirinto.ler_sensor(Posicao(2, 2)), TipoSensor.HUMANO)
+        self.assertTrue(labirinto.ejetar_humano())
+        self.assertEqual(labirinto.ler_sensor(Posicao(2, 4)), TipoSensor.VAZIO)
+        self.assertEqual(labirinto.resgatados, 1)
+        
+        estado = labirinto.capturar_humanos()
+        labirinto.reiniciar()
+        self.assertEqual(labirinto.ler_sensor(Posicao(2, 4)), TipoSensor.HUMANO)
+        labirinto.restaurar_humanos(estado)
+        self.assertEqual(labirinto.ler_sensor(Posicao(2, 4)), TipoSensor.VAZIO)
+    
+    def test_viagens_reaproveitam_mapa_e_buscam_a_mais_proxima(self):
+        """Depois da primeira viagem, as vítimas avistadas são buscadas da mais próxima
+        da entrada para a mais distante, sem explorar de novo"""
+        robo = Robo(Labirinto.de_texto(self.MAPA))
+        algoritmo = AlgoritmoBusca(robo, verboso=False)
+        coletas = []
+        passos = algoritmo.passos_missao()
+        while True:
+            try:
+                comando, _ = next(passos)
+            except StopIteration as fim:
+                self.assertTrue(fim.value)
+                break
+            if comando == ComandoRobo.PEGAR:
+                coletas.append(algoritmo.posicao_coletada)
+        
+        self.assertEqual(coletas, [Posicao(1, 5), Posicao(2, 2), Posicao(2, 4)])
+        estatisticas = algoritmo.get_estatisticas()
+        self.assertEqual((estatisticas['humanos_resgatados'], estatisticas['humanos_total']), (3, 3))
+        self.assertEqual(estatisticas['posicoes_visitadas'], 5)
+    
+    def test_checkpoint_entre_viagens(self):
+        """Retomar no meio da segunda viagem produz o mesmo log da missão sem interrupção"""
+        diretorio = tempfile.mkdtemp()
+        completo = LoggerRobo("mapa.txt", diretorio)
+        AlgoritmoBusca(Robo(Labirinto.de_texto(self.MAPA), completo), verboso=False).executar_missao()
+        
+        logger = LoggerRobo("mapa.txt", diretorio)
+        robo = Robo(Labirinto.de_texto(self.MAPA), logger)
+        algoritmo = AlgoritmoBusca(robo, verboso=False)
+        passos = algoritmo.passos_missao()
+        while algoritmo.resgatados < 1 or robo.comandos_executados < 25:
+            next(passos)
+        estado = capturar_estado(algoritmo)
+        
+        retomado = LoggerRobo("mapa.txt", diretorio)
+        retomado.entradas = [list(entrada) for entrada in logger.entradas]  # log já gravado
+        novo = AlgoritmoBusca(Robo(Labirinto.de_texto(self.MAPA), retomado), verboso=False)
+        restaurar_estado(novo, json.loads(json.dumps(estado)))
+        self.assertTrue(novo.executar_missao())
+        self.assertEqual(retomado.entradas, completo.entradas)
+
+
+class TestMultiplasEntradas(unittest.TestCase):
+    """Testes de mapas com várias saídas"""
+    
+    # O corredor liga a entrada de cima à saída da direita, que fica perto do humano
+    MAPA = "XEXXXXXX\nX.XXXXXX\nX.XXXXXX\nX......X\nXXXXXX.X\nX@.....E\nXXXXXXXX"
+    
+    def test_entradas_na_borda(self):
+        """O robô parte da primeira entrada; cada uma tem seu lado de fora"""
+        labirinto = Labirinto.de_texto(self.MAPA)
+        self.assertEqual(labirinto.entradas, [Posicao(1, 0), Posicao(7, 5)])
+        self.assertEqual(labirinto.entrada, Posicao(1, 0))
+        self.assertEqual(labirinto.get_direcao_inicial(Posicao(7, 5)), Direcao.OESTE)
+        self.assertEqual(Robo(labirinto).saidas, {Posicao(1, 0): Direcao.NORTE, Posicao(7, 5): Direcao.LESTE})
+        self.assertEqual(labirinto.forma_canonica(), str(labirinto))
+    
+    def test_retorno_pela_saida_mais_proxima(self):
+        """Com o humano perto da outra saída, o robô ejeta por ela e gasta menos comandos"""
+        robo = Robo(Labirinto.de_texto(self.MAPA))
+        self.assertTrue(AlgoritmoBusca(robo, verboso=False).executar_missao())
+        self.assertEqual(robo.posicao, Posicao(7, 5))
+        
+        uma_saida = Robo(Labirinto.de_texto(self.MAPA.replace(".E\n", ".X\n")))
+        self.assertTrue(AlgoritmoBusca(uma_saida, verboso=False).executar_missao())
+        self.assertEqual(uma_saida.posicao, Posicao(1, 0))
+        self.assertLess(robo.comandos_executados, uma_saida.comandos_executados)
+    
+    def test_saida_mais_proxima_em_comandos(self):
+        """Entre saídas à mesma distância em avanços, vence a que exige menos giros"""
+        campo = CampoDistancias(Posicao(0, 0), Posicao(6, 0))
+        for x in range(7):
+            campo.definir_livre(Posicao(x, 0), True)
+        self.assertEqual(campo.distancia(Posicao(3, 0)), 3)
+        self.assertEqual(campo.caminho_menos_comandos(Posicao(3, 0), Direcao.LESTE)[-1], Posicao(6, 0))
+        self.assertEqual(campo.caminho_menos_comandos(Posicao(3, 0), Direcao.OESTE),
+                         [Posicao(2, 0), Posicao(1, 0), Posicao(0, 0)])
+
+
+class TestTelemetria(unittest.TestCase):
+    """Testes do fluxo de telemetria ao vivo"""
+    
+    def test_fluxo_igual_ao_log(self):
+        """Cada linha do log aparece no fluxo, com a pose após o comando"""
+        canal = CanalTelemetria(1024)
+        logger = LoggerRobo("mapa.txt", tempfile.mkdtemp())
+        robo = Robo(Labirinto("mapas/exemplo_professor.txt"), logger, telemetria=canal.emissor())
+        self.assertTrue(AlgoritmoBusca(robo, verboso=False).executar_missao())
+        
+        leitor = LeitorTelemetria(canal)
+        registros = leitor.ler()
+        self.assertEqual(leitor.perdidos, 0)
+        self.assertEqual([[r.comando.value, *(s.value for s in r.sensores),
+                           "COM HUMANO" if r.com_humano else "SEM CARGA"] for r in registros],
+                         logger.entradas)
+        self.assertEqual((registros[-1].posicao, registros[-1].direcao), (robo.posicao, robo.direcao))
+        self.assertEqual(leitor.ler(), [])
+    
+    def test_leitor_lento_perde_os_mais_antigos(self):
+        """O escritor não espera: o leitor recebe os últimos registros e conta os perdidos"""
+        canal = CanalTelemetria(8)
+        emissor = canal.emissor(3)
+        sensores = (TipoSensor.PAREDE, TipoSensor.VAZIO, TipoSensor.HUMANO)
+        leitor = LeitorTelemetria(canal)
+        for x in range(20):
+            emissor.publicar(ComandoRobo.AVANCAR, Posicao(x, 0), Direcao.LESTE, sensores, False)
+        
+        registros = leitor.ler()
+        self.assertEqual([r.indice for r in registros], list(range(12, 20)))
+        self.assertEqual(leitor.perdidos, 12)
+        self.assertEqual((registros[0].missao, registros[0].posicao, registros[0].sensores),
+                         (3, Posicao(12, 0), sensores))
+    
+    def test_memoria_compartilhada_e_visor(self):
+        """Outro processo conecta pelo nome e o visor reconstrói o mapa explorado"""
+        nome = f"robo_teste_{os.getpid()}"
+        leitura = ("from src.telemetria import CanalTelemetria, LeitorTelemetria, VisorTelemetria\n"
+                   f"canal = CanalTelemetria.abrir({nome!r})\n"
+                   "visor = VisorTelemetria()\n"
+                   "for registro in LeitorTelemetria(canal).ler():\n"
+                   "    visor.aplicar(registro)\n"
+                   "print(visor.missao, visor.registros, canal.encerrado)\n"
+                   "print(visor.desenhar())\n"
+                   "canal.fechar()\n")
+        canal = CanalTelemetria(1024, nome)
+        try:
+            robo = Robo(Labirinto("mapas/exemplo_professor.txt"), telemetria=canal.emissor(7))
+            self.assertTrue(AlgoritmoBusca(robo, verboso=False).executar_missao())
+            saida = subprocess.run([sys.executable, "-c", leitura], capture_output=True, text=True,
+                                   check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        finally:
+            canal.fechar()
+        
+        linhas = saida.stdout.splitlines()
+        self.assertEqual(linhas[0], f"7 {robo.comandos_executados + 1} False")
+        self.assertEqual(linhas[2], " XX^XX ")  # Robô na entrada, virado para fora após ejetar
+        self.assertEqual(saida.stderr, "")
+        with self.assertRaises(RoboException):
+            CanalTelemetria.abrir(nome)
+
 def executar_todos_testes():
     """Executa todos os casos de teste"""
     print("🧪 EXECUTANDO TODOS OS TESTES...")
@@ -319,7 +1832,16 @@ def executar_todos_testes():
     
     # Adiciona todas as classes de teste
     for test_class in [TestEstruturas, TestLabirinto, TestValidacoesSeguranca, 
-                       TestLogger, TestIntegracao]:
+                       TestLogger, TestIntegracao, TestSimuladorVetorizado,
+                       TestAmbiente, TestBuscaCooperativa, TestCheckpoint,
+                       TestReplay, TestGrafoJuncoes, TestAvancoMultiplo,
+                       TestOtimizador, TestCampoDistancias,
+                       TestServico, TestCacheResultados, TestCorpus,
+                       TestMapasComprimidos, TestLabirintoEmBlocos,
+                       TestTrajetoria, TestEstresse, TestMetricas,
+                       TestEscalonador, TestPartida, TestCanonicalizacao,
+                       TestRuido, TestMultiplosHumanos, TestMultiplasEntradas,
+                       TestTelemetria]:
         tests = loader.loadTestsFromTestCase(test_class)
         suite.addTests(tests)
     